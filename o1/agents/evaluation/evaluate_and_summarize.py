@@ -0,0 +1,115 @@
+"""
+This module evaluates compliance and summarizes a criterion in a single step for the ESG Engine.
+Standard and report matches are gathered by the validator, then one LLM prompt returns both the
+compliance verdict and the summary as JSON, instead of separate validation and summary calls.
+
+file path: esg_engine/agents/evaluation/evaluate_and_summarize.py
+"""
+
+import json
+import logging
+from functools import lru_cache
+from utils.stub_llm import StubLLM
+from agents.evaluation.validator import validate_data, rule_based_compliance, USE_LLM
+from utils.llm_cache import invoke_cached
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Returns the LLM used for fused evaluation, constructed once per process.
+
+    Returns:
+        LLM: Object with an invoke(prompt) method (StubLLM placeholder).
+    """
+    return StubLLM(responses=['{"compliance": "Compliant", "summary": ""}'])
+
+_LLM = get_llm()
+
+def generate_summary(criterion: str, extracted_sentences: list, standard_matches: list) -> str:
+    """
+    Generates a summary for the criterion based on extracted sentences and standard matches.
+
+    Args:
+        criterion (str): The criterion being evaluated.
+        extracted_sentences (list): List of extracted report sentences.
+        standard_matches (list): List of standard matches.
+
+    Returns:
+        str: Summary text.
+    """
+    if extracted_sentences and standard_matches:
+        return f"Summary for {criterion}: Compliant with standards, found {len(extracted_sentences)} report matches and {len(standard_matches)} standard matches."
+    elif extracted_sentences:
+        return f"Summary for {criterion}: Found {len(extracted_sentences)} report matches but no standard matches."
+    elif standard_matches:
+        return f"Summary for {criterion}: Found {len(standard_matches)} standard matches but no report matches."
+    else:
+        return f"Summary for {criterion}: No matches found."
+
+def evaluate(extraction: dict, requirement: dict, standard_filter: str = None, standards_texts: dict = None, standards_cache: list = None, rag_standards: list = None, standards_index: dict = None, standards_hits: list = None) -> tuple:
+    """
+    Validates an extraction against ESG standards and summarizes it with a single LLM call.
+
+    Args:
+        extraction (dict): Extracted data with 'criterion', 'matches', and 'source'.
+        requirement (dict): Requirement with category, criterion, description, and embedding.
+        standard_filter (str, optional): Specific standard to filter (e.g., "ifrs_s1.pdf").
+        standards_texts (dict, optional): Cached standards texts {filename: {page_number: text}}.
+        standards_cache (list, optional): Precomputed cache of standard sentences with embeddings.
+        rag_standards (list, optional): Prefetched standards RAG results for the criterion.
+        standards_index (dict, optional): Index from build_standards_index over standards_cache.
+        standards_hits (list, optional): Precomputed nearest standards_index sentences for the criterion.
+
+    Returns:
+        tuple: (validation dict as returned by validate_data, summary str).
+    """
+    criterion = requirement["criterion"]
+
+    # Fast path: no report evidence means no standards search and no LLM call
+    if not extraction.get("matches"):
+        logger.info(f"No evidence found for '{criterion}', skipping validation")
+        validation = {"criterion": criterion, "standard_matches": [], "extracted_sentences": [], "compliance": "Non-compliant"}
+        return validation, f"No evidence found for {criterion}"
+
+    validation = validate_data(
+        extraction=extraction,
+        standard_filter=standard_filter,
+        standards_texts=standards_texts,
+        standards_cache=standards_cache,
+        requirements_cache=[requirement],
+        assess=False,
+        rag_standards=rag_standards,
+        standards_index=standards_index,
+        standards_hits=standards_hits
+    )
+    extracted_sentences = validation["extracted_sentences"]
+    standard_matches = validation["standard_matches"]
+    summary = ""
+
+    if validation["compliance"] != "Failed":
+        validation["compliance"] = "Non-compliant"
+        if extracted_sentences and standard_matches and not USE_LLM:
+            validation["compliance"] = rule_based_compliance(extracted_sentences, standard_matches)
+            logger.info(f"Compliance for '{criterion}': {validation['compliance']}")
+        elif extracted_sentences and standard_matches:
+            prompt = f"""
+            Validate if the criterion '{criterion}' ({requirement.get('description', '')}) is met by the extracted report data:
+            Extracted data: {extracted_sentences}
+            Supported by standard sentences: {standard_matches}
+            Respond with JSON only: {{"compliance": "Compliant" or "Non-compliant", "summary": "<one-paragraph summary>"}}
+            """
+            try:
+                response = json.loads(invoke_cached(_LLM, prompt))
+                validation["compliance"] = response.get("compliance", "Non-compliant")
+                summary = response.get("summary", "")
+                logger.info(f"Compliance for '{criterion}': {validation['compliance']}")
+            except Exception as e:
+                logger.warning(f"LLM evaluation failed for '{criterion}': {str(e)}")
+        else:
+            logger.warning(f"Missing report or standard matches for '{criterion}', marking as Non-compliant")
+
+    if not summary:
+        summary = generate_summary(criterion, extracted_sentences, standard_matches)
+    return validation, summary
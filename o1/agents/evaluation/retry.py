@@ -6,14 +6,9 @@ file path: esg_engine/agents/evaluation/retry.py
 """
 
 import logging
-from config.settings import get_settings
 from ..extraction.searcher import extract_data
-import os
 
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "evaluation.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def retry_extraction(report_path, extraction):
     """
@@ -31,14 +26,14 @@ def retry_extraction(report_path, extraction):
         return extraction
     
     try:
-        logging.info(f"Retrying extraction for criterion: {criterion}")
+        logger.info(f"Retrying extraction for criterion: {criterion}")
         result = extract_data(report_path, criterion)
         if result.get("matches"):
-            logging.info(f"Retry successful for {criterion}")
+            logger.info(f"Retry successful for {criterion}")
             return result
-        logging.warning(f"Retry failed for {criterion}")
+        logger.warning(f"Retry failed for {criterion}")
         return {"criterion": criterion, "matches": [], "status": "Failed"}
     
     except Exception as e:
-        logging.error(f"Retry failed for {criterion}: {str(e)}")
+        logger.error(f"Retry failed for {criterion}: {str(e)}")
         return {"criterion": criterion, "matches": [], "status": "Failed"}
\ No newline at end of file
@@ -8,35 +8,256 @@ file path: esg_engine/agents/evaluation/validator.py
 """
 
 import logging
-import spacy
 import re
+import threading
+from bisect import bisect_right
 from config.settings import get_settings
-from rag.standards_rag.searcher import search_standards
-from sentence_transformers import SentenceTransformer, util
+from rag.standards_rag.cache import cached_search_standards
 import os
-import pickle
-from langchain_community.llms import FakeListLLM
+from utils.pickle_cache import load_pickle
+from functools import lru_cache
+from utils.stub_llm import StubLLM
 import torch
-from utils.synonyms import SYNONYMS  # Import shared synonyms
+import numpy as np
+from utils.synonyms import WORD_TO_SYNONYMS  # Import shared synonyms
+from utils.llm_cache import invoke_cached
+from utils.text_processing import nlp, embed_texts, content_tokens, split_sentences, POS_SET
+from utils.vector_utils import build_similarity_index, search_similarity_index, search_similarity_index_batch, cosine_similarities, top_k_similar, top_k_similar_batch
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "validation.log")
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # Cache configuration
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".esg_engine_cache")
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# Load models
-model = SentenceTransformer('all-MiniLM-L6-v2')
-nlp = spacy.load("en_core_web_sm")
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Returns the LLM used for compliance evaluation, constructed once per process.
+
+    Returns:
+        LLM: Object with an invoke(prompt) method (StubLLM placeholder).
+    """
+    return StubLLM(responses=["Compliant"])
+
+_LLM = get_llm()
+
+# Compliance is decided by rule_based_compliance unless an LLM is enabled in settings
+USE_LLM = settings["evaluation"]["use_llm"]
+COMPLIANCE_SIMILARITY = settings["evaluation"]["compliance_similarity"]
+
+def rule_based_compliance(extracted_sentences, standard_matches):
+    """
+    Decides compliance without an LLM: a criterion is compliant when the report has evidence
+    and its best standard match is similar enough.
+
+    Args:
+        extracted_sentences (list): Report matches for the criterion.
+        standard_matches (list): Standard matches with similarity scores.
+
+    Returns:
+        str: "Compliant" or "Non-compliant".
+    """
+    if extracted_sentences and standard_matches and max(m["similarity"] for m in standard_matches) > COMPLIANCE_SIMILARITY:
+        return "Compliant"
+    return "Non-compliant"
+
+def encode_batch(sentences):
+    """
+    Encodes a list of sentences in one batched forward pass, reusing cached embeddings.
+
+    Args:
+        sentences (list): Sentences to encode.
+
+    Returns:
+        torch.Tensor: Tensor of shape (len(sentences), dimension).
+    """
+    return torch.from_numpy(embed_texts(sentences))
+
+# Number of nearest standards_cache sentences checked per criterion
+STANDARDS_CANDIDATES = 50
+
+def build_standards_index(standards_cache, name="standards_cache"):
+    """
+    Builds a cosine-similarity index over the valid sentences of a standards cache, so each
+    criterion is matched with one top-k search instead of a comparison against every entry.
+    Entries cached without a tensor embedding are encoded in one batch.
+
+    Args:
+        standards_cache (list): Precomputed cache of standard sentences with embeddings.
+        name (str): Source name used in log messages.
+
+    Returns:
+        dict: Struct of arrays in index order: {"index": faiss index or None, "filenames",
+            "pages", "sentences": np.ndarray, "embeddings": float32 np.ndarray}.
+    """
+    entries = []
+    for entry in standards_cache or []:
+        sentence = entry.get("sentence")
+        if not isinstance(sentence, str) or not sentence.strip():
+            logger.warning("Invalid or empty sentence in %s: %s", name, entry)
+            continue
+        page_number = entry.get("page_number", None)
+        if not isinstance(page_number, int) or page_number <= 0:
+            logger.warning("Invalid page_number %s for standard match: %.50s...", page_number, sentence)
+            continue
+        entries.append(entry)
+    if not entries:
+        return _empty_standards_index()
+
+    missing = [i for i, entry in enumerate(entries) if not isinstance(entry.get("embedding"), torch.Tensor)]
+    try:
+        encoded = dict(zip(missing, encode_batch([entries[i]["sentence"].strip().lower() for i in missing]))) if missing else {}
+        embeddings = torch.stack([encoded[i] if i in encoded else entry["embedding"].detach().cpu().float()
+                                  for i, entry in enumerate(entries)]).numpy()
+        index = build_similarity_index(embeddings)
+    except Exception as e:
+        logger.warning("Failed to build %s index: %s", name, e)
+        return _empty_standards_index()
+    logger.info("Built %s index over %d sentences", name, len(entries))
+    return {
+        "index": index,
+        "filenames": np.array([entry["filename"] for entry in entries], dtype=object),
+        "pages": np.array([entry["page_number"] for entry in entries], dtype=np.int32),
+        "sentences": np.array([entry["sentence"].strip() for entry in entries], dtype=object),
+        "embeddings": embeddings
+    }
+
+def _empty_standards_index():
+    """Returns a standards index with no sentences."""
+    return {
+        "index": None,
+        "filenames": np.empty(0, dtype=object),
+        "pages": np.empty(0, dtype=np.int32),
+        "sentences": np.empty(0, dtype=object),
+        "embeddings": np.empty((0, 0), dtype=np.float32)
+    }
+
+def build_standards_text_index(standards_texts):
+    """
+    Splits cached standards pages into sentences and indexes them like standards_cache, so the
+    fallback match for every criterion is a top-k search rather than re-splitting and re-encoding
+    the whole standards corpus. All pages are split in one split_sentences pass and all sentences are
+    encoded in one batch.
+
+    Args:
+        standards_texts (dict): Cached standards texts {filename: {page_number: text}}.
+
+    Returns:
+        dict: Struct of arrays as returned by build_standards_index.
+    """
+    pages = []
+    for filename, page_texts in (standards_texts or {}).items():
+        for page_number, text in page_texts.items():
+            if not isinstance(page_number, int) or page_number <= 0:
+                logger.warning("Invalid page_number %s in standards_texts: %s", page_number, filename)
+                continue
+            if not text.strip():
+                logger.warning("Empty text for %s, page %s", filename, page_number)
+                continue
+            pages.append((filename, page_number, text.lower()))
+    entries = [
+        {"filename": filename, "page_number": page_number, "sentence": sentence}
+        for (filename, page_number, _), sentences in zip(pages, split_sentences([text for _, _, text in pages]))
+        for sentence in sentences
+    ]
+    return build_standards_index(entries, name="standards_texts")
+
+# Most recent standards_texts object and its index; the workflow passes the same dict for every criterion
+_text_index = None
+_text_index_lock = threading.Lock()
+
+def get_standards_text_index(standards_texts):
+    """
+    Returns the index over standards_texts, building it on first use and reusing it for every
+    later call with the same standards_texts object.
+
+    Args:
+        standards_texts (dict): Cached standards texts {filename: {page_number: text}}.
+
+    Returns:
+        dict: Struct of arrays as returned by build_standards_index.
+    """
+    global _text_index
+    with _text_index_lock:
+        if _text_index is None or _text_index[0] is not standards_texts:
+            _text_index = (standards_texts, build_standards_text_index(standards_texts))
+        return _text_index[1]
+
+def standards_hits_batch(standards_index, criterion_embeddings, standard_filter=None):
+    """
+    Finds the nearest indexed standard sentences for every criterion at once: one batched index
+    search, or one masked matrix product when a standard filter applies. Each result can be passed
+    to validate_data as standards_hits so criteria skip their own search.
+
+    Args:
+        standards_index (dict): Index from build_standards_index.
+        criterion_embeddings (np.ndarray): Criterion embeddings of shape (m, dimension).
+        standard_filter (str, optional): Specific standard to filter (e.g., "ifrs_s1.pdf").
+
+    Returns:
+        list: One list of (position, similarity) tuples per criterion, most similar first.
+    """
+    if standards_index["index"] is None or not len(criterion_embeddings):
+        return [[] for _ in range(len(criterion_embeddings))]
+    if standard_filter:
+        ids = np.nonzero(standards_index["filenames"] == standard_filter)[0]
+        return [[(int(ids[position]), similarity) for position, similarity in hits]
+                for hits in top_k_similar_batch(criterion_embeddings, standards_index["embeddings"][ids], STANDARDS_CANDIDATES)]
+    return search_similarity_index_batch(standards_index["index"], criterion_embeddings, STANDARDS_CANDIDATES)
+
+@lru_cache(maxsize=2048)
+def analyze_criterion(criterion_lower):
+    """
+    Parses a lowercased criterion once and returns its content tokens and related terms (its own
+    words, their synonym groups, and content-word children). Memoized, so repeated criteria
+    across validations skip spaCy entirely.
+
+    Args:
+        criterion_lower (str): Lowercased criterion.
+
+    Returns:
+        tuple: (frozenset of content tokens, frozenset of related terms).
+    """
+    criterion_doc = nlp(criterion_lower)
+    related_terms = set(criterion_lower.split())
+    for token in criterion_doc:
+        related_terms |= WORD_TO_SYNONYMS.get(token.text, frozenset())
+        related_terms.update([child.text for child in token.children if child.pos_ in POS_SET])
+    return frozenset(token.text for token in criterion_doc if token.pos_ in POS_SET), frozenset(related_terms)
 
 # Regex for numerical values (used for validation checks if needed)
 VALUE_PATTERN = r"([\$€£R\$]?[\d,.]+(?:\s*(?:billion|million|thousand|tCO2e|%|tons|litres|m³|kWh|MWh|hours|employees|USD|EUR|GBP|BRL)))\b"
+VALUE_RE = re.compile(VALUE_PATTERN, re.IGNORECASE)
+
+def first_values(sentences):
+    """
+    Finds the first numerical value in each sentence with a single regex scan over all of them.
+    Sentences are joined with NUL, which no part of VALUE_PATTERN can match, so each match stays
+    inside one sentence and equals what VALUE_RE.search would return for that sentence alone.
+
+    Args:
+        sentences (list): Sentences to scan.
 
-def validate_data(extraction: dict, standard_filter: str = None, standards_texts: dict = None, standards_cache: list = None, requirements_cache: list = None) -> dict:
+    Returns:
+        list: First matched value per sentence, or None where a sentence has no value.
+    """
+    values = [None] * len(sentences)
+    if not sentences:
+        return values
+    starts = []
+    offset = 0
+    for sentence in sentences:
+        starts.append(offset)
+        offset += len(sentence) + 1
+    for value_match in VALUE_RE.finditer("\0".join(sentences)):
+        i = bisect_right(starts, value_match.start()) - 1
+        if values[i] is None:
+            values[i] = value_match.group(1)
+    return values
+
+def validate_data(extraction: dict, standard_filter: str = None, standards_texts: dict = None, standards_cache: list = None, requirements_cache: list = None, assess: bool = True, rag_standards: list = None, standards_index: dict = None, standards_hits: list = None) -> dict:
     """
     Validates extracted data against ESG standards using a precomputed standards cache.
     Matches the criterion against standard clauses/sentences to populate standard_matches for standard_info.
@@ -48,6 +269,12 @@ def validate_data(extraction: dict, standard_filter: str = None, standards_texts
         standards_texts (dict, optional): Cached standards texts {filename: {page_number: text}}.
         standards_cache (list, optional): Precomputed cache of standard sentences with embeddings.
         requirements_cache (list, optional): Precomputed cache of requirements with embeddings.
+        assess (bool): If False, skip the LLM compliance call and return compliance None
+            (or "Failed"), leaving assessment to the caller.
+        rag_standards (list, optional): Prefetched standards RAG results for the criterion; searched if None.
+        standards_index (dict, optional): Index from build_standards_index over standards_cache; built if None.
+        standards_hits (list, optional): This criterion's entry from standards_hits_batch over
+            standards_index; searched if None.
 
     Returns:
         dict: Dictionary with criterion, standard_matches, extracted_sentences, and compliance.
@@ -57,10 +284,10 @@ def validate_data(extraction: dict, standard_filter: str = None, standards_texts
         extracted_matches = extraction.get("matches", [])
         source_file = os.path.basename(extraction.get("source", "") or "Unknown")
         if not criterion:
-            logging.error("No criterion provided in extraction")
+            logger.error("No criterion provided in extraction")
             return {"criterion": criterion, "standard_matches": [], "extracted_sentences": [], "compliance": "Failed"}
 
-        logging.info(f"Processing criterion: {criterion}, source: {source_file}, extracted_matches: {len(extracted_matches)}")
+        logger.info("Processing criterion: %s, source: %s, extracted_matches: %d", criterion, source_file, len(extracted_matches))
 
         # Initialize results
         standard_matches = []
@@ -73,39 +300,45 @@ def validate_data(extraction: dict, standard_filter: str = None, standards_texts
         standards_cache = standards_cache or []
         requirements_cache = requirements_cache or []
 
-        # Load standards texts if not provided
-        standards_text_cache_path = os.path.join(standards_dir, "texts_cache.pkl")
-        if not standards_texts and os.path.exists(standards_text_cache_path):
-            with open(standards_text_cache_path, "rb") as f:
-                cached_texts = pickle.load(f)
-                standards_texts = cached_texts.get("standards", {})
-
         # Step 1: Use extraction['matches'] for extracted_sentences
+        valid_matches = []
         for match in extracted_matches:
-            sentence = match.get("text", "").strip()
-            if not sentence or not isinstance(sentence, str):
-                logging.warning(f"Invalid or empty sentence in extraction['matches'] for {criterion}: {match}")
+            sentence = match.get("text", "")
+            if not isinstance(sentence, str) or not sentence.strip():
+                logger.warning("Invalid or empty sentence in extraction['matches'] for %s: %s", criterion, match)
                 continue
+            sentence = sentence.strip()
             page_number = match.get("page_number", None)
             if not isinstance(page_number, int) or page_number <= 0:
-                logging.warning(f"Invalid page_number {page_number} in extraction['matches']: {sentence[:50]}...")
+                logger.warning("Invalid page_number %s in extraction['matches']: %.50s...", page_number, sentence)
                 continue
-            try:
-                value_match = re.search(VALUE_PATTERN, sentence, re.IGNORECASE)
-                value = value_match.group(1) if value_match else match.get("value", "None")
-                source = match.get("source", source_file or "Unknown")
-                similarity = match.get("similarity", 0.8)
-                extracted_sentences.append({
-                    "criterion": criterion,
-                    "value": value,
-                    "source": source,
-                    "page_number": page_number,
-                    "text": sentence,
-                    "similarity": similarity
-                })
-                logging.info(f"Report match from extraction for '{criterion}': Text='{sentence}', Source={source}, Page={page_number}, Value={value}, Similarity={similarity:.2f}")
-            except Exception as e:
-                logging.warning(f"Failed to process extraction['matches'] sentence '{sentence[:50]}...': {str(e)}")
+            similarity = match.get("similarity", 0.8)
+            if not isinstance(similarity, (int, float)):
+                logger.warning("Invalid similarity %s in extraction['matches']: %.50s...", similarity, sentence)
+                continue
+            valid_matches.append((match, sentence, page_number, similarity))
+
+        # Scan every sentence for values in one pass instead of one regex call per sentence
+        values = first_values([sentence for _, sentence, _, _ in valid_matches])
+        for (match, sentence, page_number, similarity), value in zip(valid_matches, values):
+            if value is None:
+                value = match.get("value", "None")
+            source = match.get("source", source_file or "Unknown")
+            extracted_sentences.append({
+                "criterion": criterion,
+                "value": value,
+                "source": source,
+                "page_number": page_number,
+                "text": sentence,
+                "similarity": similarity
+            })
+            logger.info("Report match from extraction for '%s': Text='%s', Source=%s, Page=%s, Value=%s, Similarity=%.2f",
+                        criterion, sentence, source, page_number, value, similarity)
+
+        # Nothing in the report to validate; skip the standards search and LLM call
+        if not extracted_sentences:
+            logger.warning("No report matches for '%s', marking as Non-compliant", criterion)
+            return {"criterion": criterion, "standard_matches": [], "extracted_sentences": [], "compliance": "Non-compliant"}
 
         # Step 2: Get criterion embedding and description
         criterion_lower = criterion.lower()
@@ -117,159 +350,154 @@ def validate_data(extraction: dict, standard_filter: str = None, standards_texts
                     criterion_embedding = req["embedding"]
                     criterion_description = req["description"]
                     break
-        if criterion_embedding is None or not isinstance(criterion_embedding, torch.Tensor):
+        if criterion_embedding is None or not isinstance(criterion_embedding, (np.ndarray, torch.Tensor)):
             try:
-                criterion_embedding = model.encode(criterion_lower, convert_to_tensor=True)
-                logging.info(f"criterion embedding {criterion_embedding}")
+                criterion_embedding = embed_texts([criterion_lower])[0]
+                logger.debug("criterion embedding %s", criterion_embedding)
             except Exception as e:
-                logging.error(f"Failed to encode criterion '{criterion}': {str(e)}")
+                logger.error("Failed to encode criterion '%s': %s", criterion, e)
                 return {"criterion": criterion, "standard_matches": [], "extracted_sentences": extracted_sentences, "compliance": "Failed"}
+        # Similarities are computed on a float32 numpy vector; workflow requirements already hold rows
+        # of one contiguous float32 matrix, while tensors from other callers are converted once
+        if isinstance(criterion_embedding, torch.Tensor):
+            criterion_embedding = criterion_embedding.detach().cpu().float().numpy()
+        criterion_vector = np.asarray(criterion_embedding, dtype=np.float32)
 
         # Step 3: Find standard sentences/clauses matching the criterion
-        logging.info(f"Finding standard matches for criterion: {criterion}")
-        criterion_doc = nlp(criterion_lower)
-        criterion_tokens = {token.text for token in criterion_doc if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-        related_terms = set(criterion_lower.split())
-        for token in criterion_doc:
-            for key, synonyms in SYNONYMS.items():
-                if token.text in (key, *synonyms):
-                    related_terms.update([key] + synonyms)
-            related_terms.update([child.text for child in token.children if child.pos_ in ('NOUN', 'VERB', 'ADJ')])
+        logger.info("Finding standard matches for criterion: %s", criterion)
+        criterion_tokens, related_terms = analyze_criterion(criterion_lower)
 
         # Step 3a: FAISS-based search for standards
-        rag_standards = search_standards(criterion, document_filter=standard_filter, k=30)
-        logging.info(f"RAG standards found {len(rag_standards)} matches for {criterion}")
+        if rag_standards is None:
+            rag_standards = cached_search_standards(criterion, document_filter=standard_filter, k=30)
+        logger.info("RAG standards found %d matches for %s", len(rag_standards), criterion)
+        rag_candidates = []
         for res in rag_standards:
             sentence = res.get("sentence", "").strip()
             if not sentence or not isinstance(sentence, str):
-                logging.warning(f"Invalid or empty sentence in RAG standards result: {res}")
+                logger.warning("Invalid or empty sentence in RAG standards result: %s", res)
                 continue
             page_number = res.get("page_number", None)
             if not isinstance(page_number, int) or page_number <= 0:
-                logging.warning(f"Invalid page_number {page_number} for standard match: {sentence[:50]}...")
+                logger.warning("Invalid page_number %s for standard match: %.50s...", page_number, sentence)
                 continue
+            rag_candidates.append((res, sentence, page_number))
+
+        # Encode all candidate sentences in one batch and score them with a single matrix-vector product
+        similarities = []
+        if rag_candidates:
             try:
-                sentence_embedding = model.encode(sentence.lower(), convert_to_tensor=True)
-                similarity = util.cos_sim(criterion_embedding, sentence_embedding).item()
-                if similarity > similarity_threshold:
+                sentence_embeddings = embed_texts([sentence.lower() for _, sentence, _ in rag_candidates])
+                similarities = cosine_similarities(criterion_vector, sentence_embeddings).tolist()
+            except Exception as e:
+                logger.warning("Failed to compute similarities for RAG standards of '%s': %s", criterion, e)
+        for (res, sentence, page_number), similarity in zip(rag_candidates, similarities):
+            if similarity > similarity_threshold:
+                standard_matches.append({
+                    "standard": res["document_name"],
+                    "page_number": page_number,
+                    "text": sentence,
+                    "similarity": similarity
+                })
+                logger.info("Standard match added for '%s': Text='%s', Source=%s, Page=%s, Similarity=%.2f",
+                            criterion, sentence, res["document_name"], page_number, similarity)
+            else:
+                logger.debug("Standard sentence skipped for '%s': Text='%s', Similarity=%.2f (below threshold %s)",
+                             criterion, sentence, similarity, similarity_threshold)
+
+        def match_indexed(index, source, kind, hits=None):
+            """Checks the nearest indexed sentences for exact, semantic, token, and term matches."""
+            # Hits precomputed for all criteria by standards_hits_batch are used as given
+            if hits is None:
+                hits = []
+                if index["index"] is not None:
+                    try:
+                        if standard_filter:
+                            # Score only the filtered standard's sentences with one masked matmul
+                            ids = np.nonzero(index["filenames"] == standard_filter)[0]
+                            hits = [(int(ids[position]), similarity) for position, similarity
+                                    in top_k_similar(criterion_vector, index["embeddings"][ids], STANDARDS_CANDIDATES)]
+                        else:
+                            hits = search_similarity_index(index["index"], criterion_vector, STANDARDS_CANDIDATES)
+                    except Exception as e:
+                        logger.warning("Failed to search %s index for '%s': %s", source, criterion, e)
+            # Exact matches need no tagging; the rest are POS-tagged in one batch
+            inexact = []
+            for position, similarity in hits:
+                filename = index["filenames"][position]
+                page_number = int(index["pages"][position])
+                sentence = index["sentences"][position]
+                sentence_lower = sentence.lower()
+                if criterion_lower in sentence_lower or (criterion_description and criterion_description.lower() in sentence_lower):
                     standard_matches.append({
-                        "standard": res["document_name"],
+                        "standard": filename,
                         "page_number": page_number,
                         "text": sentence,
-                        "similarity": similarity
+                        "similarity": 1.0
                     })
-                    logging.info(f"Standard match added for '{criterion}': Text='{sentence}', Source={res['document_name']}, Page={page_number}, Similarity={similarity:.2f}")
-                else:
-                    logging.debug(f"Standard sentence skipped for '{criterion}': Text='{sentence}', Similarity={similarity:.2f} (below threshold {similarity_threshold})")
+                    logger.info("Exact %s match added for '%s': Text='%s', Source=%s, Page=%s, Similarity=1.0",
+                                kind, criterion, sentence, filename, page_number)
+                    continue
+                inexact.append((filename, page_number, sentence, sentence_lower, similarity))
+            try:
+                inexact_tokens = content_tokens([sentence_lower for _, _, _, sentence_lower, _ in inexact])
             except Exception as e:
-                logging.warning(f"Failed to compute similarity for standard sentence '{sentence[:50]}...': {str(e)}")
+                logger.warning("Failed to tag %s sentences for '%s': %s", source, criterion, e)
+                inexact_tokens = [set()] * len(inexact)
+            for (filename, page_number, sentence, sentence_lower, similarity), sentence_tokens in zip(inexact, inexact_tokens):
+                token_overlap = len(criterion_tokens.intersection(sentence_tokens))
+                term_matches = sum(1 for term in related_terms if term in sentence_lower)
+                if similarity > similarity_threshold or token_overlap >= 1 or term_matches >= 1:
+                    standard_matches.append({
+                        "standard": filename,
+                        "page_number": page_number,
+                        "text": sentence,
+                        "similarity": max(similarity, (token_overlap + term_matches) * 0.15)
+                    })
+                    logger.info("%s match added for '%s': Text='%s', Source=%s, Page=%s, Similarity=%.2f, Tokens=%d, Terms=%d",
+                                kind.capitalize(), criterion, sentence, filename, page_number,
+                                standard_matches[-1]["similarity"], token_overlap, term_matches)
+                else:
+                    logger.debug("%s sentence skipped for '%s': Text='%s', Similarity=%.2f, Tokens=%d, Terms=%d",
+                                 source, criterion, sentence, similarity, token_overlap, term_matches)
 
         # Step 3b: Advanced matching using standards_cache
+        # Only the nearest cached sentences from a single index search are checked
         if standards_cache:
-            for entry in standards_cache:
-                if standard_filter and entry["filename"] != standard_filter:
-                    continue
-                sentence = entry.get("sentence", "").strip()
-                if not sentence or not isinstance(sentence, str):
-                    logging.warning(f"Invalid or empty sentence in standards_cache: {entry}")
-                    continue
-                page_number = entry.get("page_number", None)
-                if not isinstance(page_number, int) or page_number <= 0:
-                    logging.warning(f"Invalid page_number {page_number} for standard match: {sentence[:50]}...")
-                    continue
-                sentence_lower = sentence.lower()
-                try:
-                    sentence_embedding = entry.get("embedding")
-                    if not isinstance(sentence_embedding, torch.Tensor):
-                        sentence_embedding = model.encode(sentence_lower, convert_to_tensor=True)
-                    similarity = util.cos_sim(criterion_embedding, sentence_embedding).index()
-                    sentence_doc = nlp(sentence_lower)
-                    sentence_tokens = {token.text for token in sentence_doc if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-
-                    if criterion_lower in sentence_lower or (criterion_description and criterion_description.lower() in sentence_lower):
-                        standard_matches.append({
-                            "standard": entry["filename"],
-                            "page_number": page_number,
-                            "text": sentence,
-                            "similarity": 1.0
-                        })
-                        logging.info(f"Exact standard match added for '{criterion}': Text='{sentence}', Source={entry['filename']}, Page={page_number}, Similarity=1.0")
-                        continue
-
-                    token_overlap = len(criterion_tokens.intersection(sentence_tokens))
-                    term_matches = sum(1 for term in related_terms if term in sentence_lower)
-                    if similarity > similarity_threshold or token_overlap >= 1 or term_matches >= 1:
-                        standard_matches.append({
-                            "standard": entry["filename"],
-                            "page_number": page_number,
-                            "text": sentence,
-                            "similarity": max(similarity, (token_overlap + term_matches) * 0.15)
-                        })
-                        logging.info(f"Standard match added for '{criterion}': Text='{sentence}', Source={entry['filename']}, Page={page_number}, Similarity={max(similarity, (token_overlap + term_matches) * 0.15):.2f}, Tokens={token_overlap}, Terms={term_matches}")
-                    else:
-                        logging.debug(f"Standards cache sentence skipped for '{criterion}': Text='{sentence}', Similarity={similarity:.2f}, Tokens={token_overlap}, Terms={term_matches}")
-                except Exception as e:
-                    logging.warning(f"Failed to process standards_cache entry '{sentence[:50]}...': {str(e)}")
-
-        # Step 3c: Fallback to standards_texts
-        if not standard_matches and standards_texts:
-            logging.info(f"Performing fallback matching for {criterion} in standards texts")
-            for filename, pages in standards_texts.items():
-                if standard_filter and filename != standard_filter:
-                    continue
-                for page_number, text in pages.items():
-                    if not isinstance(page_number, int) or page_number <= 0:
-                        logging.warning(f"Invalid page_number {page_number} in standards_texts: {filename}")
-                        continue
-                    if not text.strip():
-                        logging.warning(f"Empty text for {filename}, page {page_number}")
-                        continue
-                    doc_nlp = nlp(text.lower())
-                    sentences = [sent.text.strip() for sent in doc_nlp.sents if sent.text.strip()]
-                    for idx, sentence in enumerate(sentences):
-                        sentence_lower = sentence.lower()
-                        try:
-                            sentence_embedding = model.encode(sentence_lower, convert_to_tensor=True)
-                            similarity = util.cos_sim(criterion_embedding, sentence_embedding).item()
-                            if criterion_lower in sentence_lower or (criterion_description and criterion_description.lower() in sentence_lower):
-                                standard_matches.append({
-                                    "standard": filename,
-                                    "page_number": page_number,
-                                    "text": sentence,
-                                    "similarity": 1.0
-                                })
-                                logging.info(f"Exact fallback standard match added for '{criterion}': Text='{sentence}', Source={filename}, Page={page_number}, Index={idx}, Similarity=1.0")
-                                continue
-                            sentence_doc = nlp(sentence_lower)
-                            sentence_tokens = {token.text for token in sentence_doc if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-                            token_overlap = len(criterion_tokens.intersection(sentence_tokens))
-                            term_matches = sum(1 for term in related_terms if term in sentence_lower)
-                            if similarity > similarity_threshold or token_overlap >= 1 or term_matches >= 1:
-                                standard_matches.append({
-                                    "standard": filename,
-                                    "page_number": page_number,
-                                    "text": sentence,
-                                    "similarity": max(similarity, (token_overlap + term_matches) * 0.15)
-                                })
-                                logging.info(f"Fallback standard match added for '{criterion}': Text='{sentence}', Source={filename}, Page={page_number}, Index={idx}, Similarity={max(similarity, (token_overlap + term_matches) * 0.15):.2f}, Tokens={token_overlap}, Terms={term_matches}")
-                            else:
-                                logging.debug(f"Fallback standard sentence skipped for '{criterion}': Text='{sentence}', Similarity={similarity:.2f}, Tokens={token_overlap}, Terms={term_matches}")
-                        except Exception as e:
-                            logging.warning(f"Failed to process standards_texts sentence '{sentence[:50]}...': {str(e)}")
+            if standards_index is None:
+                standards_index = build_standards_index(standards_cache)
+            match_indexed(standards_index, "standards_cache", "standard", standards_hits)
+
+        # Step 3c: Fallback to standards_texts, split and indexed once rather than per criterion
+        if not standard_matches:
+            # Load standards texts if not provided
+            standards_text_cache_path = os.path.join(standards_dir, "texts_cache.pkl")
+            if not standards_texts and os.path.exists(standards_text_cache_path):
+                standards_texts = load_pickle(standards_text_cache_path).get("standards", {})
+            if standards_texts:
+                logger.info("Performing fallback matching for %s in standards texts", criterion)
+                match_indexed(get_standards_text_index(standards_texts), "standards_texts", "fallback standard")
 
         # Sort and limit matches
         standard_matches = sorted(standard_matches, key=lambda x: x["similarity"], reverse=True)[:10]
         extracted_sentences = sorted(extracted_sentences, key=lambda x: x["similarity"], reverse=True)[:10]
-        logging.info(f"Final results for '{criterion}': {len(standard_matches)} standard matches, {len(extracted_sentences)} report matches")
-        if standard_matches:
-            logging.info(f"Standard matches for '{criterion}': {[f'Text={m['text']}, Source={m['standard']}, Page={m['page_number']}, Similarity={m['similarity']:.2f}' for m in standard_matches]}")
-        if extracted_sentences:
-            logging.info(f"Report matches for '{criterion}': {[f'Text={m['text']}, Source={m['source']}, Page={m['page_number']}, Value={m['value']}, Similarity={m['similarity']:.2f}' for m in extracted_sentences]}")
+        logger.info("Final results for '%s': %d standard matches, %d report matches", criterion, len(standard_matches), len(extracted_sentences))
+        # Stringifying every match is only worth it when INFO is emitted
+        if standard_matches and logger.isEnabledFor(logging.INFO):
+            logger.info("Standard matches for '%s': %s", criterion,
+                        ["Text=%s, Source=%s, Page=%s, Similarity=%.2f" % (m["text"], m["standard"], m["page_number"], m["similarity"]) for m in standard_matches])
+        if extracted_sentences and logger.isEnabledFor(logging.INFO):
+            logger.info("Report matches for '%s': %s", criterion,
+                        ["Text=%s, Source=%s, Page=%s, Value=%s, Similarity=%.2f" % (m["text"], m["source"], m["page_number"], m["value"], m["similarity"]) for m in extracted_sentences])
 
         # Step 4: Evaluate compliance
         compliance = "Non-compliant"
-        if extracted_sentences and standard_matches:
-            llm = FakeListLLM(responses=["Compliant"])
+        if not assess:
+            compliance = None
+        elif extracted_sentences and standard_matches and not USE_LLM:
+            compliance = rule_based_compliance(extracted_sentences, standard_matches)
+            logger.info("Compliance for '%s': %s", criterion, compliance)
+        elif extracted_sentences and standard_matches:
             prompt = f"""
             Validate if the criterion '{criterion}' is met by the extracted report data:
             Extracted data: {extracted_sentences}
@@ -277,14 +505,14 @@ def validate_data(extraction: dict, standard_filter: str = None, standards_texts
             Determine compliance by checking if the extracted data aligns with the standard requirements.
             """
             try:
-                compliance = llm.invoke(prompt)
-                logging.info(f"Compliance for '{criterion}': {compliance}")
+                compliance = invoke_cached(_LLM, prompt)
+                logger.info("Compliance for '%s': %s", criterion, compliance)
             except Exception as e:
-                logging.warning(f"LangChain evaluation failed for '{criterion}': {str(e)}")
+                logger.warning("LLM evaluation failed for '%s': %s", criterion, e)
         elif not extracted_sentences:
-            logging.warning(f"No report matches for '{criterion}', marking as Non-compliant")
+            logger.warning("No report matches for '%s', marking as Non-compliant", criterion)
         elif not standard_matches:
-            logging.warning(f"No standard matches for '{criterion}', marking as Non-compliant")
+            logger.warning("No standard matches for '%s', marking as Non-compliant", criterion)
 
         result = {
             "criterion": criterion,
@@ -293,9 +521,9 @@ def validate_data(extraction: dict, standard_filter: str = None, standards_texts
             "compliance": compliance
         }
 
-        logging.info(f"Validation complete for '{criterion}': Compliance={compliance}, Standard matches={len(standard_matches)}, Report matches={len(extracted_sentences)}")
+        logger.info("Validation complete for '%s': Compliance=%s, Standard matches=%d, Report matches=%d", criterion, compliance, len(standard_matches), len(extracted_sentences))
         return result
 
     except Exception as e:
-        logging.error(f"Validation failed for '{criterion}': {str(e)}")
+        logger.error("Validation failed for '%s': %s", criterion, e)
         return {"criterion": criterion, "standard_matches": [], "extracted_sentences": extracted_sentences, "compliance": "Failed"}
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+This module provides a persistent cache of extraction results for the ESG Engine. Results of
+advanced matching and Reports RAG extraction are stored in a SQLite database keyed by the report
+path, a SHA-256 digest of the report's bytes, the criterion, its description, the encoder, and the
+extraction version, so rerunning the workflow on an unchanged report skips extraction for every
+criterion seen before. Editing the report, switching the encoder backend or ONNX graph, or bumping
+EXTRACTION_VERSION changes the key, so stale results are never served.
+
+file path: esg_engine/agents/extraction/cache.py
+"""
+
+import pickle
+import hashlib
+import logging
+import sqlite3
+import threading
+from config.settings import OUTPUT_DIR
+from utils.text_processing import encoder_key
+from utils.content_hash import file_digest
+
+logger = logging.getLogger(__name__)
+
+# Cache location; kept next to the other engine outputs
+CACHE_PATH = OUTPUT_DIR / "extraction_cache.db"
+
+# Part of every key; bump when matching thresholds, extraction logic, or the result format change
+EXTRACTION_VERSION = 1
+
+_connection = None
+_lock = threading.Lock()
+
+def _get_connection():
+    """Opens the cache database once per process and creates the table if needed."""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute("CREATE TABLE IF NOT EXISTS extractions (key TEXT PRIMARY KEY, result BLOB)")
+        _connection.commit()
+    return _connection
+
+def report_digest(report_path):
+    """
+    Returns the SHA-256 digest of a report's bytes, hashing each file version once per process.
+
+    Args:
+        report_path (str): Path to the report PDF.
+
+    Returns:
+        str: Hex SHA-256 digest, or None if the report cannot be read.
+    """
+    try:
+        return file_digest(report_path)
+    except OSError:
+        return None
+
+def _cache_key(report_path, criterion, description):
+    """Builds the cache key for a criterion against the current contents of a report, the loaded
+    encoder, and the extraction version."""
+    digest = report_digest(report_path)
+    if digest is None:
+        return None
+    return hashlib.sha256(f"{EXTRACTION_VERSION}\0{encoder_key()}\0{report_path}\0{digest}\0{criterion}\0{description}".encode("utf-8")).hexdigest()
+
+def read_extraction(report_path, criterion, description=None):
+    """
+    Returns the stored extraction result for a criterion, or None on a miss or read failure.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        criterion (str): Requirement criterion.
+        description (str, optional): Criterion description used for fallback matching.
+
+    Returns:
+        dict: Extraction result with criterion and matches, or None.
+    """
+    key = _cache_key(report_path, criterion, description)
+    if key is None:
+        return None
+    try:
+        with _lock:
+            row = _get_connection().execute("SELECT result FROM extractions WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            return pickle.loads(row[0])
+    except (sqlite3.Error, pickle.UnpicklingError) as e:
+        logger.warning(f"Extraction cache read failed: {str(e)}")
+    return None
+
+def write_extraction(report_path, criterion, description, result):
+    """
+    Stores an extraction result; callers only store results of searches that completed.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        criterion (str): Requirement criterion.
+        description (str): Criterion description used for fallback matching.
+        result (dict): Extraction result with criterion and matches.
+
+    Returns:
+        None
+    """
+    key = _cache_key(report_path, criterion, description)
+    if key is None:
+        return
+    try:
+        with _lock:
+            conn = _get_connection()
+            conn.execute("INSERT OR REPLACE INTO extractions (key, result) VALUES (?, ?)", (key, pickle.dumps(result)))
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"Extraction cache write failed: {str(e)}")
+
+def clear_extraction_store():
+    """
+    Removes all stored extraction results.
+
+    Returns:
+        None
+    """
+    try:
+        with _lock:
+            conn = _get_connection()
+            conn.execute("DELETE FROM extractions")
+            conn.commit()
+        logger.info("Cleared persistent extraction cache")
+    except sqlite3.Error as e:
+        logger.warning(f"Extraction cache clear failed: {str(e)}")
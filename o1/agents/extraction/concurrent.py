@@ -1,44 +1,44 @@
 """
 This module manages concurrent extraction for multiple criteria in the ESG Engine,
-using threading to speed up the process while respecting resource limits.
+batching all criteria into a single Reports RAG query and running the remaining per-criterion
+work on an asyncio pipeline bounded by the resource monitor's sub-agent budget.
 
 file path: esg_engine/agents/extraction/concurrent.py
 """
 
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from config.settings import get_settings
-from .searcher import extract_data
-from agents.monitoring.resource_monitor import monitor_resources
-import os
-
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "extraction.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-def concurrent_extract(report_path, criteria, criteria_descriptions, report_page_texts, standards_texts):
+from .searcher import extract_data_batch_async
+from agents.monitoring.worker_pool import current_budget
+
+logger = logging.getLogger(__name__)
+
+async def concurrent_extract_async(report_path, criteria, criteria_descriptions=None, report_page_texts=None, standards_texts=None):
     """
-    Concurrently extracts data for multiple criteria using threading.
+    Extracts data for multiple criteria with one batched Reports RAG search, running per-criterion
+    fallbacks concurrently with asyncio.gather under a bounded semaphore.
 
     Args:
         report_path (str): Path to the report PDF.
         criteria (list): List of criteria to search for.
-        criteria_descriptions (dict): Dictionary mapping criteria to descriptions.
-        report_page_texts (dict): Cached report texts {page_number: text}.
-        standards_texts (dict): Cached standards texts {filename: {page_number: text}}.
+        criteria_descriptions (dict, optional): Dictionary mapping criteria to descriptions.
+        report_page_texts (dict, optional): Cached report texts {page_number: text}.
+        standards_texts (dict, optional): Cached standards texts {filename: {page_number: text}}.
+
+    Returns:
+        list: List of extraction results for each criterion, in input order.
+    """
+    max_concurrency = current_budget()
+    logger.info(f"Extracting {len(criteria)} criteria with a single batched search, up to {max_concurrency} concurrent fallbacks")
+    results = await extract_data_batch_async(report_path, criteria, criteria_descriptions or {}, report_page_texts, max_concurrency)
+    logger.info(f"Completed concurrent extraction for {len(criteria)} criteria")
+    return results
+
+def concurrent_extract(*args, **kwargs):
+    """
+    Synchronous entry point for concurrent_extract_async; see its docstring for arguments.
 
     Returns:
-        list: List of extraction results for each criterion.
+        list: List of extraction results for each criterion, in input order.
     """
-    resource_info = monitor_resources()
-    max_workers = resource_info["max_sub_agents"]
-    logging.info(f"Using {max_workers} concurrent workers for extraction with cached report texts")
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        results = list(executor.map(
-            lambda c: extract_data(report_path, c, criteria_descriptions.get(c), report_page_texts),
-            criteria
-        ))
-    logging.info(f"Completed concurrent extraction for {len(criteria)} criteria")
-    return results
\ No newline at end of file
+    return asyncio.run(concurrent_extract_async(*args, **kwargs))
@@ -7,32 +7,497 @@ matching of criteria against report content.
 file path: esg_engine/agents/extraction/searcher.py
 """
 
+import asyncio
 import logging
 import re
-import spacy
+import threading
 from datetime import datetime
 from config.settings import get_settings
 from rag.reports_rag.searcher import search_report
-from sentence_transformers import SentenceTransformer, util
 import os
 import pickle
-from utils.synonyms import SYNONYMS  # Import shared synonyms
+import numpy as np
+from utils.pickle_cache import load_pickle
+from utils.synonyms import WORD_TO_SYNONYMS  # Import shared synonyms
+from utils.semantic_cache import SemanticCache
+from agents.monitoring.worker_pool import bounded_submit
+from agents.extraction.cache import read_extraction, write_extraction
+from utils.text_processing import nlp, embed_texts, content_tokens, POS_SET
+from utils.vector_utils import cosine_similarities, cosine_similarity_matrix
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "extraction.log")
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # Cache configuration
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".esg_engine_cache")
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# Load models once at module level
-model = SentenceTransformer('all-MiniLM-L6-v2')
-nlp = spacy.load("en_core_web_sm")
+
+# Page similarity above which a page matches on its own; changing it requires bumping
+# agents.extraction.cache.EXTRACTION_VERSION so stored results are recomputed
+SIMILARITY_THRESHOLD = 0.6
+
+# Value regex template; {} is replaced by the escaped criterion or description
+VALUE_TEMPLATE = r"(?:{})\s*[:=]?\s*([\$€£R\$]?[\d,.]+(?:\s*(?:billion|million|thousand|tCO2e|%|tons|litres|m³|kWh|MWh|hours|employees)))\b"
+
+# In-process cache of extraction results keyed by (report_path, criterion, description)
+_extract_cache = {}
+_extract_cache_lock = threading.Lock()
+
+# Per-report LSH caches so paraphrased criteria reuse matches of a near-identical criterion
+_semantic_caches = {}
+
+# Per-report page embeddings, encoded in one batch and shared by every criterion
+_page_embeddings = {}
+
+# Per-report content tokens of each page, tagged in one nlp.pipe pass and shared by every criterion
+_page_tokens = {}
+_page_embeddings_lock = threading.Lock()
+
+def clear_extract_cache():
+    """
+    Clears the in-process extraction cache. Called at the start of each workflow run so results
+    from a previously indexed report are not reused from memory; the persistent store in
+    agents.extraction.cache still serves results from earlier runs, keyed by report contents,
+    encoder, and extraction version, and needs no clearing.
+
+    Returns:
+        None
+    """
+    with _extract_cache_lock:
+        _extract_cache.clear()
+        _semantic_caches.clear()
+    with _page_embeddings_lock:
+        _page_embeddings.clear()
+        _page_tokens.clear()
+    logger.info("Cleared extraction cache")
+
+def _cache_get(key):
+    """
+    Returns a copy of a cached extraction result, or None on a miss. Misses in memory fall back to
+    the persistent store, which holds results from earlier runs on the same report contents.
+    """
+    with _extract_cache_lock:
+        cached = _extract_cache.get(key)
+    if cached is None:
+        cached = read_extraction(*key)
+        if cached is None:
+            return None
+        with _extract_cache_lock:
+            _extract_cache[key] = cached
+    return {"criterion": cached["criterion"], "matches": [dict(m) for m in cached["matches"]]}
+
+def _cache_put(key, result, persist=True):
+    """
+    Stores a copy of an extraction result so callers can mutate theirs freely, and persists it
+    for later runs unless persist is False.
+    """
+    stored = {"criterion": result["criterion"], "matches": [dict(m) for m in result["matches"]]}
+    with _extract_cache_lock:
+        _extract_cache[key] = stored
+    if persist:
+        write_extraction(*key, stored)
+
+def _semantic_get(report_path, criterion, embedding):
+    """Returns matches cached for a semantically equivalent criterion, relabelled for this one."""
+    with _extract_cache_lock:
+        cache = _semantic_caches.get(report_path)
+    matches = cache.lookup(embedding) if cache else None
+    if matches is None:
+        return None
+    return {"criterion": criterion, "matches": [dict(m, criterion=criterion) for m in matches]}
+
+def _semantic_put(report_path, embedding, result):
+    """Stores non-empty matches in the report's semantic cache."""
+    if not result["matches"]:
+        return
+    with _extract_cache_lock:
+        cache = _semantic_caches.get(report_path)
+        if cache is None:
+            cache = _semantic_caches[report_path] = SemanticCache(len(embedding))
+    cache.store(embedding, [dict(m) for m in result["matches"]])
+
+def _get_page_embeddings(report_path, page_texts):
+    """
+    Returns embeddings for every page of a report, encoding all pages in one batched call the
+    first time any criterion needs them.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        page_texts (dict): Page texts {page_number: text}.
+
+    Returns:
+        tuple: (page_numbers, np.ndarray of shape (len(page_numbers), dimension)).
+    """
+    with _page_embeddings_lock:
+        embeddings = _page_embeddings.get(report_path)
+        if embeddings is None or embeddings[0] != tuple(page_texts.keys()):
+            embeddings = (tuple(page_texts.keys()), embed_texts(list(page_texts.values())))
+            _page_embeddings[report_path] = embeddings
+    return embeddings
+
+def _get_page_tokens(report_path, page_texts):
+    """
+    Returns the noun, verb, and adjective tokens of every page of a report, tagging all pages
+    in one batched spaCy pass the first time any criterion needs them.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        page_texts (dict): Page texts {page_number: text}.
+
+    Returns:
+        dict: Mapping {page_number: set of token strings}.
+    """
+    with _page_embeddings_lock:
+        tokens = _page_tokens.get(report_path)
+        if tokens is None or tokens.keys() != page_texts.keys():
+            tokens = dict(zip(page_texts.keys(), content_tokens(list(page_texts.values()), batch_size=32)))
+            _page_tokens[report_path] = tokens
+    return tokens
+
+def _analyze_query(query_lower, doc, embedding):
+    """Builds the report-independent matching inputs for one lowercased criterion or description."""
+    related_terms = set()
+    for token in doc:
+        related_terms |= WORD_TO_SYNONYMS.get(token.text, frozenset())
+        related_terms.update([child.text for child in token.children if child.pos_ in POS_SET])
+    return {
+        "text": query_lower,
+        "embedding": embedding,
+        "pattern": re.compile(VALUE_TEMPLATE.format(re.escape(query_lower)), re.IGNORECASE),
+        "tokens": {token.text for token in doc if token.pos_ in POS_SET},
+        "related_terms": related_terms
+    }
+
+def precompute_criteria(criteria: list, criteria_descriptions: dict = None) -> dict:
+    """
+    Precomputes everything advanced matching needs that depends only on the criterion: its
+    embedding, compiled value regex, content tokens, and related terms, for the criterion and its
+    description. All queries are embedded in one batch and parsed in one nlp.pipe pass, so the
+    work is done once per batch rather than once per worker.
+
+    Args:
+        criteria (list): Criteria to analyze.
+        criteria_descriptions (dict, optional): Dictionary mapping criteria to descriptions.
+
+    Returns:
+        dict: {criterion: {"criterion": analysis, "description": analysis or None}}.
+    """
+    descriptions = {criterion: description.lower() for criterion, description in (criteria_descriptions or {}).items()
+                    if isinstance(description, str) and description}
+    queries = list(dict.fromkeys(
+        [criterion.lower() for criterion in criteria] +
+        [descriptions[criterion] for criterion in criteria if criterion in descriptions]
+    ))
+    if not queries:
+        return {}
+    embeddings = embed_texts(queries)
+    analyses = {query: _analyze_query(query, doc, embedding)
+                for query, doc, embedding in zip(queries, nlp.pipe(queries), embeddings)}
+    return {
+        criterion: {
+            "criterion": analyses[criterion.lower()],
+            "description": analyses[descriptions[criterion]] if criterion in descriptions else None
+        }
+        for criterion in criteria
+    }
+
+def _batch_page_similarities(report_path, page_texts, analyses):
+    """
+    Scores every precomputed criterion and description against every page of a report with a
+    single (queries x pages) matrix product, instead of one product per worker.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        page_texts (dict): Page texts {page_number: text}.
+        analyses (dict): Output of precompute_criteria.
+
+    Returns:
+        dict: Mapping {lowercased query: {page_number: cosine similarity}}.
+    """
+    queries = {}
+    for entry in analyses.values():
+        for analysis in (entry["criterion"], entry["description"]):
+            if analysis is not None:
+                queries[analysis["text"]] = analysis["embedding"]
+    page_numbers, embeddings = _get_page_embeddings(report_path, page_texts)
+    if not queries or not page_numbers:
+        return {}
+    matrix = cosine_similarity_matrix(np.stack(list(queries.values())), embeddings)
+    return {query: dict(zip(page_numbers, row.tolist())) for query, row in zip(queries, matrix)}
+
+def _exact_value_match(criterion, query_lower, query_pattern, report_path, lowered_texts):
+    """
+    Returns a match for the first page that contains the query verbatim followed by a value,
+    using only substring and regex checks.
+
+    Args:
+        criterion (str): Criterion the match is reported for.
+        query_lower (str): Lowercased criterion or description.
+        query_pattern (re.Pattern): Compiled value regex for the query.
+        report_path (str): Path to the report PDF.
+        lowered_texts (dict): Lowercased page texts {page_number: text}.
+
+    Returns:
+        dict: Match with similarity 1.0, or None if no page matches exactly.
+    """
+    for page_number, text_lower in lowered_texts.items():
+        if query_lower in text_lower:
+            regex_match = query_pattern.search(text_lower)
+            if regex_match:
+                return {
+                    "criterion": criterion,
+                    "value": regex_match.group(1),
+                    "source": report_path,
+                    "page_number": page_number,
+                    "similarity": 1.0
+                }
+    return None
+
+def _page_similarities(query_embedding, page_embeddings):
+    """
+    Scores a query against every page of a report in one vectorized call.
+
+    Args:
+        query_embedding (np.ndarray): Embedding of the lowercased criterion or description.
+        page_embeddings (tuple): (page_numbers, embeddings) from _get_page_embeddings.
+
+    Returns:
+        dict: Mapping {page_number: cosine similarity}.
+    """
+    page_numbers, embeddings = page_embeddings
+    if not page_numbers:
+        return {}
+    return dict(zip(page_numbers, cosine_similarities(query_embedding, embeddings).tolist()))
+
+def _fuzzy_matches(criterion, label, report_path, lowered_texts, page_similarities, page_tokens, query_tokens, related_terms, threshold):
+    """
+    Returns a match for every page that is similar to the query, shares a content token with it,
+    or mentions one of its related terms. The checks run cheapest first and stop at the first hit;
+    shared tokens are tested with isdisjoint, which builds no intersection set.
+
+    Args:
+        criterion (str): Criterion the matches are reported for.
+        label (str): How the query is named in match values, e.g. "'emissions'" or "description".
+        report_path (str): Path to the report PDF.
+        lowered_texts (dict): Lowercased page texts {page_number: text}.
+        page_similarities (dict): Cosine similarity of the query to each page {page_number: score}.
+        page_tokens (dict): Content tokens of each page {page_number: set}.
+        query_tokens (set): Content tokens of the query.
+        related_terms (set): Synonyms and dependents of the query's words.
+        threshold (float): Similarity above which a page matches on its own.
+
+    Returns:
+        list: Match dictionaries in page order.
+    """
+    matches = []
+    for page_number, text_lower in lowered_texts.items():
+        similarity = page_similarities[page_number]
+        if (similarity > threshold or
+            not query_tokens.isdisjoint(page_tokens[page_number]) or
+            any(term in text_lower for term in related_terms)):
+            matches.append({
+                "criterion": criterion,
+                "value": f"Found {label} in page {page_number}",
+                "source": report_path,
+                "page_number": page_number,
+                "similarity": similarity
+            })
+    return matches
+
+def _load_page_texts(report_path, page_texts=None):
+    """
+    Returns page texts for a report, loading them from the per-report pickle cache or
+    extracting them from the PDF when no cached texts are provided.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        page_texts (dict, optional): Cached page texts {page_number: text}.
+
+    Returns:
+        dict: Page texts {page_number: text}.
+    """
+    reports_dir = settings["data_paths"]["reports"]
+    report_cache_path = os.path.join(reports_dir, f"{os.path.basename(report_path)}_texts.pkl")
+    if page_texts:
+        logger.info(f"Using provided cached report texts for {report_path}")
+    elif os.path.exists(report_cache_path):
+        page_texts = load_pickle(report_cache_path)
+        logger.info(f"Loaded cached report texts from {report_cache_path}")
+    else:
+        logger.info(f"No cached texts for {report_path}, extracting")
+        from utils.pdf_processing import extract_pdf_text
+        documents = extract_pdf_text(report_path)
+        page_texts = {doc['page_number']: doc['text'] for doc in documents}
+        with open(report_cache_path, "wb") as f:
+            pickle.dump(page_texts, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Saved report texts to {report_cache_path}")
+    return page_texts
 
 def extract_data(report_path: str, criterion: str, description: str = None, page_texts: dict = None) -> dict:
+    """
+    Searches the Reports RAG for a single criterion, returning matches with context.
+    Results are memoized per (report_path, criterion, description), so retries and repeated
+    criteria are served from memory instead of re-running the search. Paraphrased criteria with
+    cosine similarity >= 0.95 to a cached criterion reuse its matches via an LSH semantic cache.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        criterion (str): Requirement criterion to search for.
+        description (str, optional): Description for fallback matching.
+        page_texts (dict, optional): Cached page texts {page_number: text}.
+
+    Returns:
+        dict: Dictionary with criterion and matches (metadata, context, similarity scores).
+    """
+    key = (report_path, criterion, description)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info(f"Extraction cache hit for {criterion}")
+        return cached
+
+    # Reuse matches of a near-duplicate criterion before querying the Reports RAG
+    embedding = embed_texts([criterion])[0]
+    similar = _semantic_get(report_path, criterion, embedding)
+    if similar is not None:
+        logger.info(f"Semantic cache hit for {criterion}")
+        _cache_put(key, similar, persist=False)
+        return similar
+
+    result, cacheable = _extract_uncached(report_path, criterion, description, page_texts)
+    if cacheable:
+        _cache_put(key, result)
+        _semantic_put(report_path, embedding, result)
+    return result
+
+def extract_data_batch(report_path: str, criteria: list, criteria_descriptions: dict = None, page_texts: dict = None, max_concurrency: int = 1, on_result=None, slots=None) -> list:
+    """
+    Synchronous wrapper around extract_data_batch_async.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        criteria (list): List of criteria to search for.
+        criteria_descriptions (dict, optional): Dictionary mapping criteria to descriptions.
+        page_texts (dict, optional): Cached page texts {page_number: text}.
+        max_concurrency (int): Maximum number of concurrent advanced-matching fallbacks.
+        on_result (callable, optional): Called as on_result(index, result) as each criterion completes.
+        slots (threading.Semaphore, optional): Budget shared with other work on the pool; replaces max_concurrency.
+
+    Returns:
+        list: Extraction results, one per criterion, in input order.
+    """
+    return asyncio.run(extract_data_batch_async(report_path, criteria, criteria_descriptions, page_texts, max_concurrency, on_result, slots))
+
+async def extract_data_batch_async(report_path: str, criteria: list, criteria_descriptions: dict = None, page_texts: dict = None, max_concurrency: int = 1, on_result=None, slots=None) -> list:
+    """
+    Extracts data for multiple criteria with a single batched Reports RAG query. Criteria already
+    in the extraction cache, or near-duplicates of a cached criterion, are skipped; the rest are
+    embedded and searched together, and only criteria without RAG matches fall through to advanced
+    matching, which is submitted to the shared worker pool only once one of max_concurrency slots,
+    or of the caller's shared slots, is free.
+
+    Args:
+        report_path (str): Path to the report PDF.
+        criteria (list): List of criteria to search for.
+        criteria_descriptions (dict, optional): Dictionary mapping criteria to descriptions.
+        page_texts (dict, optional): Cached page texts {page_number: text}.
+        max_concurrency (int): Maximum number of concurrent advanced-matching fallbacks.
+        on_result (callable, optional): Called as on_result(index, result) as each criterion
+            completes, so callers can start downstream work before the whole batch finishes. It runs
+            on the event loop and must not block.
+        slots (threading.Semaphore, optional): Budget shared with other work on the pool, so that
+            fallbacks and the caller's tasks together stay within it; replaces max_concurrency.
+
+    Returns:
+        list: Extraction results, one per criterion, in input order.
+    """
+    criteria_descriptions = criteria_descriptions or {}
+    results = [None] * len(criteria)
+
+    def complete(i, result):
+        results[i] = result
+        if on_result is not None:
+            on_result(i, result)
+
+    pending = []
+    for i, criterion in enumerate(criteria):
+        cached = _cache_get((report_path, criterion, criteria_descriptions.get(criterion)))
+        if cached is not None:
+            complete(i, cached)
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+
+    # Reuse matches of near-duplicate criteria before querying the Reports RAG
+    embeddings = dict(zip([criteria[i] for i in pending], embed_texts([criteria[i] for i in pending])))
+    remaining = []
+    for i in pending:
+        criterion = criteria[i]
+        similar = _semantic_get(report_path, criterion, embeddings[criterion])
+        if similar is not None:
+            _cache_put((report_path, criterion, criteria_descriptions.get(criterion)), similar, persist=False)
+            complete(i, similar)
+        else:
+            remaining.append(i)
+    logger.info(f"Batch extraction: {len(criteria) - len(remaining)} cached, {len(remaining)} to search")
+    pending = remaining
+    if not pending:
+        return results
+
+    # Step 1: One RAG query for every uncached criterion
+    pending_criteria = list(dict.fromkeys(criteria[i] for i in pending))
+    try:
+        rag_results = search_report(pending_criteria, k=5)
+    except Exception as e:
+        logger.error(f"Batched Reports RAG search failed: {str(e)}")
+        rag_results = []
+    rag_by_criterion = {res["criterion"]: res.get("matches", []) for res in rag_results}
+
+    # Load page texts once for every criterion that falls through to advanced matching
+    if any(not rag_by_criterion.get(criteria[i]) for i in pending):
+        try:
+            page_texts = _load_page_texts(report_path, page_texts)
+        except Exception as e:
+            logger.error(f"Failed to load page texts for {report_path}: {str(e)}")
+
+    # Analyze every fallback criterion once, in one batch, instead of inside each worker
+    fallback_criteria = [criterion for criterion in pending_criteria if not rag_by_criterion.get(criterion)]
+    try:
+        analyses = precompute_criteria(fallback_criteria, criteria_descriptions)
+    except Exception as e:
+        logger.error(f"Failed to precompute criteria analysis: {str(e)}")
+        analyses = {}
+
+    # Score all fallback queries against all pages at once
+    similarities = {}
+    if analyses and page_texts:
+        try:
+            similarities = _batch_page_similarities(report_path, page_texts, analyses)
+        except Exception as e:
+            logger.error(f"Failed to compute batched page similarities: {str(e)}")
+
+    if slots is None:
+        slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    async def finish(i):
+        criterion = criteria[i]
+        description = criteria_descriptions.get(criterion)
+        # Wait for a slot off the event loop, so pool threads only ever run admitted work
+        future = await asyncio.get_running_loop().run_in_executor(
+            None, bounded_submit, slots, _extract_uncached, report_path, criterion, description, page_texts,
+            rag_by_criterion.get(criterion, []), analyses.get(criterion), similarities
+        )
+        result, cacheable = await asyncio.wrap_future(future)
+        if cacheable:
+            _cache_put((report_path, criterion, description), result)
+            _semantic_put(report_path, embeddings[criterion], result)
+        complete(i, result)
+
+    await asyncio.gather(*(finish(i) for i in pending))
+    return results
+
+def _extract_uncached(report_path: str, criterion: str, description: str = None, page_texts: dict = None, rag_matches: list = None, analysis: dict = None, similarities: dict = None) -> tuple:
     """
     Searches the Reports RAG for a single criterion, returning matches with context.
     Uses direct string matching, semantic similarity, and contextual analysis with spaCy.
@@ -43,148 +508,83 @@ def extract_data(report_path: str, criterion: str, description: str = None, page
         criterion (str): Requirement criterion to search for.
         description (str, optional): Description for fallback matching.
         page_texts (dict, optional): Cached page texts {page_number: text}.
+        rag_matches (list, optional): Precomputed Reports RAG matches; searched when None.
+        analysis (dict, optional): Entry from precompute_criteria for this criterion; computed when None.
+        similarities (dict, optional): Page similarities from _batch_page_similarities, keyed by query.
 
     Returns:
-        dict: Dictionary with criterion and matches (metadata, context, similarity scores).
+        tuple: (result dict with criterion and matches, bool indicating whether the result may be cached).
     """
     try:
         matches = []
-        similarity_threshold = 0.6
-        pattern = r"(?:{})\s*[:=]?\s*([\$€£R\$]?[\d,.]+(?:\s*(?:billion|million|thousand|tCO2e|%|tons|litres|m³|kWh|MWh|hours|employees)))\b"
-
-        # Check for cached page texts
-        reports_dir = settings["data_paths"]["reports"]
-        report_cache_path = os.path.join(reports_dir, f"{os.path.basename(report_path)}_texts.pkl")
-        if page_texts:
-            logging.info(f"Using provided cached report texts for {report_path}")
-        elif os.path.exists(report_cache_path):
-            with open(report_cache_path, "rb") as f:
-                page_texts = pickle.load(f)
-            logging.info(f"Loaded cached report texts from {report_cache_path}")
-        else:
-            logging.info(f"No cached texts for {report_path}, extracting")
-            from utils.pdf_processing import extract_pdf_text
-            documents = extract_pdf_text(report_path)
-            page_texts = {doc['page_number']: doc['text'] for doc in documents}
-            with open(report_cache_path, "wb") as f:
-                pickle.dump(page_texts, f)
-            logging.info(f"Saved report texts to {report_cache_path}")
+        similarity_threshold = SIMILARITY_THRESHOLD
 
         # Step 1: RAG search
-        logging.info(f"Searching Reports RAG for criterion: {criterion}")
-        rag_results = search_report([criterion], k=5)
-        if rag_results:
-            for res in rag_results:
+        if rag_matches is None:
+            logger.info(f"Searching Reports RAG for criterion: {criterion}")
+            rag_results = search_report([criterion], k=5)
+            rag_matches = rag_results[0]["matches"] if rag_results else []
+        if rag_matches:
+            for res in rag_matches:
                 matches.append({
                     "criterion": criterion,
                     "value": res.get("sentence", "None"),
+                    "text": res.get("sentence", ""),
                     "source": res.get("document_name", report_path),
                     "page_number": res.get("page_number", 0),
                     "similarity": 1.0
                 })
-            logging.info(f"RAG found {len(matches)} matches for {criterion}")
-            return {"criterion": criterion, "matches": matches}
+            logger.info(f"RAG found {len(matches)} matches for {criterion}")
+            return {"criterion": criterion, "matches": matches}, True
 
         # Step 2: Advanced matching
-        logging.info(f"No RAG matches for {criterion}, using advanced matching")
-        criterion_lower = criterion.lower()
-        criterion_pattern = pattern.format(re.escape(criterion_lower))
-        criterion_embedding = model.encode(criterion_lower, convert_to_tensor=True)
-        criterion_doc = nlp(criterion_lower)
-        criterion_tokens = {token.text for token in criterion_doc if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-        related_terms = set()
-
-        for token in criterion_doc:
-            for key, synonyms in SYNONYMS.items():
-                if token.text in (key, *synonyms):
-                    related_terms.update([key] + synonyms)
-            related_terms.update([child.text for child in token.children if child.pos_ in ('NOUN', 'VERB', 'ADJ')])
-
-        for page_number, text in page_texts.items():
-            text_lower = text.lower()
-            if criterion_lower in text_lower:
-                regex_match = re.search(criterion_pattern, text_lower, re.IGNORECASE)
-                if regex_match:
-                    value = regex_match.group(1)
-                    matches.append({
-                        "criterion": criterion,
-                        "value": value,
-                        "source": report_path,
-                        "page_number": page_number,
-                        "similarity": 1.0
-                    })
-                    return {"criterion": criterion, "matches": matches}
-
-            doc_embedding = model.encode(text, convert_to_tensor=True)
-            similarity = util.cos_sim(criterion_embedding, doc_embedding).item()
-            doc_nlp = nlp(text)
-            doc_tokens = {token.text for token in doc_nlp if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-
-            if (similarity > similarity_threshold or
-                len(criterion_tokens.intersection(doc_tokens)) > 0 or
-                any(term in text_lower for term in related_terms)):
-                regex_match = re.search(criterion_pattern, text_lower, re.IGNORECASE)
-                value = regex_match.group(1) if regex_match else f"Found '{criterion}' in page {page_number}"
-                matches.append({
-                    "criterion": criterion,
-                    "value": value,
-                    "source": report_path,
-                    "page_number": page_number,
-                    "similarity": similarity
-                })
+        logger.info(f"No RAG matches for {criterion}, using advanced matching")
+        page_texts = _load_page_texts(report_path, page_texts)
+        lowered_texts = {page_number: text.lower() for page_number, text in page_texts.items()}
+        if analysis is None:
+            analysis = precompute_criteria([criterion], {criterion: description})[criterion]
+        criterion_analysis = analysis["criterion"]
+        criterion_lower = criterion_analysis["text"]
+        criterion_pattern = criterion_analysis["pattern"]
+
+        # An exact criterion-value match settles the criterion before any embedding or tagging work
+        exact = _exact_value_match(criterion, criterion_lower, criterion_pattern, report_path, lowered_texts)
+        if exact:
+            return {"criterion": criterion, "matches": [exact]}, True
+
+        # The exact scan already ran the value regex on every page containing the criterion, and it
+        # cannot match elsewhere, so fuzzy matches below carry a placeholder value without rescanning
+        # Load batched page embeddings and tokens only when fuzzy matching is needed
+        page_embeddings = _get_page_embeddings(report_path, page_texts)
+        page_tokens = _get_page_tokens(report_path, page_texts)
+        similarities = similarities or {}
+        page_similarities = similarities.get(criterion_lower) or _page_similarities(criterion_analysis["embedding"], page_embeddings)
+        criterion_tokens = criterion_analysis["tokens"]
+        related_terms = criterion_analysis["related_terms"]
+
+        matches = _fuzzy_matches(criterion, f"'{criterion}'", report_path, lowered_texts, page_similarities,
+                                 page_tokens, criterion_tokens, related_terms, similarity_threshold)
 
         # Step 3: Fallback to description
-        if description and not matches:
-            logging.info(f"Falling back to description: {description}")
-            description_lower = description.lower()
-            description_pattern = pattern.format(re.escape(description_lower))
-            description_embedding = model.encode(description_lower, convert_to_tensor=True)
-            description_doc = nlp(description_lower)
-            description_tokens = {token.text for token in description_doc if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-            related_terms = set()
-
-            for token in description_doc:
-                for key, synonyms in SYNONYMS.items():
-                    if token.text in (key, *synonyms):
-                        related_terms.update([key] + synonyms)
-                related_terms.update([child.text for child in token.children if child.pos_ in ('NOUN', 'VERB', 'ADJ')])
-
-            for page_number, text in page_texts.items():
-                text_lower = text.lower()
-                if description_lower in text_lower:
-                    regex_match = re.search(description_pattern, text_lower, re.IGNORECASE)
-                    if regex_match:
-                        value = regex_match.group(1)
-                        matches.append({
-                            "criterion": criterion,
-                            "value": value,
-                            "source": report_path,
-                            "page_number": page_number,
-                            "similarity": 1.0
-                        })
-                        return {"criterion": criterion, "matches": matches}
-
-                doc_embedding = model.encode(text, convert_to_tensor=True)
-                similarity = util.cos_sim(description_embedding, doc_embedding).item()
-                doc_nlp = nlp(text)
-                doc_tokens = {token.text for token in doc_nlp if token.pos_ in ('NOUN', 'VERB', 'ADJ')}
-
-                if (similarity > similarity_threshold or
-                    len(description_tokens.intersection(doc_tokens)) > 0 or
-                    any(term in text_lower for term in related_terms)):
-                    regex_match = re.search(description_pattern, text_lower, re.IGNORECASE)
-                    value = regex_match.group(1) if regex_match else f"Found description in page {page_number}"
-                    matches.append({
-                        "criterion": criterion,
-                        "value": value,
-                        "source": report_path,
-                        "page_number": page_number,
-                        "similarity": similarity
-                    })
-
-        logging.info(f"Found {len(matches)} matches for {criterion}")
-        return {"criterion": criterion, "matches": matches}
+        if description and not matches and analysis["description"]:
+            logger.info(f"Falling back to description: {description}")
+            description_analysis = analysis["description"]
+            description_lower = description_analysis["text"]
+            description_pattern = description_analysis["pattern"]
+            exact = _exact_value_match(criterion, description_lower, description_pattern, report_path, lowered_texts)
+            if exact:
+                return {"criterion": criterion, "matches": [exact]}, True
+            page_similarities = similarities.get(description_lower) or _page_similarities(description_analysis["embedding"], page_embeddings)
+            description_tokens = description_analysis["tokens"]
+            related_terms = description_analysis["related_terms"]
+
+            matches = _fuzzy_matches(criterion, "description", report_path, lowered_texts, page_similarities,
+                                     page_tokens, description_tokens, related_terms, similarity_threshold)
+
+        logger.info(f"Found {len(matches)} matches for {criterion}")
+        return {"criterion": criterion, "matches": matches}, True
 
     except Exception as e:
-        logging.error(f"Extraction failed for {criterion}: {str(e)}")
-        return {"criterion": criterion, "matches": []}
\ No newline at end of file
+        # Failures are not cached so a retry performs a fresh search
+        logger.error(f"Extraction failed for {criterion}: {str(e)}")
+        return {"criterion": criterion, "matches": []}, False
\ No newline at end of file
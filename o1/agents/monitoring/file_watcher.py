@@ -6,17 +6,14 @@ file path: esg_engine/agents/monitoring/file_watcher.py
 """
 
 import logging
-import os
 from config.settings import get_settings
-from utils.file_monitor import monitor_folder
-from rag.standards_rag.updater import update_standards
-from rag.requirements_rag.updater import update_requirements
-import threading
+from utils.file_monitor import monitor_folders
+from rag.standards_rag.indexer import reindex_standards_file
+from rag.standards_rag.cache import clear_standards_cache
+from rag.requirements_rag.parser import reindex_requirements_file
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "monitor.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def watch_files():
     """
@@ -25,28 +22,33 @@ def watch_files():
     Returns:
         None
     """
-    logging.info("Starting file monitoring")
+    logger.info("Starting file monitoring")
     
-    # Define callbacks
+    standards_dir = settings["data_paths"]["standards"]
+    requirements_dir = settings["data_paths"]["requirements"]
+    
+    # Reindex only the changed file; the updaters' own monitoring loops would block here
+    def refresh_standards(file_path):
+        if not reindex_standards_file(file_path):
+            logger.warning(f"Failed to reindex standards for {file_path}")
+        # Retrievals cached against the old index are stale either way
+        clear_standards_cache()
+    
+    def refresh_requirements(file_path):
+        if not reindex_requirements_file(file_path):
+            logger.warning(f"Failed to reindex requirements for {file_path}")
+    
+    # Define callbacks; the monitor debounces each file's burst of events and runs one callback at a time
     def standards_callback(file_path):
         if file_path.endswith(".pdf"):
-            logging.info(f"Detected change in standards: {file_path}")
-            update_standards()
+            logger.info(f"Detected change in standards: {file_path}")
+            refresh_standards(file_path)
     
     def requirements_callback(file_path):
         if file_path.endswith(".csv"):
-            logging.info(f"Detected change in requirements: {file_path}")
-            update_requirements()
-    
-    # Start monitoring in separate threads
-    standards_thread = threading.Thread(target=monitor_folder, args=(settings["data_paths"]["standards"], standards_callback), daemon=True)
-    requirements_thread = threading.Thread(target=monitor_folder, args=(settings["data_paths"]["requirements"], requirements_callback), daemon=True)
-    
-    standards_thread.start()
-    requirements_thread.start()
+            logger.info(f"Detected change in requirements: {file_path}")
+            refresh_requirements(file_path)
     
-    try:
-        standards_thread.join()
-        requirements_thread.join()
-    except KeyboardInterrupt:
-        logging.info("Stopping file monitoring")
\ No newline at end of file
+    # Watch both directories with one observer; this call blocks until monitoring stops
+    monitor_folders({standards_dir: standards_callback, requirements_dir: requirements_callback})
+    logger.info("Stopping file monitoring")
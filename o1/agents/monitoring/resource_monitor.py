@@ -6,15 +6,9 @@ file path: esg_engine/agents/monitoring/resource_monitor.py
 """
 
 import logging
-import psutil
-from config.settings import get_settings
-from utils.resource_monitor import check_resources
-import os
+from utils.resource_monitor import check_resources, resource_snapshot
 
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "resource.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def monitor_resources():
     """
@@ -27,8 +21,8 @@ def monitor_resources():
     is_compliant = check_resources()
     
     # Calculate max sub-agents based on available RAM
-    available_memory = psutil.virtual_memory().available / (1024 ** 3)  # Convert to GB
+    available_memory = resource_snapshot()[0].available / (1024 ** 3)  # Convert to GB
     max_sub_agents = min(int(available_memory // 0.5), 10)  # Assume 0.5GB per sub-agent, cap at 10
     
-    logging.info(f"Resource check: compliant={is_compliant}, max_sub_agents={max_sub_agents}")
+    logger.info(f"Resource check: compliant={is_compliant}, max_sub_agents={max_sub_agents}")
     return {"compliant": is_compliant, "max_sub_agents": max_sub_agents}
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+This module provides the shared worker pool for the ESG Engine's sub-agents. A single
+ThreadPoolExecutor is created at import with a hard cap of worker threads, which it starts lazily
+as work arrives; the resource monitor's current sub-agent budget gates how many tasks may be
+submitted at once, so concurrency follows available memory without rebuilding the pool.
+
+file path: esg_engine/agents/monitoring/worker_pool.py
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .resource_monitor import monitor_resources
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on worker threads; threads are only started when tasks are queued
+HARD_CAP = max(4, os.cpu_count() or 1)
+
+EXECUTOR = ThreadPoolExecutor(max_workers=HARD_CAP, thread_name_prefix="esg-agent")
+
+def current_budget():
+    """
+    Returns the number of tasks that may run concurrently right now.
+    
+    Returns:
+        int: Sub-agent budget from monitor_resources, between 1 and HARD_CAP.
+    """
+    return max(1, min(HARD_CAP, monitor_resources()["max_sub_agents"]))
+
+def bounded_submit(slots, fn, *args):
+    """
+    Submits fn to the shared pool once a slot of the budget is free, blocking the caller rather
+    than a pool thread while the budget is in use. The slot is released when the task finishes.
+    
+    Args:
+        slots (threading.Semaphore): Budget shared by every task that should count against it.
+        fn (callable): Function to run.
+        *args: Arguments for fn.
+    
+    Returns:
+        concurrent.futures.Future: Future of fn's result.
+    """
+    slots.acquire()
+    try:
+        future = EXECUTOR.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
@@ -1,24 +1,34 @@
 """
 This module generates human-readable summaries for the ESG Engine, combining extracted data,
-standards, and requirements using LangChain.
+standards, and requirements using an LLM.
 
 file path: esg_engine/agents/summarization/summarizer.py
 """
 
 import logging
-from config.settings import get_settings
-# Placeholder for LangChain
-from langchain_community.llms import FakeListLLM
-import os
+from functools import lru_cache
+# Placeholder until a real LLM is integrated
+from utils.stub_llm import StubLLM
+from utils.llm_cache import invoke_cached
 
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "summarization.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Returns the LLM used for summaries, constructed once per process. The StubLLM placeholder
+    returns an empty response, so generate_summary falls back to a templated summary.
+
+    Returns:
+        LLM: Object with an invoke(prompt) method (StubLLM placeholder).
+    """
+    return StubLLM(responses=[""])
+
+_LLM = get_llm()
 
 def generate_summary(extraction, validation, requirement):
     """
-    Generates a human-readable summary for a criterion using LangChain.
+    Generates a human-readable summary for a criterion using the LLM.
     
     Args:
         extraction (dict): Extracted data with criterion and matches.
@@ -30,13 +40,14 @@ def generate_summary(extraction, validation, requirement):
     """
     try:
         criterion = requirement["criterion"]
-        llm = FakeListLLM(responses=[f"Summary for {criterion}: {'Compliant' if validation['compliance'] == 'Compliant' else 'Non-compliant'} based on {len(extraction.get('matches', []))} matches and {len(validation.get('standard_matches', []))} standards."])
         prompt = f"Summarize compliance for '{criterion}': Extraction: {extraction.get('matches', [])}; Validation: {validation}; Requirement: {requirement}"
-        summary = llm.invoke(prompt)
+        summary = invoke_cached(_LLM, prompt)
+        if not summary:
+            summary = f"Summary for {criterion}: {'Compliant' if validation['compliance'] == 'Compliant' else 'Non-compliant'} based on {len(extraction.get('matches', []))} matches and {len(validation.get('standard_matches', []))} standards."
         
-        logging.info(f"Generated summary for {criterion}")
+        logger.info(f"Generated summary for {criterion}")
         return summary
     
     except Exception as e:
-        logging.error(f"Summary generation failed for {criterion}: {str(e)}")
+        logger.error(f"Summary generation failed for {criterion}: {str(e)}")
         return f"Failed to generate summary for {criterion}"
\ No newline at end of file
@@ -6,19 +6,33 @@ ensuring proper interaction and resource management.
 file path: esg_engine/agents/superbrain/coordinator.py
 """
 
-import os
 import sys
 import logging
-from config.settings import get_settings
+import importlib
 from utils.resource_monitor import check_resources
 from rag.standards_rag.indexer import index_standards
 from rag.reports_rag.indexer import index_report
 from rag.requirements_rag.parser import parse_requirements
 
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "coordinator.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+def resolve_agents(agents):
+    """
+    Replaces dotted "module.path.function" strings in the agent registry with the imported callables,
+    so lookups during a workflow are plain dict accesses and bad paths fail at initialization.
+    
+    Args:
+        agents (dict): Agent registry mapping component names to callables or dotted paths.
+    
+    Returns:
+        dict: The same registry with every dotted path resolved.
+    """
+    for components in agents.values():
+        for name, target in components.items():
+            if isinstance(target, str):
+                module_name, function_name = target.rsplit(".", 1)
+                components[name] = getattr(importlib.import_module(module_name), function_name)
+    return agents
 
 def initialize_system(report_path=None):
     """
@@ -32,21 +46,21 @@ def initialize_system(report_path=None):
     """
     # Check resource limits
     if not check_resources():
-        logging.error("Resource usage exceeds 45% limit, aborting initialization")
+        logger.error("Resource usage exceeds 45% limit, aborting initialization")
         return {}
     
     try:
         # Initialize RAG modules
-        logging.info("Initializing Standards RAG")
+        logger.info("Initializing Standards RAG")
         index_standards()
         
-        logging.info("Initializing Requirements RAG")
+        logger.info("Initializing Requirements RAG")
         parse_requirements()
         
         if report_path:
-            logging.info(f"Initializing Reports RAG with {report_path}")
+            logger.info(f"Initializing Reports RAG with {report_path}")
             if not index_report(report_path):
-                logging.error(f"Failed to index report: {report_path}")
+                logger.error(f"Failed to index report: {report_path}")
                 return {}
         
         # Initialize agents (placeholders for extraction, evaluation, summarization)
@@ -58,10 +72,11 @@ def initialize_system(report_path=None):
             "evaluation": {"validator": "agents.evaluation.validator.validate_data", "retry": "agents.evaluation.retry.retry_extraction"},
             "summarization": {"summarizer": "agents.summarization.summarizer.generate_summary"}
         }
+        resolve_agents(agents)
         
-        logging.info("System initialized successfully")
+        logger.info("System initialized successfully")
         return agents
     
     except Exception as e:
-        logging.error(f"Initialization failed: {str(e)}")
+        logger.error(f"Initialization failed: {str(e)}")
         return {}
\ No newline at end of file
@@ -9,27 +9,96 @@ file path: esg_engine/agents/superbrain/workflow.py
 import pandas as pd
 import os
 import logging
-import pickle
 import time
-from config.settings import get_settings
-from agents.extraction.searcher import extract_data
-from agents.evaluation.validator import validate_data
+import threading
+import queue
+from functools import lru_cache
+from config.settings import get_settings, configure_logging, OUTPUT_DIR
+from agents.extraction.searcher import extract_data_batch, clear_extract_cache
+from agents.evaluation.evaluate_and_summarize import evaluate
+from agents.evaluation.validator import build_standards_index, standards_hits_batch
+from agents.monitoring.worker_pool import bounded_submit, current_budget
+from rag.standards_rag.cache import refresh_standards_version, cached_search_standards_batch
 import json
-from sentence_transformers import SentenceTransformer
-import torch
+import gzip
+import hashlib
+import numpy as np
+from utils.text_processing import embed_texts, enable_fork_workers, encoder_key
+from utils.pickle_cache import load_pickle
+from utils.embedding_cache import quantize_matrix, dequantize_matrix
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "workflow.log")
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # Cache configuration
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".esg_engine_cache")
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# Load model for embedding requirements
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Write results.json.gz instead of results.json
+COMPRESS_RESULTS = os.environ.get("ESG_RESULTS_GZIP") == "1"
+
+@lru_cache(maxsize=16)
+def _load_requirements(requirements_path: str, mtime_ns: int) -> tuple:
+    """
+    Parses a requirements CSV and embeds its criteria. Memoized on (path, mtime) so batch runs
+    over many reports parse and embed the CSV once, and an edited CSV is reloaded. Parsed columns
+    and int8-quantized embeddings are also saved in CACHE_DIR under a hash of the CSV contents,
+    so later runs load them without parsing or embedding.
+
+    Args:
+        requirements_path (str): Path to the requirements CSV file.
+        mtime_ns (int): Modification time of the CSV, part of the cache key.
+
+    Returns:
+        tuple: Requirement dictionaries with category, criterion, description, and embedding,
+            shared by every caller; load_requirements returns copies.
+    """
+    with open(requirements_path, "rb") as f:
+        digest = hashlib.sha1(encoder_key().encode("utf-8") + b"\0" + f.read()).hexdigest()
+    records_path = os.path.join(CACHE_DIR, f"req_{digest}.json")
+    embeddings_path = os.path.join(CACHE_DIR, f"req_{digest}.npz")
+
+    columns = None
+    if os.path.exists(records_path) and os.path.exists(embeddings_path):
+        try:
+            with open(records_path) as f:
+                columns = json.load(f)
+            if len(columns["criterion"]) != len(columns["category"]) or len(columns["criterion"]) != len(columns["description"]):
+                raise ValueError("column lengths differ")
+            with np.load(embeddings_path) as data:
+                embeddings = dequantize_matrix(data["vectors"], data["scales"])
+            logger.info("Loaded cached requirement embeddings from %s", embeddings_path)
+        except Exception as e:
+            logger.warning("Failed to load cached requirement embeddings from %s: %s", embeddings_path, e)
+            columns = None
+
+    if columns is None:
+        # Read whole columns as Python lists instead of building a Series per row
+        df = pd.read_csv(requirements_path)
+        columns = {
+            "category": df["category"].tolist(),
+            "criterion": df["criterion"].tolist(),
+            "description": df["description"].fillna("").tolist() if "description" in df else [""] * len(df)
+        }
+        # Embed every criterion in one batch with the shared model
+        embeddings = embed_texts([criterion.lower() for criterion in columns["criterion"]])
+        try:
+            with open(records_path, "w") as f:
+                json.dump(columns, f)
+            vectors, scales = quantize_matrix(embeddings)
+            np.savez_compressed(embeddings_path, vectors=vectors, scales=scales)
+        except Exception as e:
+            logger.warning("Failed to cache requirement embeddings to %s: %s", embeddings_path, e)
+
+    # Each requirement's embedding is a row view of one contiguous float32 matrix
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    embeddings.flags.writeable = False  # Shared by every caller of the memoized result
+    return tuple({
+        "category": category,
+        "criterion": criterion,
+        "description": description,
+        "embedding": embedding
+    } for category, criterion, description, embedding in zip(columns["category"], columns["criterion"], columns["description"], embeddings))
 
 def load_requirements(requirements_path: str) -> list:
     """
@@ -39,33 +108,27 @@ def load_requirements(requirements_path: str) -> list:
         requirements_path (str): Path to the requirements CSV file.
 
     Returns:
-        list: List of dictionaries with category, criterion, description, and embedding.
+        list: New dictionaries with category, criterion, description, and a read-only embedding.
     """
     try:
-        df = pd.read_csv(requirements_path)
-        requirements = []
-        for _, row in df.iterrows():
-            criterion = row["criterion"]
-            embedding = model.encode(criterion.lower(), convert_to_tensor=True)
-            requirements.append({
-                "category": row["category"],
-                "criterion": criterion,
-                "description": row.get("description", ""),
-                "embedding": embedding
-            })
-        logging.info(f"Loaded {len(requirements)} requirements from {requirements_path}")
+        # The memoized dicts are shared across runs, so each caller gets its own copies; embeddings
+        # are read-only views and are shared safely
+        requirements = [dict(req) for req in _load_requirements(requirements_path, os.stat(requirements_path).st_mtime_ns)]
+        logger.info("Loaded %d requirements from %s", len(requirements), requirements_path)
         return requirements
     except Exception as e:
-        logging.error(f"Failed to load requirements from {requirements_path}: {str(e)}")
+        logger.error("Failed to load requirements from %s: %s", requirements_path, e)
         return []
 
-def load_cached_texts(reports_dir: str, standards_dir: str) -> tuple:
+def load_cached_texts(reports_dir: str, standards_dir: str, load_standards_texts: bool = True) -> tuple:
     """
     Loads cached report and standard texts.
 
     Args:
         reports_dir (str): Directory for report texts.
         standards_dir (str): Directory for standard texts.
+        load_standards_texts (bool): Whether to unpickle the standards texts now; when False an
+            empty dict is returned and validation loads them only if a criterion needs the fallback.
 
     Returns:
         tuple: (report_texts, standards_texts, standards_cache, requirements_cache)
@@ -77,48 +140,22 @@ def load_cached_texts(reports_dir: str, standards_dir: str) -> tuple:
 
     reports_text_cache_path = os.path.join(reports_dir, "texts_cache.pkl")
     if os.path.exists(reports_text_cache_path):
-        with open(reports_text_cache_path, "rb") as f:
-            cached_texts = pickle.load(f)
-            report_texts = cached_texts.get("reports", {})
-        logging.info(f"Loaded report texts from {reports_text_cache_path}")
+        report_texts = load_pickle(reports_text_cache_path).get("reports", {})
+        logger.info("Loaded report texts from %s", reports_text_cache_path)
 
     standards_text_cache_path = os.path.join(standards_dir, "texts_cache.pkl")
-    if os.path.exists(standards_text_cache_path):
-        with open(standards_text_cache_path, "rb") as f:
-            cached_texts = pickle.load(f)
-            standards_texts = cached_texts.get("standards", {})
-        logging.info(f"Loaded standards texts from {standards_text_cache_path}")
+    if load_standards_texts and os.path.exists(standards_text_cache_path):
+        standards_texts = load_pickle(standards_text_cache_path).get("standards", {})
+        logger.info("Loaded standards texts from %s", standards_text_cache_path)
 
     standards_cache_path = os.path.join(standards_dir, "standards_cache.pkl")
     if os.path.exists(standards_cache_path):
-        with open(standards_cache_path, "rb") as f:
-            standards_cache = pickle.load(f)
-        logging.info(f"Loaded standards cache from {standards_cache_path}")
+        standards_cache = load_pickle(standards_cache_path)
+        logger.info("Loaded standards cache from %s", standards_cache_path)
 
     return report_texts, standards_texts, standards_cache, requirements_cache
 
-def generate_summary(criterion: str, extracted_sentences: list, standard_matches: list) -> str:
-    """
-    Generates a summary for the criterion based on extracted sentences and standard matches.
-
-    Args:
-        criterion (str): The criterion being evaluated.
-        extracted_sentences (list): List of extracted report sentences.
-        standard_matches (list): List of standard matches.
-
-    Returns:
-        str: Summary text.
-    """
-    if extracted_sentences and standard_matches:
-        return f"Summary for {criterion}: Compliant with standards, found {len(extracted_sentences)} report matches and {len(standard_matches)} standard matches."
-    elif extracted_sentences:
-        return f"Summary for {criterion}: Found {len(extracted_sentences)} report matches but no standard matches."
-    elif standard_matches:
-        return f"Summary for {criterion}: Found {len(standard_matches)} standard matches but no report matches."
-    else:
-        return f"Summary for {criterion}: No matches found."
-
-def execute_workflow(report_path: str, requirements_path: str, standard_filter: str = None) -> None:
+def execute_workflow(report_path: str, requirements_path: str, standard_filter: str = None):
     """
     Orchestrates the ESG Engine workflow, extracting data from reports, validating against standards,
     and producing results.json.
@@ -127,68 +164,131 @@ def execute_workflow(report_path: str, requirements_path: str, standard_filter:
         report_path (str): Path to the report PDF.
         requirements_path (str): Path to the requirements CSV.
         standard_filter (str, optional): Specific standard to filter (e.g., "ifrs_s1.pdf").
+
+    Returns:
+        Path: File the results were written to (results.json, or results.json.gz with
+            ESG_RESULTS_GZIP=1), or None if writing them failed.
     """
     start_time = time.time()
-    results = []
+
+    # Drop extraction results memoized during a previous run
+    clear_extract_cache()
+
+    # Pick up standards edited since the last run so stale retrievals are not reused
+    refresh_standards_version()
 
     # Load requirements and cached texts
     requirements = load_requirements(requirements_path)
     reports_dir = settings["data_paths"]["reports"]
     standards_dir = settings["data_paths"]["standards"]
-    report_texts, standards_texts, standards_cache, requirements_cache = load_cached_texts(reports_dir, standards_dir)
+    # Standards texts only back the validator's last-resort fallback, which loads them on demand
+    report_texts, standards_texts, standards_cache, requirements_cache = load_cached_texts(reports_dir, standards_dir, load_standards_texts=False)
+
+    # Index the standards cache once and find every criterion's nearest standard sentences
+    # with one batched search instead of a search per criterion
+    standards_index = build_standards_index(standards_cache)
+    standards_hits = [None] * len(requirements)
+    if requirements and standards_index["index"] is not None:
+        try:
+            standards_hits = standards_hits_batch(standards_index, np.stack([req["embedding"] for req in requirements]), standard_filter)
+        except Exception as e:
+            logger.warning("Batched standards index search failed, searching per criterion: %s", e)
 
-    # Process each requirement
-    for req in requirements:
+    # Concurrency budget shared by extraction fallbacks and evaluations; each task takes a slot
+    # before it is submitted to the pool
+    max_sub_agents = current_budget()
+    slots = threading.BoundedSemaphore(max_sub_agents)
+
+    # Loop invariants for building result records
+    report_key = os.path.basename(report_path)
+    now = time.time
+    page_texts = report_texts.get(report_key, {})
+    criteria = [req["criterion"] for req in requirements]
+    descriptions = {req["criterion"]: req["description"] for req in requirements}
+
+    # Standards retrieval for several criteria in one batched search; None per criterion on failure
+    def fetch_standards(indices):
+        try:
+            return cached_search_standards_batch([criteria[i] for i in indices], document_filter=standard_filter, k=30)
+        except Exception as e:
+            logger.warning("Batched standards search failed, validating per criterion: %s", e)
+            return [None] * len(indices)
+
+    def process(i, extraction, rag_standards=None):
+        req = requirements[i]
         criterion = req["criterion"]
-        description = req["description"]
-        category = req["category"]
-        logging.info(f"Processing criterion: {criterion}")
-
-        # Step 1: Extract report data
-        report_key = os.path.basename(report_path)
-        page_texts = report_texts.get(report_key, {})
-        extraction = extract_data(report_path, criterion, description, page_texts)
-        extracted_matches = extraction.get("matches", [])
-
-        # Step 2: Validate against standards
-        validation = validate_data(
-            extraction=extraction,
-            standard_filter=standard_filter,
-            standards_texts=standards_texts,
-            standards_cache=standards_cache,
-            requirements_cache=[req]  # Pass single requirement for efficiency
-        )
-
-        # Step 3: Generate summary
-        summary = generate_summary(criterion, validation["extracted_sentences"], validation["standard_matches"])
+        logger.info("Processing criterion: %s", criterion)
+
+        # Steps 2-3: Validate against standards and summarize in one LLM pass
+        validation, summary = evaluate(extraction, req, standard_filter, standards_texts, standards_cache,
+                                       rag_standards=rag_standards, standards_index=standards_index,
+                                       standards_hits=standards_hits[i])
 
         # Step 4: Compile result
         result = {
-            "category": category,
+            "category": req["category"],
             "criterion": criterion,
             "extracted_sentences": validation["extracted_sentences"],
             "standard_info": validation["standard_matches"],
             "summary": summary,
             "document_name": report_key,
-            "processing_time": time.time() - start_time,
+            "processing_time": now() - start_time,
             "compliance": validation["compliance"]
         }
-        results.append(result)
-        logging.info(f"Completed processing for '{criterion}': Compliance={validation['compliance']}, Extracted={len(validation['extracted_sentences'])}, Standards={len(validation['standard_matches'])}")
+        logger.info("Completed processing for '%s': Compliance=%s, Extracted=%d, Standards=%d", criterion,
+                    validation["compliance"], len(validation["extracted_sentences"]), len(validation["standard_matches"]))
+        return result
+
+    # Step 1: Extract report data with one batched search. Completed extractions are queued for a
+    # dispatcher thread, which waits for a slot before submitting, so neither the extraction event
+    # loop nor pool threads block on the budget. Criteria without evidence are evaluated as soon as
+    # their extraction completes. Only criteria with evidence need standards retrieval, so they are
+    # held until extraction finishes and then retrieved with one batched search; retrieving for
+    # every criterion up front would overlap extraction but search for criteria whose results are
+    # discarded
+    futures = [None] * len(requirements)
+    completed = queue.SimpleQueue()
+
+    def dispatch():
+        with_evidence = []
+        for i, extraction in iter(completed.get, None):
+            if extraction.get("matches"):
+                with_evidence.append((i, extraction))
+            else:
+                futures[i] = bounded_submit(slots, process, i, extraction)
+        rag_results = fetch_standards([i for i, _ in with_evidence]) if with_evidence else []
+        for (i, extraction), rag_standards in zip(with_evidence, rag_results):
+            futures[i] = bounded_submit(slots, process, i, extraction, rag_standards)
+
+    dispatcher = threading.Thread(target=dispatch, name="esg-dispatch", daemon=True)
+    dispatcher.start()
+    try:
+        extract_data_batch(report_path, criteria, descriptions, page_texts, on_result=lambda i, extraction: completed.put((i, extraction)), slots=slots)
+    finally:
+        completed.put(None)
+        dispatcher.join()
 
-    # Write results to JSON
-    output_dir = settings["data_paths"]["output"]
-    output_path = os.path.join(output_dir, "results.json")
-    os.makedirs(output_dir, exist_ok=True)
+    # Stream each result to the output file in requirement order
+    # Records are written compactly; set ESG_RESULTS_GZIP=1 to write results.json.gz instead
+    output_path = OUTPUT_DIR / ("results.json.gz" if COMPRESS_RESULTS else "results.json")
     try:
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=4)
-        logging.info(f"Results written to {output_path}")
+        with (gzip.open(output_path, "wt", encoding="utf-8") if COMPRESS_RESULTS else open(output_path, "w")) as f:
+            f.write("[\n")
+            for i in range(len(futures)):
+                if i:
+                    f.write(",\n")
+                # Drop each future once written so finished results do not stay in memory
+                future, futures[i] = futures[i], None
+                f.write(json.dumps(future.result(), separators=(",", ":"), default=str))
+            f.write("\n]\n")
+        logger.info("Results written to %s", output_path)
     except Exception as e:
-        logging.error(f"Failed to write results to {output_path}: {str(e)}")
+        logger.error("Failed to write results to %s: %s", output_path, e)
+        output_path = None
 
     total_time = time.time() - start_time
-    logging.info(f"Workflow completed in {total_time:.2f} seconds")
+    logger.info("Workflow completed in %.2f seconds", total_time)
+    return output_path
 
 if __name__ == "__main__":
     import argparse
@@ -197,4 +297,6 @@ if __name__ == "__main__":
     parser.add_argument("--requirements", required=True, help="Path to the requirements CSV")
     parser.add_argument("--standard", help="Specific standard to filter (e.g., ifrs_s1.pdf)")
     args = parser.parse_args()
+    configure_logging()
+    enable_fork_workers()
     execute_workflow(args.report, args.requirements, args.standard)
\ No newline at end of file
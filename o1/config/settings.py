@@ -7,6 +7,41 @@ file path: esg_engine/config/settings.py
 """
 
 import os
+import logging.config
+from pathlib import Path
+
+# Log file for each logger namespace; the most specific configured logger handles a record
+LOG_FILES = {
+    "__main__": "main.log",
+    "agents.superbrain": "workflow.log",
+    "agents.superbrain.coordinator": "coordinator.log",
+    "agents.extraction": "extraction.log",
+    "agents.evaluation": "evaluation.log",
+    "agents.evaluation.validator": "validation.log",
+    "agents.summarization": "summarization.log",
+    "agents.monitoring": "monitor.log",
+    "agents.monitoring.resource_monitor": "resource.log",
+    "rag.requirements_rag.parser": "workflow.log",
+    "rag.requirements_rag.searcher": "requirements.log",
+    "rag.requirements_rag.updater": "workflow.log",
+    "rag.standards_rag.indexer": "errors.log",
+    "rag.standards_rag.updater": "standards_update.log",
+    "rag.reports_rag.cleaner": "cleanup.log",
+    "rag.reports_rag.indexer": "errors.log",
+    "utils.pdf_processing": "errors.log",
+    "utils.file_monitor": "monitor.log",
+    "utils.nltk_utils": "nltk_utils.log",
+    "utils.resource_monitor": "resource.log"
+}
+
+# Log file for loggers without an entry above (e.g. utils.vector_utils, rag.standards_rag.cache)
+ROOT_LOG_FILE = "workflow.log"
+
+# Loggers that record less than INFO; loggers sharing a file share one handler
+LOG_LEVELS = {
+    "rag.standards_rag.indexer": "ERROR",
+    "rag.reports_rag.indexer": "ERROR"
+}
 
 def get_settings():
     """
@@ -38,14 +73,77 @@ def get_settings():
         },
         "model_params": {
             "sentence_transformer_model": "all-MiniLM-L6-v2",  # Embedding model
-            "spacy_model": "en_core_web_sm"  # Tokenization model
+            "encoder_backend": os.environ.get("ESG_ENCODER_BACKEND", "torch"),  # "onnx" runs the CPU encoder on ONNX Runtime
+            # ONNX graph for the "onnx" backend; e.g. onnx/model_qint8_avx512_vnni.onnx for int8 on VNNI CPUs,
+            # or "int8" to pick the int8 graph matching this CPU
+            "encoder_onnx_file": os.environ.get("ESG_ENCODER_ONNX_FILE", "onnx/model_O2.onnx"),
+            "spacy_model": "en_core_web_sm",  # Tokenization model
+            # Sentence splitting: "parser" uses the spaCy model's dependency parse, "sentencizer" spaCy's
+            # rule-based punctuation splitter, several times faster on long documents
+            "sentence_segmenter": os.environ.get("ESG_SENTENCE_SEGMENTER", "parser")
         },
         "monitoring": {
-            "update_interval": 1800  # 30 minutes in seconds for file polling
+            "update_interval": 1800,  # Seconds between rescans, only where file events are unavailable
+            "debounce_seconds": 0.5  # Quiet period before a burst of events for one file triggers its callback
+        },
+        "indexing": {
+            "nlist": 256,  # Voronoi cells for IVF indexes
+            "pq_m": 48,  # PQ sub-quantizers; 384-d vectors compress to 48 bytes
+            # Vector storage below pq_min_vectors: "SQfp16" halves index size (normalized vectors lose
+            # no ranking precision in fp16), "SQ8" quarters it, "Flat" keeps float32
+            "codec": os.environ.get("ESG_INDEX_CODEC", "SQfp16"),
+            "ivf_min_vectors": 9984,  # 39 training points per cell; smaller corpora use a flat index
+            "pq_min_vectors": 100000,  # Corpora at least this large also compress vectors with PQ
+            "nprobe": int(os.environ.get("ESG_INDEX_NPROBE", "16")),  # Cells scanned per query
+            "hnsw_m": 32,  # Graph neighbours per vector in HNSW report indexes
+            "ef_construction": 200,  # HNSW candidate list while building; higher is slower but more accurate
+            "ef_search": int(os.environ.get("ESG_INDEX_EF_SEARCH", "64")),  # HNSW candidate list per query
+            "use_gpu_faiss": os.environ.get("ESG_FAISS_GPU") == "1"  # Search indexes on GPU 0 with faiss-gpu
+        },
+        "evaluation": {
+            "use_llm": False,  # Rule-based compliance unless an LLM is configured
+            "compliance_similarity": 0.5  # Best standard match needed for rule-based compliance
         }
     }
     
     # Ensure output directory exists
     os.makedirs(settings["data_paths"]["output"], exist_ok=True)
     
-    return settings
\ No newline at end of file
+    return settings
+
+# Output directory, resolved once for modules that write results, logs, and caches
+OUTPUT_DIR = Path(get_settings()["data_paths"]["output"])
+
+def configure_logging():
+    """
+    Configures logging once per process with logging.config.dictConfig, routing each logger
+    namespace in LOG_FILES to its own rotating log file in the output directory; every other
+    logger propagates to the root logger, which writes to ROOT_LOG_FILE. Modules log through
+    logging.getLogger(__name__) and do not configure handlers themselves.
+    
+    Returns:
+        None
+    """
+    handlers = {}
+    loggers = {}
+    for logger_name, filename in {**LOG_FILES, "": ROOT_LOG_FILE}.items():
+        handler_name = filename.rsplit(".", 1)[0]
+        handlers[handler_name] = {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": str(OUTPUT_DIR / filename),
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 3,
+            "delay": True,  # Open the file on first record, not at startup
+            "formatter": "default"
+        }
+        if logger_name:
+            loggers[logger_name] = {"level": LOG_LEVELS.get(logger_name, "INFO"), "handlers": [handler_name], "propagate": False}
+    
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"default": {"format": "%(asctime)s - %(levelname)s - %(message)s"}},
+        "handlers": handlers,
+        "loggers": loggers,
+        "root": {"level": "INFO", "handlers": [ROOT_LOG_FILE.rsplit(".", 1)[0]]}
+    })
@@ -7,18 +7,15 @@ file path: esg_engine/main.py
 
 import argparse
 import logging
-import os
-from config.settings import get_settings
+from config.settings import configure_logging
 from rag.standards_rag.indexer import index_standards
 from rag.reports_rag.indexer import index_report
 from rag.requirements_rag.parser import parse_requirements
 from utils.resource_monitor import check_resources
 from agents.superbrain.workflow import execute_workflow
+from utils.text_processing import enable_fork_workers
 
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "workflow.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def run_workflow(report_path, requirements_path):
     """
@@ -34,35 +31,34 @@ def run_workflow(report_path, requirements_path):
     """
     try:
         if not check_resources()["compliant"]:
-            logging.error("Resource usage exceeds limit, aborting workflow")
+            logger.error("Resource usage exceeds limit, aborting workflow")
             return False
 
         # Index standards and requirements once
-        logging.info("Starting standards indexing")
+        logger.info("Starting standards indexing")
         if not index_standards():
-            logging.warning("Standards indexing failed, continuing with available indexes")
-        logging.info("Starting requirements parsing")
+            logger.warning("Standards indexing failed, continuing with available indexes")
+        logger.info("Starting requirements parsing")
         if not parse_requirements():
-            logging.error(f"Failed to parse requirements: {requirements_path}")
+            logger.error(f"Failed to parse requirements: {requirements_path}")
             return False
 
-        logging.info(f"Indexing report: {report_path}")
+        logger.info(f"Indexing report: {report_path}")
         if not index_report(report_path):
-            logging.error(f"Failed to index report: {report_path}")
+            logger.error(f"Failed to index report: {report_path}")
             return False
 
-        logging.info("Starting full ESG Engine workflow")
-        success = execute_workflow(report_path, requirements_path)
-        if not success:
-            logging.error("Full workflow execution failed")
+        logger.info("Starting full ESG Engine workflow")
+        output_path = execute_workflow(report_path, requirements_path)
+        if output_path is None:
+            logger.error("Full workflow execution failed")
             return False
 
-        output_path = os.path.join(settings["data_paths"]["output"], "results.json")
         print(f"Workflow completed successfully. Results saved to {output_path}")
         return True
 
     except Exception as e:
-        logging.error(f"Workflow failed: {str(e)}")
+        logger.error(f"Workflow failed: {str(e)}")
         print(f"Error: Workflow failed: {str(e)}")
         return False
 
@@ -75,10 +71,12 @@ def main():
     parser.add_argument("--requirements", required=True, help="Path to the requirements CSV")
     args = parser.parse_args()
 
-    logging.info(f"Starting workflow with report: {args.report}, requirements: {args.requirements}")
+    configure_logging()
+    enable_fork_workers()
+    logger.info(f"Starting workflow with report: {args.report}, requirements: {args.requirements}")
     success = run_workflow(args.report, args.requirements)
     if not success:
-        logging.error("Workflow execution failed")
+        logger.error("Workflow execution failed")
         print("Error: Workflow failed")
         exit(1)
 
@@ -9,10 +9,8 @@ import os
 import logging
 from config.settings import get_settings
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "cleanup.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def clean_report_index():
     """
@@ -33,18 +31,18 @@ def clean_report_index():
     if os.path.exists(index_path):
         try:
             os.remove(index_path)
-            logging.info(f"Deleted temporary index: {index_path}")
+            logger.info(f"Deleted temporary index: {index_path}")
             cleaned = True
         except Exception as e:
-            logging.error(f"Failed to delete {index_path}: {str(e)}")
+            logger.error(f"Failed to delete {index_path}: {str(e)}")
     
     # Remove metadata file
     if os.path.exists(metadata_path):
         try:
             os.remove(metadata_path)
-            logging.info(f"Deleted temporary metadata: {metadata_path}")
+            logger.info(f"Deleted temporary metadata: {metadata_path}")
             cleaned = True
         except Exception as e:
-            logging.error(f"Failed to delete {metadata_path}: {str(e)}")
+            logger.error(f"Failed to delete {metadata_path}: {str(e)}")
     
     return cleaned
\ No newline at end of file
@@ -12,16 +12,21 @@ from utils.pdf_processing import extract_pdf_text
 from utils.text_processing import tokenize_and_embed
 from utils.vector_utils import initialize_index, add_to_index
 from utils.resource_monitor import check_resources
+from utils.content_hash import file_digest
+from utils.file_manifest import load_manifest, save_manifest
 from config.settings import get_settings
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "errors.log")
-logging.basicConfig(filename=log_file, level=logging.ERROR, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Sidecar recording which report contents and model settings the current index was built from
+INDEXED_NAME = "indexed.json"
 
 def index_report(report_path):
     """
     Initializes a temporary FAISS index and processes a single ESG report PDF, storing embeddings and metadata.
+    Indexing is skipped when the current index was already built from a report with the same content
+    digest and the same model settings.
     
     Args:
         report_path (str): Path to the report PDF (e.g., data/reports/btg-pactual.pdf).
@@ -31,35 +36,48 @@ def index_report(report_path):
     """
     # Validate report path
     if not os.path.exists(report_path) or not report_path.endswith(".pdf"):
-        logging.error(f"Invalid report path: {report_path}")
+        logger.error(f"Invalid report path: {report_path}")
         return False
     
     # Check resource limits
     if not check_resources():
-        logging.error("Resource usage exceeds 45% limit, aborting indexing")
+        logger.error("Resource usage exceeds 45% limit, aborting indexing")
         return False
     
     # Initialize paths
     reports_dir = settings["data_paths"]["reports"]
     index_path = os.path.join(reports_dir, "index.faiss")
     metadata_path = os.path.join(reports_dir, "metadata.pkl")
+    indexed_path = os.path.join(reports_dir, INDEXED_NAME)
     dimension = 384  # Embedding dimension for all-MiniLM-L6-v2
     
+    # Reuse the index if it was built from the same file, bytes, and model settings; the path is part
+    # of the key because metadata records the report's file name
+    report_key = os.path.abspath(report_path)
+    entry = {"sha256": file_digest(report_path), "model_params": settings["model_params"]}
+    if os.path.exists(index_path) and os.path.exists(metadata_path) and load_manifest(indexed_path).get(report_key) == entry:
+        logger.info(f"Skipping {report_path}, already indexed")
+        return True
+    
+    # The index is rebuilt below, so a failed run must not leave the old entry vouching for it
+    if os.path.exists(indexed_path):
+        os.remove(indexed_path)
+    
     # Initialize FAISS index
     index = initialize_index(dimension, index_path)
     
     try:
         # Extract text from PDF
-        logging.info(f"Processing {report_path}")
+        logger.info(f"Processing {report_path}")
         pages = extract_pdf_text(report_path)
         if not pages:
-            logging.warning(f"No text extracted from {report_path}")
+            logger.warning(f"No text extracted from {report_path}")
             return False
         
         # Tokenize and embed sentences
         results = tokenize_and_embed(pages)
         if not results:
-            logging.warning(f"No embeddings generated for {report_path}")
+            logger.warning(f"No embeddings generated for {report_path}")
             return False
         
         # Prepare embeddings and metadata
@@ -73,10 +91,12 @@ def index_report(report_path):
         
         # Add to FAISS index
         add_to_index(index, embeddings, metadata, metadata_path, index_path)
-        logging.info(f"Indexed {report_path} with {len(metadata)} sentences")
+        # The index holds one report, so the sidecar is replaced rather than extended
+        save_manifest(indexed_path, {report_key: entry})
+        logger.info(f"Indexed {report_path} with {len(metadata)} sentences")
         
         return True
     
     except Exception as e:
-        logging.error(f"Failed to index {report_path}: {str(e)}")
+        logger.error(f"Failed to index {report_path}: {str(e)}")
         return False
\ No newline at end of file
@@ -12,34 +12,106 @@ import pandas as pd
 import pickle
 import logging
 import numpy as np
-import re
 from config.settings import get_settings
-from utils.text_processing import tokenize_and_embed
-from utils.vector_utils import initialize_index, add_to_index
+from utils.text_processing import embed_texts
+from utils.vector_utils import build_index, update_index, EmbeddingSpool
+from utils.pickle_cache import load_pickle
+from utils.metadata_store import MetadataTable
+from utils.file_manifest import scan_files, changed_files, manifest_entry, load_manifest, save_manifest
 from utils.resource_monitor import check_resources
-from sentence_transformers import SentenceTransformer
 
-# Configure logging
 settings = get_settings()
-output_dir = settings["data_paths"]["output"]
-log_file = os.path.join(output_dir, "workflow.log")
-os.makedirs(output_dir, exist_ok=True)
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-logging.info("Logging initialized successfully")
+# Columns every requirements CSV must have; other columns are not read
+REQUIRED_COLUMNS = ['category', 'criterion', 'description']
 
-# Load SentenceTransformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
-logging.info("Loaded SentenceTransformer: all-MiniLM-L6-v2")
+# Manifest of the CSVs the index was built from, kept in the requirements directory
+MANIFEST_NAME = "_manifest.json"
+
+def parse_single_csv(file_path, batch_size=256):
+    """
+    Parses one requirements CSV, validating its structure, and generates embeddings in batches.
+    Each distinct row text is embedded once; duplicate rows share its vector.
+
+    Args:
+        file_path (str): Path to the requirements CSV.
+        batch_size (int): Unique texts per encode call, a multiple of the encoder's batch of 64.
+
+    Returns:
+        tuple: (embeddings, metadata): a float32 array and a list with one entry per valid row;
+            both are empty if the CSV has no valid rows. Errors reading the CSV are raised to the caller.
+    """
+    filename = os.path.basename(file_path)
+
+    logger.info(f"Processing {filename}")
+    # Only the required columns are read, as strings; empty cells stay NaN
+    df = pd.read_csv(file_path, usecols=lambda column: column in REQUIRED_COLUMNS, dtype=str)
+    if df.empty:
+        logger.warning(f"Empty CSV: {filename}")
+        return [], []
+
+    # Validate required columns
+    if not all(col in df.columns for col in REQUIRED_COLUMNS):
+        logger.warning(f"Missing required columns in {filename}: {set(REQUIRED_COLUMNS) - set(df.columns)}")
+        return [], []
+
+    # Validate rows
+    initial_rows = len(df)
+    df = df.dropna(subset=['criterion']).reset_index(drop=True)
+    if df.empty:
+        logger.warning(f"No valid rows in {filename} after dropping empty criteria")
+        return [], []
+    if len(df) < initial_rows:
+        logger.warning(f"Dropped {initial_rows - len(df)} rows with empty criteria in {filename}")
+
+    logger.info(f"Rows in {filename}: {len(df)}")
+
+    # Build row texts with column operations; rows without a description use the criterion alone
+    criteria = df["criterion"]
+    descriptions = df["description"]
+    texts_series = criteria.where(descriptions.isna(), criteria + " " + descriptions)
+    mask = texts_series.str.strip().ne("")
+    if not mask.all():
+        logger.warning(f"Empty or invalid text for rows {df.index[~mask].tolist()} in {filename}")
+        df = df[mask]
+        texts_series = texts_series[mask]
+    if df.empty:
+        logger.warning(f"No valid texts in {filename}")
+        return [], []
+
+    # Repeated criterion/description texts are embedded once and expanded back to one vector per row
+    codes, unique_texts = pd.factorize(texts_series)
+    unique_embeddings = None
+    for batch_start in range(0, len(unique_texts), batch_size):
+        batch = unique_texts[batch_start:batch_start + batch_size].tolist()
+        embeddings = embed_texts(batch)
+        if unique_embeddings is None:
+            unique_embeddings = np.empty((len(unique_texts), embeddings.shape[1]), dtype=np.float32)
+        unique_embeddings[batch_start:batch_start + len(batch)] = embeddings
+        logger.info(f"Embedded batch {batch_start} of {filename} with {len(batch)} unique texts")
+    if len(unique_texts) < len(df):
+        logger.info(f"Embedded {len(unique_texts)} unique texts for {len(df)} rows in {filename}")
+
+    # One vector per valid row, so metadata is built from the rows directly
+    rows = df[["category", "criterion", "description"]].to_dict("records")
+    file_metadata = [{
+        "app_name": filename,
+        "document_name": filename,
+        "page_number": 0,
+        "sentence_index": 0,
+        "sentence": text,
+        **row
+    } for row, text in zip(rows, texts_series.tolist())]
+    return unique_embeddings[codes], file_metadata
 
 def parse_requirements() -> bool:
     """
     Parses all CSVs in data/requirements/, generates embeddings in batches, and updates the FAISS index.
-    Validates CSV structure and ensures robust indexing with metadata storage.
+    Validates CSV structure and ensures robust indexing with metadata storage. CSVs whose modification
+    time and size match the manifest written by the last parse are skipped; only new, edited, or
+    deleted CSVs are reindexed. Without an index or manifest, or if reindexing a changed CSV fails,
+    every CSV is parsed and the index rebuilt.
 
     Returns:
         bool: True if successful, False if resource limits exceeded or no valid data.
@@ -48,127 +120,129 @@ def parse_requirements() -> bool:
         requirements_dir = settings["data_paths"]["requirements"]
         index_path = os.path.join(requirements_dir, "index.faiss")
         metadata_path = os.path.join(requirements_dir, "metadata.pkl")
-        dimension = 384  # Embedding dimension for all-MiniLM-L6-v2
-        batch_size = 50  # Process rows in batches
 
         # Check resources
         resources = check_resources()
         ram_usage = resources.get("ram_usage", "N/A")
         disk_usage = resources.get("disk_usage", "N/A")
         compliant = resources.get("compliant", False)
-        logging.info(f"RAM: {ram_usage}% (limit 45%), Disk: {disk_usage}% (limit 45%)")
+        logger.info(f"RAM: {ram_usage}% (limit 45%), Disk: {disk_usage}% (limit 45%)")
         if not compliant:
-            logging.error("Resource usage too high (RAM or disk exceeds 45%)")
+            logger.error("Resource usage too high (RAM or disk exceeds 45%)")
             return False
         if ram_usage == "N/A" or disk_usage == "N/A":
-            logging.warning("Resource check returned incomplete data, proceeding with caution")
+            logger.warning("Resource check returned incomplete data, proceeding with caution")
 
         if not os.path.exists(requirements_dir):
-            logging.error(f"Requirements directory missing: {requirements_dir}")
+            logger.error(f"Requirements directory missing: {requirements_dir}")
             return False
 
-        index = initialize_index(dimension, index_path)
-        if index is None:
-            logging.error("Failed to initialize FAISS index")
-            return False
+        # One scandir pass stats every CSV; unchanged files are not read again
+        files = scan_files(requirements_dir, ".csv")
+        manifest = load_manifest(os.path.join(requirements_dir, MANIFEST_NAME))
+        if manifest and os.path.exists(index_path) and os.path.exists(metadata_path):
+            changed = changed_files(files, manifest)
+            if not changed:
+                logger.info(f"No requirements CSVs changed since the last parse, keeping {index_path}")
+                return True
+            if all(reindex_requirements_file(os.path.join(requirements_dir, filename)) for filename in changed):
+                return True
+            logger.warning("Incremental requirements reindex failed, rebuilding the index")
+        return _rebuild_requirements(requirements_dir, files)
+    except Exception as e:
+        logger.error(f"Parse requirements failed: {str(e)}")
+        return False
 
-        all_metadata = []
-        # Regex pattern for meaningful numerical values
-        pattern = r"([\$€£R\$][\d,.]+(?:\s*(?:billion|million|thousand|tCO2e|%|tons|litres|m³|kWh|MWh|hours|employees)))\b"
-
-        for filename in os.listdir(requirements_dir):
-            if filename.endswith(".csv"):
-                file_path = os.path.join(requirements_dir, filename)
-                try:
-                    logging.info(f"Processing {filename}")
-                    df = pd.read_csv(file_path)
-                    if df.empty:
-                        logging.warning(f"Empty CSV: {filename}")
-                        continue
-
-                    # Validate required columns
-                    required_columns = ['category', 'criterion', 'description']
-                    if not all(col in df.columns for col in required_columns):
-                        logging.warning(f"Missing required columns in {filename}: {set(required_columns) - set(df.columns)}")
-                        continue
-
-                    # Validate rows
-                    initial_rows = len(df)
-                    df = df.dropna(subset=['criterion']).reset_index(drop=True)
-                    if df.empty:
-                        logging.warning(f"No valid rows in {filename} after dropping empty criteria")
-                        continue
-                    if len(df) < initial_rows:
-                        logging.warning(f"Dropped {initial_rows - len(df)} rows with empty criteria in {filename}")
-
-                    logging.info(f"Rows in {filename}: {len(df)}")
-
-                    # Process rows in batches
-                    for batch_start in range(0, len(df), batch_size):
-                        batch_df = df.iloc[batch_start:batch_start + batch_size]
-                        texts = []
-                        valid_rows = []
-                        for idx, row in batch_df.iterrows():
-                            criterion = row.get('criterion', '')
-                            description = row.get('description', '')
-                            text = f"{criterion} {description}" if pd.notna(description) else criterion
-                            if pd.notna(text) and text.strip():
-                                texts.append(text)
-                                valid_rows.append(idx)
-                                # Extract numerical values (no logging)
-                                regex_match = re.search(pattern, text, re.IGNORECASE)
-                                value = regex_match.group(1) if regex_match else "None"
-                            else:
-                                logging.warning(f"Empty or invalid text for row {idx} in {filename}: {row.to_dict()}")
-
-                        if not texts:
-                            logging.warning(f"No valid texts in batch {batch_start} of {filename}")
-                            continue
-
-                        # Tokenize and embed batch
-                        results = tokenize_and_embed([{"page_number": 0, "text": text} for text in texts])
-                        if not results:
-                            logging.warning(f"No embeddings generated for batch {batch_start} of {filename}")
-                            continue
-
-                        # Align metadata with results
-                        embeddings = []
-                        metadata = []
-                        for i, res in enumerate(results):
-                            if i < len(valid_rows):
-                                embeddings.append(res["embedding"])
-                                metadata.append({
-                                    "app_name": filename,
-                                    "document_name": filename,
-                                    "page_number": 0,
-                                    "sentence_index": res["sentence_index"],
-                                    "sentence": res["sentence"],
-                                    "category": batch_df.iloc[i].get("category", ""),
-                                    "criterion": batch_df.iloc[i].get("criterion", ""),
-                                    "description": batch_df.iloc[i].get("description", "")
-                                })
-                            else:
-                                logging.warning(f"Skipping result {i} in batch {batch_start} of {filename}: index out-of-bounds")
-                                logging.warning(f"Expected {len(valid_rows)} results, got {len(results)}. Row {valid_rows[i] if i < len(valid_rows) else 'N/A'}: {batch_df.iloc[i].to_dict() if i < len(batch_df) else 'No row data'}")
-
-                        if not embeddings:
-                            logging.warning(f"No valid embeddings for batch {batch_start} of {filename}")
-                            continue
-
-                        add_to_index(index, embeddings, metadata, metadata_path, index_path)
-                        all_metadata.extend(metadata)
-                        logging.info(f"Indexed batch {batch_start} of {filename} with {len(metadata)} entries")
-
-                except Exception as e:
-                    logging.error(f"Error processing {filename}: {str(e)}")
-                    continue
+def _rebuild_requirements(requirements_dir, files):
+    """Parses every CSV in files, rebuilds the index and metadata, and rewrites the manifest."""
+    index_path = os.path.join(requirements_dir, "index.faiss")
+    metadata_path = os.path.join(requirements_dir, "metadata.pkl")
+
+    # Embeddings are spooled to a scratch file across CSVs and indexed once, so IVF layouts
+    # train on every row without holding them all in RAM
+    all_metadata = []
+    manifest = {}
+    with EmbeddingSpool(os.path.join(requirements_dir, "embeddings.spool")) as spool:
+        for filename, signature in files.items():
+            file_path = os.path.join(requirements_dir, filename)
+            try:
+                embeddings, metadata = parse_single_csv(file_path)
+                if metadata:
+                    spool.append(embeddings)
+                    all_metadata.extend(metadata)
+                manifest[filename] = manifest_entry(signature, len(metadata))
+            except Exception as e:
+                logger.error(f"Error processing {filename}: {str(e)}")
+                continue
 
         if all_metadata:
-            with open(metadata_path, "wb") as f:
-                pickle.dump(all_metadata, f)
-            logging.info(f"Saved metadata with {len(all_metadata)} entries")
-            return True
-        return False
+            index = build_index(spool.array(), index_path)
+            logger.info(f"Built FAISS index with {index.ntotal} vectors at {index_path}")
+
+    if all_metadata:
+        with open(metadata_path, "wb") as f:
+            pickle.dump(MetadataTable.from_records(all_metadata), f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Saved metadata with {len(all_metadata)} entries")
+        # Written last, so an interrupted rebuild is redone rather than trusted
+        save_manifest(os.path.join(requirements_dir, MANIFEST_NAME), manifest)
+        return True
+    return False
+
+def reindex_requirements_file(file_path) -> bool:
+    """
+    Reindexes one new, edited, or deleted requirements CSV without reparsing the others. The
+    file's previous rows are removed from the FAISS index and its current rows are added under
+    new ids. Metadata stays indexed by FAISS id: removed rows are blanked with
+    MetadataTable.replaced, and the table's length is the next free id. A full rebuild compacts both. The file's manifest entry is
+    updated so parse_requirements does not reindex it again, and a file that already matches its
+    entry is skipped.
+
+    Args:
+        file_path (str): Path to the changed CSV.
+
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    try:
+        requirements_dir = settings["data_paths"]["requirements"]
+        index_path = os.path.join(requirements_dir, "index.faiss")
+        metadata_path = os.path.join(requirements_dir, "metadata.pkl")
+        if not (os.path.exists(index_path) and os.path.exists(metadata_path)):
+            return parse_requirements()
+
+        filename = os.path.basename(file_path)
+        manifest_path = os.path.join(requirements_dir, MANIFEST_NAME)
+        manifest = load_manifest(manifest_path)
+        # Stat before reading, so an edit made while parsing is picked up by the next parse
+        signature = None
+        if os.path.exists(file_path):
+            stat = os.stat(file_path)
+            signature = [stat.st_mtime_ns, stat.st_size]
+            # Watchers report one change as several events; a file already indexed as is is skipped
+            entry = manifest.get(filename)
+            if entry and [entry["mtime_ns"], entry["size"]] == signature:
+                logger.info(f"{filename} unchanged since it was indexed, skipping")
+                return True
+        metadata = load_pickle(metadata_path)
+        if not isinstance(metadata, MetadataTable):
+            metadata = MetadataTable.from_records(metadata)
+        stale_ids = [i for i, name in enumerate(metadata.column("document_name")) if name == filename]
+        embeddings, file_metadata = parse_single_csv(file_path) if signature else ([], [])
+
+        index = update_index(index_path, stale_ids, embeddings, len(metadata))
+        if index is None:
+            logger.info(f"Index at {index_path} predates id mapping, rebuilding it")
+            return _rebuild_requirements(requirements_dir, scan_files(requirements_dir, ".csv"))
+        with open(metadata_path, "wb") as f:
+            pickle.dump(metadata.replaced(stale_ids, file_metadata), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if signature is None:
+            manifest.pop(filename, None)
+        else:
+            manifest[filename] = manifest_entry(signature, len(file_metadata))
+        save_manifest(manifest_path, manifest)
+        logger.info(f"Reindexed {filename}: removed {len(stale_ids)} and added {len(file_metadata)} entries")
+        return True
     except Exception as e:
-        logging.error(f"Parse requirements failed: {str(e)}")
-        return False
\ No newline at end of file
+        logger.error(f"Reindex of {file_path} failed: {str(e)}")
+        return False
@@ -6,18 +6,42 @@ file path: esg_engine/rag/requirements_rag/searcher.py
 
 import os
 import logging
-import faiss
-import pickle
 import numpy as np
 import csv
 from config.settings import get_settings
-from utils.text_processing import tokenize_and_embed
+from utils.text_processing import embed_texts
+from utils.pickle_cache import load_pickle
+from utils.metadata_store import MetadataTable
+from utils.vector_utils import read_index, to_distances
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "requirements.log")
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+def _cached_requirements(cached_texts, app_name, category_mapping, k):
+    """
+    Returns the cached requirements of app_name, used for empty queries and when searching fails.
+
+    Args:
+        cached_texts (dict): Cached standards and requirements texts.
+        app_name (str): CSV filename whose requirements are returned.
+        category_mapping (dict): Category for each criterion.
+        k (int): Maximum number of requirements to return.
+
+    Returns:
+        list: List of dictionaries with criterion, description, document_name, and category.
+    """
+    if not app_name or app_name not in cached_texts["requirements"]:
+        return []
+    requirements = []
+    for text in cached_texts["requirements"][app_name].values():
+        criterion, _, description = text.partition(":")
+        requirements.append({
+            "criterion": criterion,
+            "description": description,
+            "document_name": app_name,
+            "category": category_mapping.get(criterion, "Unknown")
+        })
+    return requirements[:k]
 
 def search_requirements(query, app_name=None, k=1000):
     """
@@ -32,8 +56,25 @@ def search_requirements(query, app_name=None, k=1000):
     Returns:
         list: List of dictionaries with criterion, description, document_name, category, and distance (if queried).
     """
+    return search_requirements_batch([query], app_name, k)[0]
+
+def search_requirements_batch(queries, app_name=None, k=1000):
+    """
+    Searches the FAISS index for requirements matching several queries, embedding all queries in
+    one batch and searching the stacked query matrix with a single index.search call. Empty
+    queries return all requirements for app_name from cached texts, as in search_requirements.
+
+    Args:
+        queries (list): Text queries to search for (each can be empty).
+        app_name (str, optional): CSV filename to filter results (e.g., "UNCTAD_requirements.csv").
+        k (int): Maximum number of results to return per query. Defaults to 1000.
+
+    Returns:
+        list: One list per query, in query order, of dictionaries with criterion, description,
+            document_name, category, and distance (if queried).
+    """
     try:
-        logging.info(f"Searching requirements for query='{query}', app_name='{app_name}', k={k}")
+        logger.info(f"Searching requirements for {len(queries)} queries, app_name='{app_name}', k={k}")
 
         # Load settings
         standards_dir = settings["data_paths"]["standards"]
@@ -44,20 +85,18 @@ def search_requirements(query, app_name=None, k=1000):
 
         # Check for cached texts
         if not os.path.exists(text_cache_path):
-            logging.error(f"No text cache found at {text_cache_path}. Run indexer.py first.")
-            return []
+            logger.error(f"No text cache found at {text_cache_path}. Run indexer.py first.")
+            return [[] for _ in queries]
 
-        with open(text_cache_path, "rb") as f:
-            cached_texts = pickle.load(f)
-        logging.info(f"Loaded cached texts: {len(cached_texts['standards'])} standards, {len(cached_texts['requirements'])} requirements")
+        cached_texts = load_pickle(text_cache_path)
+        logger.info(f"Loaded cached texts: {len(cached_texts['standards'])} standards, {len(cached_texts['requirements'])} requirements")
 
         # Load metadata
         if not os.path.exists(metadata_path):
-            logging.error(f"Metadata not found at {metadata_path}. Run indexer.py first.")
-            return []
-        with open(metadata_path, "rb") as f:
-            metadata = pickle.load(f)
-        logging.info(f"Loaded metadata with {len(metadata)} entries")
+            logger.error(f"Metadata not found at {metadata_path}. Run indexer.py first.")
+            return [[] for _ in queries]
+        metadata = load_pickle(metadata_path)
+        logger.info(f"Loaded metadata with {len(metadata)} entries")
 
         # Load category mapping from CSV if available
         category_mapping = {}
@@ -68,112 +107,84 @@ def search_requirements(query, app_name=None, k=1000):
                     criterion = row["criterion"]
                     category = row.get("category", "Unknown")
                     category_mapping[criterion] = category
-            logging.info(f"Loaded category mapping for {len(category_mapping)} criteria from {app_name}")
-
-        # Handle empty query
-        if not query.strip():
-            logging.info(f"Empty query provided, returning all requirements for app_name='{app_name}'")
-            if app_name and app_name in cached_texts["requirements"]:
-                req_texts = cached_texts["requirements"][app_name]
-                requirements = [
-                    {
-                        "criterion": text.split(":", 1)[0],
-                        "description": text.split(":", 1)[1] if ":" in text else "",
-                        "document_name": app_name,
-                        "category": category_mapping.get(text.split(":", 1)[0], "Unknown")
-                    }
-                    for text in req_texts.values()
-                ]
-                logging.info(f"Returning {len(requirements)} cached requirements for {app_name}")
-                return requirements[:k]
-            logging.warning(f"No requirements found for app_name='{app_name}' in cache")
-            return []
+            logger.info(f"Loaded category mapping for {len(category_mapping)} criteria from {app_name}")
+
+        # Empty queries return the cached requirements; the rest are searched together
+        results = [None] * len(queries)
+        searched = []
+        for i, query in enumerate(queries):
+            if query.strip():
+                searched.append(i)
+            else:
+                logger.info(f"Empty query provided, returning all requirements for app_name='{app_name}'")
+                results[i] = _cached_requirements(cached_texts, app_name, category_mapping, k)
+        if not searched:
+            return results
+
+        def fall_back():
+            for i in searched:
+                results[i] = _cached_requirements(cached_texts, app_name, category_mapping, k)
+            return results
 
         # Check if index exists
         if not os.path.exists(index_path):
-            logging.error(f"Index not found at {index_path}. Run indexer.py first.")
-            return []
-
-        # Embed query
-        query_page = [{"page_number": 1, "text": query}]
-        query_results = tokenize_and_embed(query_page)
-        if not query_results:
-            logging.warning(f"Failed to embed query '{query}'")
-            if app_name and app_name in cached_texts["requirements"]:
-                req_texts = cached_texts["requirements"][app_name]
-                requirements = [
-                    {
-                        "criterion": text.split(":", 1)[0],
-                        "description": text.split(":", 1)[1] if ":" in text else "",
-                        "document_name": app_name,
-                        "category": category_mapping.get(text.split(":", 1)[0], "Unknown")
-                    }
-                    for text in req_texts.values()
-                ]
-                return requirements[:k]
-            return []
-
-        query_embedding = query_results[0]["embedding"]
-        logging.info(f"Query embedded successfully: {query_embedding.shape}")
+            logger.error(f"Index not found at {index_path}. Run indexer.py first.")
+            return [[] if result is None else result for result in results]
+
+        # Embed queries in one batch (served from the persistent embedding cache on repeat queries)
+        query_embeddings = embed_texts([queries[i] for i in searched])
+        if len(query_embeddings) == 0:
+            logger.warning(f"Failed to embed {len(searched)} queries")
+            return fall_back()
+        logger.info(f"Queries embedded successfully: {query_embeddings.shape}")
 
         # Load FAISS index
         try:
-            index = faiss.read_index(index_path)
-            logging.info(f"Loaded FAISS index with {index.ntotal} vectors")
+            index = read_index(index_path)
+            logger.info(f"Loaded FAISS index with {index.ntotal} vectors")
         except Exception as e:
-            logging.error(f"Failed to load FAISS index: {str(e)}")
-            if app_name and app_name in cached_texts["requirements"]:
-                req_texts = cached_texts["requirements"][app_name]
-                requirements = [
-                    {
-                        "criterion": text.split(":", 1)[0],
-                        "description": text.split(":", 1)[1] if ":" in text else "",
-                        "document_name": app_name,
-                        "category": category_mapping.get(text.split(":", 1)[0], "Unknown")
-                    }
-                    for text in req_texts.values()
-                ]
-                return requirements[:k]
-            return []
-
-        # Search index
+            logger.error(f"Failed to load FAISS index: {str(e)}")
+            return fall_back()
+
+        # Search index with all queries in one call
         try:
-            distances, indices = index.search(np.array([query_embedding], dtype=np.float32), k)
-            logging.info(f"FAISS search returned {len(indices[0])} indices")
+            distances, indices = index.search(np.ascontiguousarray(query_embeddings, dtype=np.float32), k)
+            distances = to_distances(index, distances)
+            logger.info(f"FAISS search returned {indices.shape[1]} indices for each of {len(searched)} queries")
         except Exception as e:
-            logging.error(f"FAISS search failed: {str(e)}")
-            if app_name and app_name in cached_texts["requirements"]:
-                req_texts = cached_texts["requirements"][app_name]
-                requirements = [
-                    {
-                        "criterion": text.split(":", 1)[0],
-                        "description": text.split(":", 1)[1] if ":" in text else "",
-                        "document_name": app_name,
-                        "category": category_mapping.get(text.split(":", 1)[0], "Unknown")
-                    }
-                    for text in req_texts.values()
-                ]
-                return requirements[:k]
-            return []
-
-        # Collect results
-        results = []
-        for idx, dist in zip(indices[0], distances[0]):
-            if idx < len(metadata):
-                result = metadata[idx].copy()
-                if result.get("type") == "requirement" and (not app_name or result.get("document_name") == app_name):
-                    criterion = result["sentence"].split(":", 1)[0]
-                    results.append({
-                        "criterion": criterion,
-                        "description": result["sentence"].split(":", 1)[1] if ":" in result["sentence"] else "",
-                        "document_name": result["document_name"],
-                        "category": category_mapping.get(criterion, "Unknown"),
-                        "distance": float(dist)
-                    })
-        logging.info(f"Filtered {len(results)} requirements matching app_name='{app_name}'")
-
-        return results[:k]
+            logger.error(f"FAISS search failed: {str(e)}")
+            return fall_back()
+
+        # Filter hits with masks over the metadata columns instead of building a row dict per hit
+        if not isinstance(metadata, MetadataTable):
+            metadata = MetadataTable.from_records(metadata)
+        types = metadata.array("type")
+        document_names = metadata.array("document_name")
+        sentences = metadata.column("sentence")
+        names = metadata.column("document_name")
+
+        # Collect results per query
+        for i, row_indices, row_distances in zip(searched, indices, distances):
+            valid = (row_indices >= 0) & (row_indices < len(metadata))
+            hits, hit_distances = row_indices[valid], row_distances[valid]
+            keep = types[hits] == "requirement"
+            if app_name:
+                keep &= document_names[hits] == app_name
+            query_results = []
+            for idx, dist in zip(hits[keep].tolist(), hit_distances[keep].tolist()):
+                criterion, _, description = sentences[idx].partition(":")
+                query_results.append({
+                    "criterion": criterion,
+                    "description": description,
+                    "document_name": names[idx],
+                    "category": category_mapping.get(criterion, "Unknown"),
+                    "distance": dist
+                })
+            results[i] = query_results[:k]
+        logger.info(f"Filtered requirements matching app_name='{app_name}': {[len(results[i]) for i in searched]}")
+
+        return results
 
     except Exception as e:
-        logging.error(f"Search requirements failed: {str(e)}", exc_info=True)
-        return []
\ No newline at end of file
+        logger.error(f"Search requirements failed: {str(e)}", exc_info=True)
+        return [[] for _ in queries]
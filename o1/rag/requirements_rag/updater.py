@@ -10,13 +10,11 @@ import logging
 import os
 from config.settings import get_settings
 from utils.file_monitor import monitor_folder
-from .parser import parse_requirements
+from .parser import parse_requirements, reindex_requirements_file
 from utils.resource_monitor import check_resources
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "workflow.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def update_requirements():
     """
@@ -28,36 +26,36 @@ def update_requirements():
     try:
         # Check resources
         if not check_resources()["compliant"]:
-            logging.error("Resource usage exceeds limit, aborting requirements update")
+            logger.error("Resource usage exceeds limit, aborting requirements update")
             return False
 
         # Validate requirements directory
         requirements_dir = settings["data_paths"]["requirements"]
         if not os.path.exists(requirements_dir):
-            logging.error(f"Requirements directory {requirements_dir} does not exist")
+            logger.error(f"Requirements directory {requirements_dir} does not exist")
             return False
 
         # Initial parse
-        logging.info("Starting initial requirements parse")
+        logger.info("Starting initial requirements parse")
         if not parse_requirements():
-            logging.error("Initial requirements parse failed")
+            logger.error("Initial requirements parse failed")
             return False
-        logging.info("Initial requirements parse completed successfully")
+        logger.info("Initial requirements parse completed successfully")
 
-        # Define callback to reparse requirements
+        # Define callback to reindex only the changed CSV
         def callback(file_path):
             if file_path.endswith(".csv"):
-                logging.info(f"Detected change in {file_path}, reindexing requirements")
-                if not parse_requirements():
-                    logging.error(f"Failed to reindex requirements for {file_path}")
+                logger.info(f"Detected change in {file_path}, reindexing requirements")
+                if not reindex_requirements_file(file_path):
+                    logger.error(f"Failed to reindex requirements for {file_path}")
                 else:
-                    logging.info(f"Successfully reindexed requirements for {file_path}")
+                    logger.info(f"Successfully reindexed requirements for {file_path}")
 
         # Monitor requirements directory
-        logging.info(f"Starting folder monitoring for {requirements_dir}")
+        logger.info(f"Starting folder monitoring for {requirements_dir}")
         monitor_folder(requirements_dir, callback)
         return True
 
     except Exception as e:
-        logging.error(f"Requirements update failed: {str(e)}", exc_info=True)
+        logger.error(f"Requirements update failed: {str(e)}", exc_info=True)
         return False
\ No newline at end of file
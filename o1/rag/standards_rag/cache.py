@@ -0,0 +1,198 @@
+"""
+This module provides a persistent cache of Standards RAG retrievals for the ESG Engine. Results of
+search_standards are stored in a SQLite database, fronted by a bounded in-process LRU, keyed by the
+standards index version, document filter, k, and query, so criteria that repeat across reports skip
+the embedding and FAISS search.
+The version is derived from the signatures of data/standards/*.pdf, data/requirements/*.csv (both are
+indexed into the standards index), and the index file itself, so edited sources or a rebuilt index
+invalidate old entries automatically; the file watcher also clears the cache on change.
+
+file path: esg_engine/rag/standards_rag/cache.py
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from config.settings import get_settings, OUTPUT_DIR
+from utils.file_manifest import scan_files
+from .searcher import search_standards, search_standards_batch
+
+# Cache location; kept next to the other engine outputs
+settings = get_settings()
+logger = logging.getLogger(__name__)
+CACHE_PATH = OUTPUT_DIR / "standards_cache.db"
+
+_connection = None
+_version = None
+_lock = threading.Lock()
+
+# In-process LRU tier in front of SQLite, so long-lived processes skip the database read for
+# recent queries; override the size with ESG_STANDARDS_MEMORY_ENTRIES
+MEMORY_ENTRIES = int(os.environ.get("ESG_STANDARDS_MEMORY_ENTRIES", "4096"))
+_memory = OrderedDict()
+
+def _get_connection():
+    """Opens the cache database once per process and creates the table if needed."""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute("CREATE TABLE IF NOT EXISTS retrievals (key TEXT PRIMARY KEY, results BLOB)")
+        _connection.commit()
+    return _connection
+
+def compute_standards_version():
+    """
+    Computes the standards index version from the modification times and sizes of the files the
+    index is built from (standards PDFs and requirements CSVs) and of the index file.
+
+    Returns:
+        str: Hex MD5 digest of the sorted signatures.
+    """
+    standards_dir = settings["data_paths"]["standards"]
+    requirements_dir = settings["data_paths"].get("requirements", standards_dir)
+    signatures = {}
+    for directory, suffix in ((standards_dir, ".pdf"), (requirements_dir, ".csv")):
+        if os.path.isdir(directory):
+            signatures.update({os.path.join(directory, name): signature for name, signature in scan_files(directory, suffix).items()})
+    index_path = os.path.join(standards_dir, "index.faiss")
+    if os.path.exists(index_path):
+        stat = os.stat(index_path)
+        signatures[index_path] = [stat.st_mtime_ns, stat.st_size]
+    return hashlib.md5(json.dumps(signatures, sort_keys=True).encode("utf-8")).hexdigest()
+
+def refresh_standards_version():
+    """
+    Recomputes the standards version; called once at workflow start. Entries cached in memory
+    under an older version can never be read again, so a version change drops them.
+
+    Returns:
+        str: Current standards version.
+    """
+    global _version
+    version = compute_standards_version()
+    with _lock:
+        if version != _version:
+            _memory.clear()
+        _version = version
+    return _version
+
+def _cache_key(query, document_filter, k):
+    """Builds the cache key for a query under the current standards version."""
+    version = _version or refresh_standards_version()
+    return hashlib.sha256(f"{version}\0{document_filter}\0{k}\0{query}".encode("utf-8")).hexdigest()
+
+def _copy(results):
+    """Returns a copy of a result list, so callers never share dicts with the cache."""
+    return [dict(result) for result in results]
+
+def _remember(key, results):
+    """Adds results to the in-process tier, evicting the least recently used entries."""
+    with _lock:
+        _memory[key] = results
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+def _read(key):
+    """Returns a copy of cached results for a key, or None on a miss or read failure."""
+    with _lock:
+        results = _memory.get(key)
+        if results is not None:
+            _memory.move_to_end(key)
+    if results is not None:
+        return _copy(results)
+    try:
+        with _lock:
+            row = _get_connection().execute("SELECT results FROM retrievals WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            results = pickle.loads(row[0])
+            _remember(key, results)
+            return _copy(results)
+    except (sqlite3.Error, pickle.UnpicklingError) as e:
+        logger.warning(f"Standards cache read failed: {str(e)}")
+    return None
+
+def _write(entries):
+    """Stores copies of {key: results} entries, skipping empty results which usually mean a missing index."""
+    entries = {key: _copy(results) for key, results in entries.items() if results}
+    if not entries:
+        return
+    for key, results in entries.items():
+        _remember(key, results)
+    rows = [(key, pickle.dumps(results)) for key, results in entries.items()]
+    try:
+        with _lock:
+            conn = _get_connection()
+            conn.executemany("INSERT OR REPLACE INTO retrievals (key, results) VALUES (?, ?)", rows)
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"Standards cache write failed: {str(e)}")
+
+def cached_search_standards(query, document_filter=None, k=5):
+    """
+    Returns search_standards results for a query, serving repeats from the persistent cache.
+
+    Args:
+        query (str): Text query to search for.
+        document_filter (str, optional): Document name to filter results (e.g., "ifrs_s1.pdf").
+        k (int): Number of results to return. Defaults to 5.
+
+    Returns:
+        list: List of dictionaries with metadata (document_name, page_number, sentence_index, sentence, distance).
+    """
+    key = _cache_key(query, document_filter, k)
+    cached = _read(key)
+    if cached is not None:
+        return cached
+
+    results = search_standards(query, document_filter=document_filter, k=k)
+    _write({key: results})
+    return results
+
+def cached_search_standards_batch(queries, document_filter=None, k=5):
+    """
+    Returns search_standards results for several queries, serving cached ones from the persistent
+    cache and searching the rest with a single search_standards_batch call.
+
+    Args:
+        queries (list): Text queries to search for.
+        document_filter (str, optional): Document name to filter results (e.g., "ifrs_s1.pdf").
+        k (int): Number of results to return per query. Defaults to 5.
+
+    Returns:
+        list: One list of results per query, in input order.
+    """
+    keys = [_cache_key(query, document_filter, k) for query in queries]
+    all_results = [_read(key) for key in keys]
+    missing = [i for i, results in enumerate(all_results) if results is None]
+
+    if missing:
+        batch_results = search_standards_batch([queries[i] for i in missing], document_filter=document_filter, k=k)
+        for i, results in zip(missing, batch_results):
+            all_results[i] = results
+        _write({keys[i]: all_results[i] for i in missing})
+    return all_results
+
+def clear_standards_cache():
+    """
+    Removes all cached retrievals and forces the standards version to be recomputed.
+
+    Returns:
+        None
+    """
+    global _version
+    try:
+        with _lock:
+            _version = None
+            _memory.clear()
+            conn = _get_connection()
+            conn.execute("DELETE FROM retrievals")
+            conn.commit()
+        logger.info("Cleared standards retrieval cache")
+    except sqlite3.Error as e:
+        logger.warning(f"Standards cache clear failed: {str(e)}")
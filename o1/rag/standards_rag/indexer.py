@@ -10,20 +10,69 @@ import os
 import logging
 import pickle
 import csv
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from utils.pdf_processing import extract_pdf_text
-from utils.text_processing import tokenize_and_embed
-from utils.vector_utils import initialize_index, add_to_index
+from utils.text_processing import tokenize_and_embed, embed_texts, encoder_key
+from utils.embedding_cache import record_source
+from utils.vector_utils import build_index, update_index, EmbeddingSpool
+from utils.pickle_cache import load_pickle
+from utils.metadata_store import MetadataTable
+from utils.file_manifest import scan_files, changed_files, manifest_entry, load_manifest, save_manifest
 from config.settings import get_settings
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "errors.log")
-logging.basicConfig(filename=log_file, level=logging.ERROR, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Worker processes for PDF text extraction; embedding stays in this process, which holds the model
+EXTRACT_PROCESSES = int(os.environ.get("ESG_PDF_PROCESSES", max(1, (os.cpu_count() or 1) // 2)))
+
+# Manifest of the PDFs and CSVs the index was built from, kept in the standards directory
+MANIFEST_NAME = "_manifest.json"
+
+def _pdf_extractions(file_paths):
+    """
+    Yields (file_path, extract) pairs in input order, where extract() returns the file's pages or
+    raises its extraction error. With several PDFs, text is extracted in worker processes ahead
+    of the caller, so embedding one standard overlaps extracting the next.
+    
+    Args:
+        file_paths (list): Paths to the PDFs.
+    
+    Returns:
+        generator: (file_path, callable) pairs.
+    """
+    if len(file_paths) < 2 or EXTRACT_PROCESSES < 2:
+        for file_path in file_paths:
+            yield file_path, partial(extract_pdf_text, file_path)
+        return
+    with ProcessPoolExecutor(max_workers=min(EXTRACT_PROCESSES, len(file_paths))) as pool:
+        futures = [(file_path, pool.submit(extract_pdf_text, file_path)) for file_path in file_paths]
+        for file_path, future in futures:
+            yield file_path, future.result
+
+def _embed_standard(file_path, pages):
+    """Embeds a standard's extracted pages sentence by sentence; returns (embeddings, metadata)."""
+    filename = os.path.basename(file_path)
+    results = tokenize_and_embed(pages, cached=True)
+    if not results:
+        return [], []
+    record_source(file_path, [res["sentence"] for res in results], encoder_key())
+    embeddings = [res["embedding"] for res in results]
+    metadata = [{
+        "document_name": filename,
+        "page_number": res["page_number"],
+        "sentence_index": res["sentence_index"],
+        "sentence": res["sentence"],
+        "type": "standard"
+    } for res in results]
+    return embeddings, metadata
 
 def index_standards():
     """
     Initializes a FAISS index and processes all PDFs in data/standards/ and requirements in data/requirements/,
-    storing embeddings, metadata, and raw texts. Skips processing if cache and index files exist.
+    storing embeddings, metadata, and raw texts. Skips processing if cache and index files exist and no
+    PDF or CSV was added, edited, or removed since they were built, according to the manifest.
     
     Returns:
         bool: True if index exists or is created successfully, False otherwise.
@@ -37,117 +86,196 @@ def index_standards():
     index_path = os.path.join(standards_dir, "index.faiss")
     metadata_path = os.path.join(standards_dir, "metadata.pkl")
     text_cache_path = os.path.join(standards_dir, "texts_cache.pkl")
-    dimension = 384
+    manifest_path = os.path.join(standards_dir, MANIFEST_NAME)
     
-    # Check if index and cache already exist
+    # Check if index and cache already exist and were built from the current files, comparing
+    # one scandir listing per directory with the manifest
+    pdf_files = scan_files(standards_dir, ".pdf")
+    csv_files = scan_files(requirements_dir, ".csv")
     if os.path.exists(index_path) and os.path.exists(metadata_path) and os.path.exists(text_cache_path):
-        logging.info(f"Found existing index and cache at {index_path}, {metadata_path}, {text_cache_path}. Skipping indexing.")
-        return True
+        if not changed_files({**pdf_files, **csv_files}, load_manifest(manifest_path)):
+            logger.info(f"Found existing index and cache at {index_path}, {metadata_path}, {text_cache_path}. Skipping indexing.")
+            return True
+        logger.info("Standards or requirements files changed since the last indexing, rebuilding")
     
-    # Initialize FAISS index
-    index = initialize_index(dimension, index_path)
+    # Embeddings are spooled to a scratch file across files and indexed once, so IVF layouts train
+    # on the whole corpus without holding it in RAM
+    spool = EmbeddingSpool(os.path.join(standards_dir, "embeddings.spool"))
     
     # Initialize metadata and text cache
     all_metadata = []
     all_texts = {"standards": {}, "requirements": {}}
     success = False
+    # Every scanned file is recorded, so one that fails to process does not force a rebuild
+    # on each run; it is retried once it changes
+    manifest = {filename: manifest_entry(signature, 0) for filename, signature in {**pdf_files, **csv_files}.items()}
     
-    # Process standards PDFs
-    for filename in os.listdir(standards_dir):
-        if filename.endswith(".pdf"):
-            file_path = os.path.join(standards_dir, filename)
-            try:
-                logging.info(f"Processing standard {filename}")
-                pages = extract_pdf_text(file_path)
-                if not pages:
-                    logging.warning(f"No text extracted from {filename}")
-                    continue
-                
-                # Cache page texts
-                page_texts = {page['page_number']: page['text'] for page in pages}
-                all_texts["standards"][filename] = page_texts
-                
-                # Tokenize and embed sentences
-                results = tokenize_and_embed(pages)
-                if not results:
-                    logging.warning(f"No embeddings generated for {filename}")
-                    continue
-                
-                # Prepare embeddings and metadata
-                embeddings = [res["embedding"] for res in results]
-                metadata = [{
-                    "document_name": filename,
-                    "page_number": res["page_number"],
-                    "sentence_index": res["sentence_index"],
-                    "sentence": res["sentence"],
-                    "type": "standard"
-                } for res in results]
-                
-                # Add to FAISS index
-                add_to_index(index, embeddings, metadata, metadata_path, index_path)
-                
-                # Accumulate metadata
-                all_metadata.extend(metadata)
-                logging.info(f"Indexed {filename} with {len(metadata)} sentences")
-                success = True
-                
-            except Exception as e:
-                logging.error(f"Failed to process {filename}: {str(e)}")
+    # Process standards PDFs, extracting their text in parallel
+    pdf_paths = [os.path.join(standards_dir, filename) for filename in pdf_files]
+    for file_path, extract in _pdf_extractions(pdf_paths):
+        filename = os.path.basename(file_path)
+        try:
+            logger.info(f"Processing standard {filename}")
+            pages = extract()
+            if not pages:
+                logger.warning(f"No text extracted from {filename}")
                 continue
-    
+            
+            # Cache page texts
+            page_texts = {page['page_number']: page['text'] for page in pages}
+            all_texts["standards"][filename] = page_texts
+            
+            # Tokenize and embed sentences; unchanged sentences are served from the embedding cache
+            embeddings, metadata = _embed_standard(file_path, pages)
+            if not metadata:
+                logger.warning(f"No embeddings generated for {filename}")
+                continue
+            
+            # Spool embeddings and accumulate metadata
+            spool.append(embeddings)
+            all_metadata.extend(metadata)
+            manifest[filename]["rows"] = len(metadata)
+            logger.info(f"Indexed {filename} with {len(metadata)} sentences")
+            success = True
+            
+        except Exception as e:
+            logger.error(f"Failed to process {filename}: {str(e)}")
+            continue
+
     # Process requirements (CSV or text)
-    for filename in os.listdir(requirements_dir):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(requirements_dir, filename)
+    for filename in csv_files:
+        file_path = os.path.join(requirements_dir, filename)
+        try:
+            logger.info(f"Processing requirements {filename}")
+            with open(file_path, "r", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                requirements = list(reader)
+            
+            # Cache requirements text
+            req_texts = {i: f"{row['criterion']}: {row.get('description', '')}" for i, row in enumerate(requirements)}
+            all_texts["requirements"][filename] = req_texts
+            
+            # Embed each requirement's text whole in one batched encode call
+            embeddings = embed_texts(list(req_texts.values()))
+            if len(embeddings) == 0:
+                logger.warning(f"No embeddings generated for {filename}")
+                continue
+            record_source(file_path, req_texts.values(), encoder_key())
+            
+            # One vector per requirement, so metadata is built from the texts directly
+            metadata = [{
+                "document_name": filename,
+                "page_number": i,
+                "sentence_index": 0,
+                "sentence": text,
+                "type": "requirement"
+            } for i, text in req_texts.items()]
+            
+            # Spool embeddings and accumulate metadata
+            spool.append(embeddings)
+            all_metadata.extend(metadata)
+            manifest[filename]["rows"] = len(metadata)
+            logger.info(f"Indexed {filename} with {len(metadata)} requirements")
+            success = True
+            
+        except Exception as e:
+            logger.error(f"Failed to process {filename}: {str(e)}")
+            continue
+
+    # Build the FAISS index from the memory-mapped spool, which is removed afterwards
+    with spool:
+        if all_metadata:
             try:
-                logging.info(f"Processing requirements {filename}")
-                with open(file_path, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    requirements = list(reader)
-                
-                # Cache requirements text
-                req_texts = {i: f"{row['criterion']}: {row.get('description', '')}" for i, row in enumerate(requirements)}
-                all_texts["requirements"][filename] = req_texts
-                
-                # Tokenize and embed requirements
-                results = tokenize_and_embed([
-                    {"page_number": i, "text": text} for i, text in req_texts.items()
-                ])
-                if not results:
-                    logging.warning(f"No embeddings generated for {filename}")
-                    continue
-                
-                # Prepare embeddings and metadata
-                embeddings = [res["embedding"] for res in results]
-                metadata = [{
-                    "document_name": filename,
-                    "page_number": res["page_number"],
-                    "sentence_index": res["sentence_index"],
-                    "sentence": res["sentence"],
-                    "type": "requirement"
-                } for res in results]
-                
-                # Add to FAISS index
-                add_to_index(index, embeddings, metadata, metadata_path, index_path)
-                
-                # Accumulate metadata
-                all_metadata.extend(metadata)
-                logging.info(f"Indexed {filename} with {len(metadata)} requirements")
-                success = True
-                
+                index = build_index(spool.array(), index_path)
+                logger.info(f"Built FAISS index with {index.ntotal} vectors at {index_path}")
             except Exception as e:
-                logging.error(f"Failed to process {filename}: {str(e)}")
-                continue
+                logger.error(f"Failed to build FAISS index at {index_path}: {str(e)}")
+                return False
     
     # Save final metadata and texts
     if all_metadata:
+        # Stored column-wise so searches unpickle a few lists instead of a dict per sentence
         with open(metadata_path, "wb") as f:
-            pickle.dump(all_metadata, f)
-            logging.info(f"Saved metadata with {len(all_metadata)} entries")
+            pickle.dump(MetadataTable.from_records(all_metadata), f, protocol=pickle.HIGHEST_PROTOCOL)
+            logger.info(f"Saved metadata with {len(all_metadata)} entries")
     
     if all_texts["standards"] or all_texts["requirements"]:
         with open(text_cache_path, "wb") as f:
-            pickle.dump(all_texts, f)
-            logging.info(f"Saved texts for {len(all_texts['standards'])} standards and {len(all_texts['requirements'])} requirements")
+            pickle.dump(all_texts, f, protocol=pickle.HIGHEST_PROTOCOL)
+            logger.info(f"Saved texts for {len(all_texts['standards'])} standards and {len(all_texts['requirements'])} requirements")
+    
+    # Written last, so an interrupted indexing run is redone rather than trusted
+    if success:
+        save_manifest(manifest_path, manifest)
+    
+    return success
+
+def reindex_standards_file(file_path):
+    """
+    Reindexes one new, edited, or deleted standard PDF without reprocessing the others. The
+    file's previous sentences are removed from the FAISS index and its current sentences are
+    appended under new ids; metadata, cached texts, and the manifest are updated to match. A
+    file whose modification time and size match the manifest is skipped, so repeated watcher
+    events for one change are handled once. Falls back to index_standards without an index.
+    
+    Args:
+        file_path (str): Path to the changed PDF.
+    
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    standards_dir = settings["data_paths"]["standards"]
+    index_path = os.path.join(standards_dir, "index.faiss")
+    metadata_path = os.path.join(standards_dir, "metadata.pkl")
+    text_cache_path = os.path.join(standards_dir, "texts_cache.pkl")
+    manifest_path = os.path.join(standards_dir, MANIFEST_NAME)
+    if not all(os.path.exists(path) for path in (index_path, metadata_path, text_cache_path, manifest_path)):
+        return index_standards()
     
-    return success
\ No newline at end of file
+    filename = os.path.basename(file_path)
+    try:
+        manifest = load_manifest(manifest_path)
+        signature = None
+        if os.path.exists(file_path):
+            stat = os.stat(file_path)
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = manifest.get(filename)
+            if entry and [entry["mtime_ns"], entry["size"]] == signature:
+                logger.info(f"{filename} unchanged since it was indexed, skipping")
+                return True
+        elif filename not in manifest:
+            return True
+        
+        metadata = load_pickle(metadata_path)
+        if not isinstance(metadata, MetadataTable):
+            metadata = MetadataTable.from_records(metadata)
+        stale_ids = [i for i, name in enumerate(metadata.column("document_name")) if name == filename]
+        pages = extract_pdf_text(file_path) if signature else []
+        embeddings, file_metadata = _embed_standard(file_path, pages) if pages else ([], [])
+        
+        index = update_index(index_path, stale_ids, embeddings, len(metadata))
+        if index is None:
+            logger.info(f"Index at {index_path} predates id mapping, rebuilding it")
+            return index_standards()
+        with open(metadata_path, "wb") as f:
+            pickle.dump(metadata.replaced(stale_ids, file_metadata), f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        # Cached texts are shared with other readers, so the updated dict is a shallow copy
+        cached_texts = load_pickle(text_cache_path)
+        texts = {"standards": dict(cached_texts["standards"]), "requirements": cached_texts["requirements"]}
+        texts["standards"].pop(filename, None)
+        if pages:
+            texts["standards"][filename] = {page['page_number']: page['text'] for page in pages}
+        with open(text_cache_path, "wb") as f:
+            pickle.dump(texts, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        if signature is None:
+            manifest.pop(filename, None)
+        else:
+            manifest[filename] = manifest_entry(signature, len(file_metadata))
+        save_manifest(manifest_path, manifest)
+        logger.info(f"Reindexed {filename}: removed {len(stale_ids)} and added {len(file_metadata)} sentences")
+        return True
+    except Exception as e:
+        logger.error(f"Reindex of {file_path} failed: {str(e)}")
+        return False
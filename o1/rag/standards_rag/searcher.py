@@ -7,9 +7,8 @@ file path: esg_engine/rag/standards_rag/searcher.py
 """
 
 import os
-import faiss
-from utils.vector_utils import search_index
-from utils.text_processing import tokenize_and_embed
+from utils.vector_utils import search_index, search_index_batch, read_index
+from utils.text_processing import tokenize_and_embed, embed_texts
 from config.settings import get_settings
 
 def search_standards(query, document_filter=None, k=5):
@@ -31,7 +30,7 @@ def search_standards(query, document_filter=None, k=5):
     metadata_path = os.path.join(settings["data_paths"]["standards"], "metadata.pkl")
     
     # Check if index and metadata exist
-    if not (os.path.exists(index_path) and os.path.exists(metadata_path)):
+    if not all(os.path.exists(path) for path in (index_path, metadata_path)):
         return []
     
     # Embed query
@@ -42,7 +41,7 @@ def search_standards(query, document_filter=None, k=5):
     query_embedding = query_results[0]["embedding"]
     
     # Load FAISS index
-    index = faiss.read_index(index_path)
+    index = read_index(index_path)
     
     # Search index
     results = search_index(index, query_embedding, metadata_path, k=k)
@@ -51,4 +50,40 @@ def search_standards(query, document_filter=None, k=5):
     if document_filter:
         results = [res for res in results if res["document_name"] == document_filter]
     
-    return results
\ No newline at end of file
+    return results
+
+def search_standards_batch(queries, document_filter=None, k=5):
+    """
+    Queries the FAISS index for several queries at once, embedding them in a single batch and
+    issuing one search over the stacked query matrix.
+    
+    Args:
+        queries (list): Text queries to search for.
+        document_filter (str, optional): Document name to filter results (e.g., "ifrs_s1.pdf").
+        k (int): Number of results to return per query. Defaults to 5.
+    
+    Returns:
+        list: One list per query, in input order, of dictionaries with metadata
+            (document_name, page_number, sentence_index, sentence, distance).
+    """
+    # Load settings
+    settings = get_settings()
+    index_path = os.path.join(settings["data_paths"]["standards"], "index.faiss")
+    metadata_path = os.path.join(settings["data_paths"]["standards"], "metadata.pkl")
+    
+    all_results = [[] for _ in queries]
+    non_empty = [i for i, query in enumerate(queries) if query and query.strip()]
+    if not non_empty or not all(os.path.exists(path) for path in (index_path, metadata_path)):
+        return all_results
+    
+    # Embed all queries in one pass and search once
+    query_embeddings = embed_texts([queries[i] for i in non_empty])
+    index = read_index(index_path)
+    batch_results = search_index_batch(index, query_embeddings, metadata_path, k=k)
+    
+    for i, results in zip(non_empty, batch_results):
+        if document_filter:
+            results = [res for res in results if res["document_name"] == document_filter]
+        all_results[i] = results
+    
+    return all_results
@@ -10,13 +10,11 @@ import logging
 import os
 from config.settings import get_settings
 from utils.file_monitor import monitor_folder
-from .indexer import index_standards
+from .indexer import index_standards, reindex_standards_file
 import threading
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "standards_update.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def update_standards():
     """
@@ -27,18 +25,18 @@ def update_standards():
     """
     # Initial indexing
     if index_standards():
-        logging.info("Initial standards indexing completed")
+        logger.info("Initial standards indexing completed")
     else:
-        logging.warning("Initial standards indexing failed")
+        logger.warning("Initial standards indexing failed")
     
-    # Define callback to reindex standards
+    # Define callback to reindex only the changed standard
     def callback(file_path):
         if file_path.endswith(".pdf"):
-            logging.info(f"Detected change in {file_path}, reindexing standards")
-            if index_standards():
-                logging.info(f"Successfully reindexed standards for {file_path}")
+            logger.info(f"Detected change in {file_path}, reindexing standards")
+            if reindex_standards_file(file_path):
+                logger.info(f"Successfully reindexed standards for {file_path}")
             else:
-                logging.warning(f"Failed to reindex standards for {file_path}")
+                logger.warning(f"Failed to reindex standards for {file_path}")
     
     # Monitor standards directory
     standards_dir = settings["data_paths"]["standards"]
@@ -48,4 +46,4 @@ def update_standards():
     try:
         monitor_thread.join()
     except KeyboardInterrupt:
-        logging.info("Stopping standards monitoring")
\ No newline at end of file
+        logger.info("Stopping standards monitoring")
\ No newline at end of file
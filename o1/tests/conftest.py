@@ -0,0 +1,40 @@
+"""
+This file provides session-scoped pytest fixtures for the ESG Engine tests. The encoder, the
+standards index, and the btg-pactual.pdf report index are built once per test session and shared
+by the tests that only search them, instead of every test reindexing the same corpus.
+
+file path: esg_engine/tests/conftest.py
+"""
+
+import os
+import pytest
+from config.settings import get_settings
+
+@pytest.fixture(scope="session")
+def encoder():
+    """
+    Loads the shared sentence-transformers encoder once per session.
+    """
+    from utils.text_processing import get_encoder
+    return get_encoder()[0]
+
+@pytest.fixture(scope="session")
+def standards_index():
+    """
+    Indexes data/standards/ once per session and returns the index path.
+    """
+    from rag.standards_rag.indexer import index_standards
+    assert index_standards(), "Indexing failed"
+    return os.path.join(get_settings()["data_paths"]["standards"], "index.faiss")
+
+@pytest.fixture(scope="session")
+def report_index():
+    """
+    Indexes btg-pactual.pdf once per session and returns the report path; skips if it is missing.
+    """
+    from rag.reports_rag.indexer import index_report
+    report_path = os.path.join(get_settings()["data_paths"]["reports"], "btg-pactual.pdf")
+    if not os.path.exists(report_path):
+        pytest.skip("btg-pactual.pdf not found")
+    assert index_report(report_path), "Indexing failed"
+    return report_path
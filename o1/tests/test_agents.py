@@ -12,11 +12,13 @@ import time
 from agents.superbrain.coordinator import initialize_system
 from agents.superbrain.workflow import execute_workflow
 from agents.monitoring.resource_monitor import monitor_resources
+from agents.monitoring.worker_pool import bounded_submit, current_budget, HARD_CAP
 from agents.monitoring.file_watcher import watch_files
-from agents.extraction.searcher import extract_data
+from agents.extraction.searcher import extract_data, clear_extract_cache, precompute_criteria
 from agents.extraction.concurrent import concurrent_extract
-from agents.evaluation.validator import validate_data
+from agents.evaluation.validator import validate_data, encode_batch, build_standards_index, get_standards_text_index, rule_based_compliance, first_values
 from agents.evaluation.retry import retry_extraction
+from agents.evaluation.evaluate_and_summarize import evaluate
 from agents.summarization.summarizer import generate_summary
 from config.settings import get_settings
 
@@ -34,6 +36,7 @@ def test_initialize_system(tmp_path):
     assert "standards_rag" in agents
     assert "reports_rag" in agents
     assert "requirements_rag" in agents
+    assert all(callable(fn) for components in agents.values() for fn in components.values()), "Agent paths not resolved"
 
 def test_workflow(tmp_path):
     """
@@ -66,6 +69,31 @@ def test_resource_monitor():
     assert result["compliant"], "Resource usage exceeds 45% limit"
     assert isinstance(result["max_sub_agents"], int)
 
+def test_bounded_submit():
+    """
+    Tests that tasks submitted against a shared budget never run more than the budget at once.
+    """
+    import threading
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+    
+    def work(x):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return x * 2
+    
+    budget = current_budget()
+    assert 1 <= budget <= HARD_CAP
+    slots = threading.BoundedSemaphore(budget)
+    futures = [bounded_submit(slots, work, x) for x in range(20)]
+    assert [future.result() for future in futures] == [x * 2 for x in range(20)]
+    assert peak[0] <= budget, "More tasks ran than the budget allows"
+
 def test_file_watcher(tmp_path):
     """
     Tests file monitoring for standards and requirements.
@@ -92,35 +120,56 @@ def test_file_watcher(tmp_path):
     log_file = os.path.join(settings["data_paths"]["output"], "monitor.log")
     assert os.path.exists(log_file), "Monitor log not created"
 
-def test_extraction(tmp_path):
+def test_extraction(report_index):
     """
     Tests extraction for a single criterion.
     """
-    settings = get_settings()
-    report_path = os.path.join(settings["data_paths"]["reports"], "btg-pactual.pdf")
-    if not os.path.exists(report_path):
-        pytest.skip("btg-pactual.pdf not found")
-    
-    from rag.reports_rag.indexer import index_report
-    assert index_report(report_path), "Indexing failed"
-    
+    report_path = report_index
     result = extract_data(report_path, "emissions reporting")
     assert isinstance(result, dict)
     assert "criterion" in result
     assert "matches" in result
 
-def test_concurrent_extraction(tmp_path):
+def test_extraction_cache():
     """
-    Tests concurrent extraction for multiple criteria.
+    Tests that repeated extractions are served from the cache until it is cleared.
     """
     settings = get_settings()
     report_path = os.path.join(settings["data_paths"]["reports"], "btg-pactual.pdf")
     if not os.path.exists(report_path):
         pytest.skip("btg-pactual.pdf not found")
     
-    from rag.reports_rag.indexer import index_report
-    assert index_report(report_path), "Indexing failed"
+    clear_extract_cache()
+    first = extract_data(report_path, "emissions reporting")
+    start_time = time.time()
+    second = extract_data(report_path, "emissions reporting")
+    assert time.time() - start_time < 0.1, "Cached extraction took too long"
+    assert first == second
     
+    # Mutating a returned result must not leak into the cache
+    second["matches"].append({"value": "mutated"})
+    assert extract_data(report_path, "emissions reporting") == first
+    clear_extract_cache()
+
+def test_precompute_criteria():
+    """
+    Tests that criterion analysis is computed for criteria and their descriptions.
+    """
+    analyses = precompute_criteria(["Emissions Reporting", "Water Usage"], {"Emissions Reporting": "Scope 1 GHG emissions"})
+    assert set(analyses) == {"Emissions Reporting", "Water Usage"}
+    emissions = analyses["Emissions Reporting"]
+    assert emissions["criterion"]["text"] == "emissions reporting"
+    assert emissions["criterion"]["embedding"].shape == (384,)
+    assert emissions["criterion"]["pattern"].search("emissions reporting: 1,200 tco2e").group(1) == "1,200 tco2e"
+    assert "emissions" in emissions["criterion"]["tokens"]
+    assert emissions["description"]["text"] == "scope 1 ghg emissions"
+    assert analyses["Water Usage"]["description"] is None
+
+def test_concurrent_extraction(report_index):
+    """
+    Tests concurrent extraction for multiple criteria.
+    """
+    report_path = report_index
     criteria = ["emissions reporting", "governance"]
     start_time = time.time()
     results = concurrent_extract(report_path, criteria)
@@ -139,6 +188,82 @@ def test_validation():
     assert "standard_matches" in result
     assert "compliance" in result
 
+def test_first_values():
+    """
+    Tests that the single-pass value scan finds each sentence's first value without matching across sentences.
+    """
+    sentences = ["Emissions were 120 tCO2e.", "Revenue of 5", "million dollars", "Used 3 kWh and 4 MWh"]
+    assert first_values(sentences) == ["120 tCO2e", None, None, "3 kWh"]
+    assert first_values([]) == []
+
+def test_rule_based_compliance():
+    """
+    Tests that compliance requires report evidence and a sufficiently similar standard match.
+    """
+    extracted = [{"sentence": "Scope 1 emissions were 120 tCO2e."}]
+    assert rule_based_compliance(extracted, [{"similarity": 0.8}, {"similarity": 0.3}]) == "Compliant"
+    assert rule_based_compliance(extracted, [{"similarity": 0.4}]) == "Non-compliant"
+    assert rule_based_compliance([], [{"similarity": 0.9}]) == "Non-compliant"
+    assert rule_based_compliance(extracted, []) == "Non-compliant"
+
+def test_validation_standards_cache_similarity():
+    """
+    Tests that a standards_cache entry with the criterion's embedding is matched by semantic
+    similarity, so failures in the similarity path cannot silently degrade to token overlap.
+    """
+    criterion = "emissions reporting"
+    entry = {
+        "filename": "ifrs_s2.pdf",
+        "page_number": 3,
+        "sentence": "An entity shall disclose its absolute gross greenhouse gas outputs.",
+        "embedding": encode_batch([criterion])[0]
+    }
+    standards_cache = [entry]
+    standards_index = build_standards_index(standards_cache)
+    assert standards_index["sentences"].tolist() == [entry["sentence"]]
+    
+    extraction = {"criterion": criterion, "source": "report.pdf",
+                  "matches": [{"text": "Scope 1 emissions were 1,200 tCO2e.", "page_number": 5}]}
+    result = validate_data(extraction, standards_texts={"ifrs_s2.pdf": {}}, standards_cache=standards_cache,
+                           assess=False, rag_standards=[], standards_index=standards_index)
+    matches = [m for m in result["standard_matches"] if m["text"] == entry["sentence"]]
+    assert matches, "Known-match standards_cache entry was not returned"
+    assert matches[0]["similarity"] > 0.9
+
+def test_standards_text_index():
+    """
+    Tests that standards pages are split and indexed once and reused across calls.
+    """
+    standards_texts = {"ifrs_s1.pdf": {1: "Entities shall disclose emissions. Water use is reported.", 0: "Invalid page."}}
+    index = get_standards_text_index(standards_texts)
+    assert index["pages"].tolist() == [1, 1]
+    assert set(index["filenames"]) == {"ifrs_s1.pdf"}
+    assert index["index"].ntotal == 2
+    assert get_standards_text_index(standards_texts) is index, "Index should be reused for the same texts"
+
+def test_evaluate_and_summarize():
+    """
+    Tests fused validation and summarization.
+    """
+    extraction = {"criterion": "emissions reporting", "matches": [{"sentence": "Test emission data"}]}
+    requirement = {"category": "Environment", "criterion": "emissions reporting", "description": "Report emissions"}
+    validation, summary = evaluate(extraction, requirement, standard_filter="ifrs_s1.pdf")
+    assert validation["compliance"] in ("Compliant", "Non-compliant", "Failed")
+    assert "standard_matches" in validation
+    assert isinstance(summary, str)
+    assert "emissions reporting" in summary
+
+def test_evaluate_empty_extraction():
+    """
+    Tests that extractions without matches short-circuit to Non-compliant.
+    """
+    extraction = {"criterion": "water usage", "matches": []}
+    requirement = {"category": "Environment", "criterion": "water usage", "description": "Report water usage"}
+    validation, summary = evaluate(extraction, requirement)
+    assert validation["compliance"] == "Non-compliant"
+    assert validation["standard_matches"] == []
+    assert summary == "No evidence found for water usage"
+
 def test_retry_extraction(tmp_path):
     """
     Tests retry logic for failed extractions.
@@ -0,0 +1,26 @@
+"""
+This file contains unit tests for the content_hash module, ensuring file digests follow the
+file contents rather than its modification time.
+
+file path: esg_engine/tests/test_content_hash.py
+"""
+
+import os
+import hashlib
+from utils.content_hash import file_digest
+
+def test_file_digest(tmp_path):
+    """
+    Tests that a digest matches SHA-256 of the contents, survives a touch, and changes with an edit.
+    """
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4 report")
+    digest = file_digest(str(path))
+    assert digest == hashlib.sha256(b"%PDF-1.4 report").hexdigest()
+    
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert file_digest(str(path)) == digest, "Touching a file should not change its digest"
+    
+    path.write_bytes(b"%PDF-1.4 edited report")
+    assert file_digest(str(path)) != digest, "Editing a file should change its digest"
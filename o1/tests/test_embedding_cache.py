@@ -0,0 +1,90 @@
+"""
+This file contains unit tests for the embedding_cache module, ensuring embeddings are
+computed once per (model, text) and served from disk afterwards.
+
+file path: esg_engine/tests/test_embedding_cache.py
+"""
+
+import pytest
+import numpy as np
+import utils.embedding_cache as embedding_cache
+from utils.embedding_cache import record_source, get_or_compute_many, get_or_compute, quantize, dequantize, quantize_matrix, dequantize_matrix
+
+def test_get_or_compute_many(tmp_path, monkeypatch):
+    """
+    Tests that cached embeddings are reused and only misses reach the embed function.
+    """
+    monkeypatch.setattr(embedding_cache, "CACHE_PATH", tmp_path / "emb_cache.db")
+    monkeypatch.setattr(embedding_cache, "_connection", None)
+    monkeypatch.setattr(embedding_cache, "_memory", embedding_cache.OrderedDict())
+    calls = []
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+    
+    model_name = "test-model-embedding-cache"
+    first = get_or_compute_many(["alpha", "beta", "alpha"], embed_fn, model_name)
+    assert first.shape == (3, 2)
+    assert calls[-1] == ["alpha", "beta"], "Duplicate texts should be embedded once"
+    
+    second = get_or_compute_many(["beta", "gamma"], embed_fn, model_name)
+    assert calls[-1] == ["gamma"], "Cached texts should not be re-embedded"
+    assert np.array_equal(second[0], first[1])
+    
+    # A different model name must not reuse entries
+    get_or_compute("alpha", embed_fn, model_name + "-v2")
+    assert calls[-1] == ["alpha"]
+    
+    embedding_cache._connection.close()
+
+def test_quantize_roundtrip():
+    """
+    Tests that int8 quantization preserves embedding direction.
+    """
+    rng = np.random.default_rng(0)
+    vector = rng.standard_normal(384).astype(np.float32)
+    quantized, scale = quantize(vector)
+    assert quantized.dtype == np.int8
+    restored = dequantize(quantized, scale)
+    cosine = float(restored @ vector / (np.linalg.norm(restored) * np.linalg.norm(vector)))
+    assert cosine > 0.999, "Quantization should not change cosine similarity materially"
+    
+    zeros, zero_scale = quantize(np.zeros(4, dtype=np.float32))
+    assert not dequantize(zeros, zero_scale).any()
+
+def test_quantize_matrix_matches_rows():
+    """
+    Tests that matrix quantization matches per-vector quantization row by row.
+    """
+    rng = np.random.default_rng(1)
+    matrix = rng.standard_normal((3, 384)).astype(np.float32)
+    matrix[2] = 0.0
+    quantized, scales = quantize_matrix(matrix)
+    for row, q, scale in zip(matrix, quantized, scales):
+        expected, expected_scale = quantize(row)
+        assert np.array_equal(q, expected)
+        assert np.isclose(scale, expected_scale)
+    assert np.allclose(dequantize_matrix(quantized, scales), matrix, atol=float(scales.max()))
+
+def test_record_source_prunes_removed_texts(tmp_path, monkeypatch):
+    """
+    Tests that texts removed from an edited source leave the cache unless another source uses them.
+    """
+    monkeypatch.setattr(embedding_cache, "CACHE_PATH", tmp_path / "emb_cache.db")
+    monkeypatch.setattr(embedding_cache, "_connection", None)
+    monkeypatch.setattr(embedding_cache, "_memory", embedding_cache.OrderedDict())
+    calls = []
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return np.ones((len(texts), 2), dtype=np.float32)
+    
+    model_name = "test-model-sources"
+    get_or_compute_many(["kept", "removed", "shared"], embed_fn, model_name)
+    record_source(str(tmp_path / "a.pdf"), ["kept", "removed", "shared"], model_name)
+    record_source(str(tmp_path / "b.pdf"), ["shared"], model_name)
+    assert record_source(str(tmp_path / "a.pdf"), ["kept"], model_name) == 1, "Only the unshared removed text is pruned"
+    
+    get_or_compute_many(["kept", "removed", "shared"], embed_fn, model_name)
+    assert calls[-1] == ["removed"], "Pruned text should be embedded again"
+    
+    embedding_cache._connection.close()
@@ -0,0 +1,50 @@
+"""
+This file contains unit tests for the extraction cache module, ensuring stored results are
+served for an unchanged report and invalidated when the report's contents change.
+
+file path: esg_engine/tests/test_extraction_cache.py
+"""
+
+import os
+import agents.extraction.cache as extraction_cache
+from agents.extraction.cache import read_extraction, write_extraction, report_digest
+
+def test_extraction_cache_roundtrip(tmp_path, monkeypatch):
+    """
+    Tests that a stored result is returned until the report is rewritten.
+    """
+    monkeypatch.setattr(extraction_cache, "CACHE_PATH", tmp_path / "extraction_cache.db")
+    monkeypatch.setattr(extraction_cache, "_connection", None)
+    monkeypatch.setattr(extraction_cache, "encoder_key", lambda: "torch:all-MiniLM-L6-v2")
+    report_path = str(tmp_path / "report.pdf")
+    with open(report_path, "wb") as f:
+        f.write(b"first version")
+
+    result = {"criterion": "emissions reporting", "matches": [{"value": "120 tCO2e", "page_number": 3}]}
+    assert read_extraction(report_path, "emissions reporting") is None
+    write_extraction(report_path, "emissions reporting", None, result)
+    assert read_extraction(report_path, "emissions reporting") == result
+    assert read_extraction(report_path, "emissions reporting", "Scope 1 emissions") is None, "Description is part of the key"
+
+    monkeypatch.setattr(extraction_cache, "encoder_key", lambda: "onnx:all-MiniLM-L6-v2")
+    assert read_extraction(report_path, "emissions reporting") is None, "Encoder is part of the key"
+    monkeypatch.setattr(extraction_cache, "encoder_key", lambda: "torch:all-MiniLM-L6-v2")
+    version = extraction_cache.EXTRACTION_VERSION
+    monkeypatch.setattr(extraction_cache, "EXTRACTION_VERSION", version + 1)
+    assert read_extraction(report_path, "emissions reporting") is None, "Extraction version is part of the key"
+    monkeypatch.setattr(extraction_cache, "EXTRACTION_VERSION", version)
+    assert read_extraction(report_path, "emissions reporting") == result
+
+    with open(report_path, "wb") as f:
+        f.write(b"second version")
+    stat = os.stat(report_path)
+    os.utime(report_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_extraction(report_path, "emissions reporting") is None, "Changed report should not reuse results"
+
+    extraction_cache._connection.close()
+
+def test_report_digest_missing_file(tmp_path):
+    """
+    Tests that an unreadable report has no digest, so nothing is cached for it.
+    """
+    assert report_digest(str(tmp_path / "missing.pdf")) is None
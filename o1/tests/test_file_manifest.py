@@ -0,0 +1,33 @@
+"""
+This file contains unit tests for the file_manifest module, ensuring unchanged files are
+recognized and new, edited, and deleted files are reported.
+
+file path: esg_engine/tests/test_file_manifest.py
+"""
+
+import os
+from utils.file_manifest import scan_files, changed_files, manifest_entry, load_manifest, save_manifest
+
+def test_changed_files(tmp_path):
+    """
+    Tests that a saved manifest matches an unchanged directory and flags edits and deletions.
+    """
+    (tmp_path / "a.csv").write_text("category,criterion\n")
+    (tmp_path / "b.csv").write_text("category,criterion\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+    manifest_path = str(tmp_path / "_manifest.json")
+    assert load_manifest(manifest_path) == {}, "Missing manifest should load as empty"
+    
+    files = scan_files(str(tmp_path), ".csv")
+    assert sorted(files) == ["a.csv", "b.csv"]
+    save_manifest(manifest_path, {name: manifest_entry(signature, 1) for name, signature in files.items()})
+    manifest = load_manifest(manifest_path)
+    assert changed_files(scan_files(str(tmp_path), ".csv"), manifest) == [], "Unchanged files should be skipped"
+    
+    stat = os.stat(tmp_path / "a.csv")
+    os.utime(tmp_path / "a.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    os.remove(tmp_path / "b.csv")
+    (tmp_path / "c.csv").write_text("category,criterion\n")
+    changed = changed_files(scan_files(str(tmp_path), ".csv"), manifest)
+    assert sorted(changed) == ["a.csv", "b.csv", "c.csv"], "Edited, deleted, and new files should be reported"
+    assert not os.path.exists(manifest_path + ".tmp"), "Manifest should be written atomically"
@@ -8,7 +8,9 @@ file path: esg_engine/tests/test_file_monitor.py
 import pytest
 import os
 import time
-from utils.file_monitor import monitor_folder
+import threading
+from types import SimpleNamespace
+from utils.file_monitor import monitor_folder, start_observer, FileMonitorHandler
 from config.settings import get_settings
 
 def test_monitor_folder(tmp_path):
@@ -23,7 +25,6 @@ def test_monitor_folder(tmp_path):
         called.append(path)
     
     # Start monitoring in a separate thread
-    import threading
     monitor_thread = threading.Thread(target=monitor_folder, args=(folder_path, callback), daemon=True)
     monitor_thread.start()
     
@@ -43,4 +44,58 @@ def test_monitor_folder(tmp_path):
     # Cleanup
     os.remove(test_file)
     if os.path.exists(test_file + ".bak"):
-        os.rename(test_file + ".bak", test_file)
\ No newline at end of file
+        os.rename(test_file + ".bak", test_file)
+
+def test_monitor_folders_single_observer(tmp_path):
+    """
+    Tests that one observer routes events from two folders to their own callbacks.
+    """
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    first_called, second_called = [], []
+    
+    observer = start_observer({str(first): first_called.append, str(second): second_called.append})
+    try:
+        time.sleep(0.5)
+        
+        (first / "a.csv").write_text("a")
+        (second / "b.pdf").write_text("b")
+        time.sleep(1)
+    finally:
+        observer.stop()
+        observer.join()
+    
+    assert str(first / "a.csv") in first_called
+    assert str(second / "b.pdf") in second_called
+    assert str(second / "b.pdf") not in first_called
+
+def test_monitor_handler_debounces_bursts():
+    """
+    Tests that a burst of events for one file triggers its callback once, after the quiet period.
+    """
+    called = []
+    handler = FileMonitorHandler(called.append, delay=0.2)
+    event = SimpleNamespace(is_directory=False, src_path="standard.pdf")
+    handler.on_created(event)
+    for _ in range(5):
+        handler.on_modified(event)
+    assert called == [], "Callback should wait for the burst to settle"
+    time.sleep(0.5)
+    assert called == ["standard.pdf"]
+
+def test_monitor_handler_serializes_callbacks():
+    """
+    Tests that callbacks for files settling together run one at a time, even across handlers.
+    """
+    active, peak = [0], [0]
+    def callback(path):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        time.sleep(0.2)
+        active[0] -= 1
+    handlers = [FileMonitorHandler(callback, delay=0.1), FileMonitorHandler(callback, delay=0.1)]
+    for handler, path in zip(handlers, ["standard.pdf", "requirements.csv"]):
+        handler.on_created(SimpleNamespace(is_directory=False, src_path=path))
+    time.sleep(0.8)
+    assert peak[0] == 1, "Callbacks should not overlap"
@@ -0,0 +1,49 @@
+"""
+This file contains unit tests for the llm_cache and stub_llm modules, ensuring repeated prompts are
+answered from the cache instead of invoking the LLM again.
+
+file path: esg_engine/tests/test_llm_cache.py
+"""
+
+import pytest
+from utils.llm_cache import invoke_cached, clear_llm_cache, llm_key
+from utils.stub_llm import StubLLM
+
+class CountingLLM:
+    """Minimal LLM stand-in that counts invocations."""
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return f"response {self.calls}"
+
+def test_invoke_cached():
+    """
+    Tests that identical prompts hit the cache and distinct prompts do not.
+    """
+    clear_llm_cache()
+    llm = CountingLLM()
+    
+    assert invoke_cached(llm, "Validate emissions") == "response 1"
+    assert invoke_cached(llm, "Validate emissions") == "response 1"
+    assert invoke_cached(llm, "Validate water usage") == "response 2"
+    assert llm.calls == 2
+    
+    clear_llm_cache()
+    assert invoke_cached(llm, "Validate emissions") == "response 3"
+
+def test_llm_key():
+    """
+    Tests that LLMs are identified by configuration rather than object identity.
+    """
+    assert llm_key(StubLLM(responses=["Compliant"])) == llm_key(StubLLM(responses=["Compliant"]))
+    assert llm_key(StubLLM(responses=["Compliant"])) != llm_key(StubLLM(responses=[""]))
+    assert llm_key(StubLLM(responses=["Compliant"])) != llm_key(CountingLLM())
+
+def test_stub_llm():
+    """
+    Tests that the stub LLM cycles through its canned responses.
+    """
+    llm = StubLLM(responses=["Compliant", "Non-compliant"])
+    assert [llm.invoke("prompt") for _ in range(3)] == ["Compliant", "Non-compliant", "Compliant"]
@@ -0,0 +1,60 @@
+"""
+This file contains unit tests for the metadata_store module, ensuring a columnar table reads back
+the same rows as the list of metadata dictionaries it was built from.
+
+file path: esg_engine/tests/test_metadata_store.py
+"""
+
+import pickle
+from utils.metadata_store import MetadataTable
+
+def test_metadata_table_rows():
+    """
+    Tests row access, columns, and pickling of a table built from metadata dictionaries.
+    """
+    records = [
+        {"document_name": "ifrs_s1.pdf", "page_number": 1, "sentence": "Entities shall disclose risks.", "type": "standard"},
+        {"document_name": "UNEP_requirements.csv", "page_number": 0, "sentence": "Emissions: Report scope 1.", "type": "requirement"}
+    ]
+    table = pickle.loads(pickle.dumps(MetadataTable.from_records(records), protocol=pickle.HIGHEST_PROTOCOL))
+    assert len(table) == 2
+    assert table[1] == records[1]
+    assert table[-1] == records[1]
+    assert list(table) == records
+    assert table.column("type") == ["standard", "requirement"]
+    
+    table[0]["sentence"] = "changed"
+    assert table[0]["sentence"] == records[0]["sentence"], "Rows should be copies"
+    assert len(MetadataTable.from_records([])) == 0
+
+def test_metadata_table_arrays():
+    """
+    Tests that column arrays select rows by mask and are not stored in the pickle.
+    """
+    import numpy as np
+    table = MetadataTable.from_records([
+        {"document_name": "ifrs_s1.pdf", "type": "standard"},
+        {"document_name": "UNEP_requirements.csv", "type": "requirement"},
+        {"document_name": "UNCTAD_requirements.csv", "type": "requirement"}
+    ])
+    hits = np.array([2, 0, 1])
+    keep = (table.array("type")[hits] == "requirement") & (table.array("document_name")[hits] == "UNEP_requirements.csv")
+    assert hits[keep].tolist() == [1]
+    assert table.take([2, 0]) == [table[2], table[0]]
+    assert table.array("type") is table.array("type"), "Arrays should be converted once"
+    assert "_arrays" not in pickle.loads(pickle.dumps(table)).__dict__
+
+def test_metadata_table_replaced():
+    """
+    Tests that replacing rows blanks removed ids in place and appends new rows after them.
+    """
+    table = MetadataTable.from_records([
+        {"document_name": "ifrs_s1.pdf", "sentence": "a"},
+        {"document_name": "ifrs_s2.pdf", "sentence": "b"}
+    ])
+    updated = table.replaced([0], [{"document_name": "ifrs_s1.pdf", "sentence": "c", "type": "standard"}])
+    assert len(updated) == 3
+    assert updated[0] == {"document_name": None, "sentence": None, "type": None}
+    assert updated[1] == {"document_name": "ifrs_s2.pdf", "sentence": "b", "type": None}
+    assert updated[2] == {"document_name": "ifrs_s1.pdf", "sentence": "c", "type": "standard"}
+    assert table[0]["sentence"] == "a", "The original table should be unchanged"
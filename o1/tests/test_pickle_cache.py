@@ -0,0 +1,31 @@
+"""
+This file contains unit tests for the pickle_cache module, ensuring cached files are unpickled
+once and reloaded after they change.
+
+file path: esg_engine/tests/test_pickle_cache.py
+"""
+
+import os
+import pickle
+from utils.pickle_cache import load_pickle, clear_pickle_cache
+
+def test_load_pickle(tmp_path):
+    """
+    Tests that an unchanged file is served from memory and a rewritten file is reloaded.
+    """
+    path = tmp_path / "metadata.pkl"
+    with open(path, "wb") as f:
+        pickle.dump([{"sentence": "first"}], f)
+    
+    first = load_pickle(str(path))
+    assert first == [{"sentence": "first"}]
+    assert load_pickle(str(path)) is first, "Unchanged file should not be unpickled again"
+    
+    with open(path, "wb") as f:
+        pickle.dump([{"sentence": "second"}, {"sentence": "third"}], f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_pickle(str(path)) == [{"sentence": "second"}, {"sentence": "third"}], "Changed file should be reloaded"
+    
+    clear_pickle_cache()
+    assert load_pickle(str(path)) is not first
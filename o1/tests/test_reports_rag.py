@@ -46,6 +46,22 @@ def test_index_report():
     # Check resource usage
     assert check_resources(), "Resource usage exceeded 45% limit"
 
+def test_index_report_skips_unchanged(monkeypatch):
+    """
+    Tests that indexing the same report again reuses the index without extracting text.
+    """
+    from rag.reports_rag import indexer
+    settings = get_settings()
+    report_path = os.path.join(settings["data_paths"]["reports"], "btg-pactual.pdf")
+    if not os.path.exists(report_path):
+        pytest.skip("btg-pactual.pdf not found in data/reports/")
+    assert index_report(report_path), "Indexing failed"
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("Unchanged report should not be re-extracted")
+    monkeypatch.setattr(indexer, "extract_pdf_text", fail)
+    assert index_report(report_path), "Unchanged report should be reported as indexed"
+
 def test_search_report():
     """
     Tests concurrent searching of the FAISS index with multiple criteria.
@@ -9,8 +9,9 @@ import pytest
 import os
 import pandas as pd
 import time
-from rag.requirements_rag.parser import parse_requirements
-from rag.requirements_rag.searcher import search_requirements
+import rag.requirements_rag.parser as parser
+from rag.requirements_rag.parser import parse_requirements, reindex_requirements_file
+from rag.requirements_rag.searcher import search_requirements, search_requirements_batch
 from rag.requirements_rag.updater import update_requirements
 from config.settings import get_settings
 from utils.resource_monitor import check_resources
@@ -131,4 +132,80 @@ def test_update_requirements(tmp_path):
     with open(metadata_path, "rb") as f:
         import pickle
         metadata = pickle.load(f)
-    assert any(m["app_name"] == "new_requirements.csv" for m in metadata), "New CSV not indexed"
\ No newline at end of file
+    assert any(m["app_name"] == "new_requirements.csv" for m in metadata), "New CSV not indexed"
+
+def test_reindex_requirements_file(tmp_path, monkeypatch):
+    """
+    Tests that reindexing one edited CSV replaces only its rows and keeps metadata aligned with ids.
+    """
+    requirements_dir = tmp_path / "requirements"
+    requirements_dir.mkdir()
+    monkeypatch.setitem(parser.settings["data_paths"], "requirements", str(requirements_dir))
+    
+    pd.DataFrame({
+        "category": ["Environment"],
+        "criterion": ["Emissions Reporting"],
+        "description": ["Report annual carbon emissions."]
+    }).to_csv(requirements_dir / "a.csv", index=False)
+    pd.DataFrame({
+        "category": ["Governance"],
+        "criterion": ["Board Diversity"],
+        "description": ["Ensure 30% diverse board members."]
+    }).to_csv(requirements_dir / "b.csv", index=False)
+    assert parse_requirements(), "Parsing failed"
+    
+    pd.DataFrame({
+        "category": ["Governance", "Governance"],
+        "criterion": ["Board Independence", "Executive Pay"],
+        "description": ["Disclose independent directors.", "Disclose executive remuneration."]
+    }).to_csv(requirements_dir / "b.csv", index=False)
+    assert reindex_requirements_file(str(requirements_dir / "b.csv")), "Reindex failed"
+    
+    import pickle
+    import faiss
+    with open(requirements_dir / "metadata.pkl", "rb") as f:
+        metadata = pickle.load(f)
+    live = [m for m in metadata if m["document_name"] is not None]
+    assert sorted(m["criterion"] for m in live) == ["Board Independence", "Emissions Reporting", "Executive Pay"]
+    index = faiss.read_index(str(requirements_dir / "index.faiss"))
+    assert index.ntotal == len(live), "Index should hold one vector per live metadata entry"
+
+def test_search_requirements_batch():
+    """
+    Tests that a batched search returns the same results as searching each query alone.
+    """
+    settings = get_settings()
+    standards_dir = settings["data_paths"]["standards"]
+    if not os.path.exists(os.path.join(standards_dir, "index.faiss")):
+        pytest.skip("Standards index not found in data/standards/")
+    
+    queries = ["emissions reporting", "", "board diversity"]
+    batched = search_requirements_batch(queries, k=5)
+    assert len(batched) == len(queries), "Expected one result list per query"
+    for query, results in zip(queries, batched):
+        assert results == search_requirements(query, k=5)
+
+def test_parse_single_csv_embeds_duplicates_once(tmp_path, monkeypatch):
+    """
+    Tests that repeated row texts are embedded once and every row still gets its own vector.
+    """
+    import numpy as np
+    calls = []
+    
+    def fake_embed(texts):
+        calls.append(list(texts))
+        return np.arange(len(texts) * 4, dtype=np.float32).reshape(len(texts), 4)
+    
+    monkeypatch.setattr(parser, "embed_texts", fake_embed)
+    csv_path = tmp_path / "dup.csv"
+    pd.DataFrame({
+        "category": ["Environment", "Environment", "Governance"],
+        "criterion": ["Emissions Reporting", "Emissions Reporting", "Board Diversity"],
+        "description": ["Report annual carbon emissions.", "Report annual carbon emissions.", None]
+    }).to_csv(csv_path, index=False)
+    
+    embeddings, metadata = parser.parse_single_csv(str(csv_path))
+    assert calls == [["Emissions Reporting Report annual carbon emissions.", "Board Diversity"]]
+    assert embeddings.shape == (3, 4) and len(metadata) == 3
+    assert np.array_equal(embeddings[0], embeddings[1]), "Duplicate rows should share one vector"
+    assert metadata[2]["sentence"] == "Board Diversity"
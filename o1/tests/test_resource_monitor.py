@@ -7,7 +7,7 @@ file path: esg_engine/tests/test_resource_monitor.py
 
 import pytest
 import os
-from utils.resource_monitor import check_resources
+from utils.resource_monitor import check_resources, resource_snapshot
 from utils.pdf_processing import extract_pdf_text
 from config.settings import get_settings
 
@@ -25,4 +25,11 @@ def test_check_resources_btg_pactual():
     extract_pdf_text(pdf_path)
     
     # Check resources
-    assert check_resources(is_server=False), "Resource usage exceeded 45% limit"
\ No newline at end of file
+    assert check_resources(is_server=False), "Resource usage exceeded 45% limit"
+
+def test_resource_snapshot_reused():
+    """
+    Tests that back-to-back checks share one memory and disk reading.
+    """
+    first = resource_snapshot()
+    assert resource_snapshot()[0] is first[0], "Readings within the snapshot window should be reused"
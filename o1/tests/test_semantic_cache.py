@@ -0,0 +1,27 @@
+"""
+This file contains unit tests for the semantic_cache module, ensuring near-duplicate
+embeddings reuse cached values and dissimilar ones do not.
+
+file path: esg_engine/tests/test_semantic_cache.py
+"""
+
+import pytest
+import numpy as np
+from utils.semantic_cache import SemanticCache
+
+def test_semantic_cache_lookup():
+    """
+    Tests hits for identical and near-identical embeddings and misses for unrelated ones.
+    """
+    rng = np.random.default_rng(0)
+    cache = SemanticCache(384)
+    embedding = rng.standard_normal(384).astype(np.float32)
+    cache.store(embedding, ["match"])
+    
+    assert cache.lookup(embedding) == ["match"]
+    assert cache.lookup(embedding * 2.0) == ["match"], "Scaling should not affect cosine lookup"
+    assert cache.lookup(-embedding) is None
+    assert cache.lookup(rng.standard_normal(384)) is None
+    
+    cache.clear()
+    assert cache.lookup(embedding) is None
@@ -8,8 +8,9 @@ import pytest
 import os
 import time
 from rag.standards_rag.indexer import index_standards
-from rag.standards_rag.searcher import search_standards
+from rag.standards_rag.searcher import search_standards, search_standards_batch
 from rag.standards_rag.updater import update_standards
+from rag.standards_rag.cache import cached_search_standards, clear_standards_cache, compute_standards_version
 from config.settings import get_settings
 from utils.resource_monitor import check_resources
 import pickle
@@ -48,15 +49,10 @@ def test_index_standards():
     # Verify resources
     assert check_resources()["compliant"], "Resource usage exceeded limit"
 
-def test_search_standards():
+def test_search_standards(standards_index, tmp_path, monkeypatch):
     """
     Tests searching standards with and without document filtering.
     """
-    settings = get_settings()
-    standards_dir = settings["data_paths"]["standards"]
-
-    assert index_standards(), "Indexing failed"
-
     query = "sustainability reporting requirements"
     start_time = time.time()
     results = search_standards(query, document_filter="ifrs_s1.pdf", k=5)
@@ -70,10 +66,66 @@ def test_search_standards():
     results = search_standards("")
     assert results == [], "Empty query should return empty results"
 
-    os.remove(os.path.join(standards_dir, "index.faiss"))
+    # Point the searcher at an empty directory rather than deleting the shared index
+    import rag.standards_rag.searcher as searcher
+    settings = get_settings()
+    settings["data_paths"]["standards"] = str(tmp_path)
+    monkeypatch.setattr(searcher, "get_settings", lambda: settings)
     results = search_standards(query)
     assert results == [], "Missing index should return empty results"
 
+def test_search_standards_batch(standards_index):
+    """
+    Tests that batched standards search returns one filtered result list per query, in order.
+    """
+
+    queries = ["sustainability reporting requirements", "", "climate-related risks"]
+    results = search_standards_batch(queries, document_filter="ifrs_s1.pdf", k=5)
+    assert len(results) == len(queries)
+    assert results[1] == [], "Empty query should return empty results"
+    assert all(res["document_name"] == "ifrs_s1.pdf" for query_results in results for res in query_results), "Filter not applied"
+
+def test_cached_search_standards(standards_index):
+    """
+    Tests that cached standards retrievals match direct searches and survive until cleared.
+    """
+    clear_standards_cache()
+
+    query = "sustainability reporting requirements"
+    expected = search_standards(query, document_filter="ifrs_s1.pdf", k=5)
+    assert cached_search_standards(query, document_filter="ifrs_s1.pdf", k=5) == expected
+    assert cached_search_standards(query, document_filter="ifrs_s1.pdf", k=5) == expected, "Cached result should match"
+
+    # Mutating a returned result must not leak into the cache
+    cached = cached_search_standards(query, document_filter="ifrs_s1.pdf", k=5)
+    cached.append({"sentence": "mutated"})
+    cached[0]["sentence"] = "mutated"
+    assert cached_search_standards(query, document_filter="ifrs_s1.pdf", k=5) == expected
+
+    clear_standards_cache()
+    assert cached_search_standards(query, document_filter="ifrs_s1.pdf", k=5) == expected
+
+def test_standards_version_tracks_sources(tmp_path, monkeypatch):
+    """
+    Tests that the standards version changes when a requirements CSV or the index file changes.
+    """
+    import rag.standards_rag.cache as cache
+    standards_dir, requirements_dir = tmp_path / "standards", tmp_path / "requirements"
+    standards_dir.mkdir()
+    requirements_dir.mkdir()
+    monkeypatch.setitem(cache.settings, "data_paths", {"standards": str(standards_dir), "requirements": str(requirements_dir)})
+
+    (standards_dir / "ifrs_s1.pdf").write_bytes(b"%PDF")
+    version = compute_standards_version()
+    assert compute_standards_version() == version, "Unchanged sources should keep the version"
+
+    (requirements_dir / "UNCTAD_requirements.csv").write_text("category,criterion\n")
+    csv_version = compute_standards_version()
+    assert csv_version != version, "A new requirements CSV should change the version"
+
+    (standards_dir / "index.faiss").write_bytes(b"index")
+    assert compute_standards_version() != csv_version, "A rebuilt index should change the version"
+
 def test_update_standards():
     """
     Tests updating the FAISS index when a new standard is added.
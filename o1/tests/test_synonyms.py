@@ -0,0 +1,23 @@
+"""
+This file contains unit tests for the synonyms module, ensuring the inverted index expands a word
+to the same terms as scanning every synonym group.
+
+file path: esg_engine/tests/test_synonyms.py
+"""
+
+from utils.synonyms import SYNONYMS, WORD_TO_SYNONYMS
+
+def test_word_to_synonyms_matches_group_scan():
+    """
+    Tests that each word expands to the union of every group that contains it.
+    """
+    for word in WORD_TO_SYNONYMS:
+        expected = set()
+        for key, synonyms in SYNONYMS.items():
+            if word in (key, *synonyms):
+                expected.update([key] + synonyms)
+        assert WORD_TO_SYNONYMS[word] == expected, f"Wrong expansion for '{word}'"
+    
+    # Words in several groups collect all of them
+    assert {"revenue", "profit"} <= WORD_TO_SYNONYMS["earnings"]
+    assert "unknown" not in WORD_TO_SYNONYMS
@@ -7,7 +7,7 @@ file path: esg_engine/tests/test_text_processing.py
 
 import pytest
 from utils.pdf_processing import extract_pdf_text
-from utils.text_processing import tokenize_and_embed
+from utils.text_processing import tokenize_and_embed, content_tokens, split_sentences, pipe_processes, PARALLEL_MIN_TEXTS
 from config.settings import get_settings
 import os
 import numpy as np
@@ -42,4 +42,28 @@ def test_tokenize_and_embed_empty():
     """
     pages = [{"page_number": 1, "text": ""}]
     results = tokenize_and_embed(pages)
-    assert results == []
\ No newline at end of file
+    assert results == []
+
+def test_split_sentences():
+    """
+    Tests that each text is split into its stripped sentences, in input order.
+    """
+    sentences = list(split_sentences(["Emissions fell by 10%. Water use rose.", "   ", "One sentence"]))
+    assert sentences == [["Emissions fell by 10%.", "Water use rose."], [], ["One sentence"]]
+
+def test_content_tokens():
+    """
+    Tests batched POS filtering with the parser and NER disabled.
+    """
+    tokens = content_tokens(["The company reduced carbon emissions.", ""])
+    assert len(tokens) == 2
+    assert {"company", "emissions"} <= tokens[0], "Nouns should be kept"
+    assert "the" not in {token.lower() for token in tokens[0]}, "Determiners should be dropped"
+    assert tokens[1] == set()
+
+def test_pipe_processes_small_batch():
+    """
+    Tests that batches below the parallel threshold are always processed in-process.
+    """
+    assert pipe_processes(0) == 1
+    assert pipe_processes(PARALLEL_MIN_TEXTS - 1) == 1
@@ -6,9 +6,12 @@ file path: esg_engine/tests/test_vector_utils.py
 """
 
 import pytest
+import faiss
+import pickle
 import numpy as np
 import os
-from utils.vector_utils import initialize_index, add_to_index, search_index
+import utils.vector_utils as vector_utils
+from utils.vector_utils import EmbeddingSpool, build_index, read_index, index_factory_string, initialize_index, add_to_index, search_index, search_index_batch, build_similarity_index, search_similarity_index, search_similarity_index_batch, cosine_similarities, cosine_similarity_matrix, top_k_similar, top_k_similar_batch
 from utils.pdf_processing import extract_pdf_text
 from utils.text_processing import tokenize_and_embed
 from config.settings import get_settings
@@ -48,4 +51,133 @@ def test_vector_operations_btg_pactual(tmp_path):
     query_embedding = results[0]["embedding"]
     search_results = search_index(index, query_embedding, metadata_path, k=2)
     assert len(search_results) <= 2, "Unexpected number of search results"
-    assert all("sentence" in res and "page_number" in res and "distance" in res for res in search_results)
\ No newline at end of file
+    assert all("sentence" in res and "page_number" in res and "distance" in res for res in search_results)
+
+def test_search_index_batch(tmp_path):
+    """
+    Tests that a batched search returns one result list per query, in query order.
+    """
+    index_path = str(tmp_path / "test_index.faiss")
+    metadata_path = str(tmp_path / "test_metadata.pkl")
+    dimension = 384
+    
+    embeddings = np.random.rand(10, dimension).astype(np.float32)
+    metadata = [{"sentence": f"sentence {i}", "page_number": 1} for i in range(10)]
+    index = initialize_index(dimension, index_path)
+    add_to_index(index, embeddings, metadata, metadata_path, index_path)
+    
+    batch_results = search_index_batch(index, embeddings[[3, 7]], metadata_path, k=2)
+    assert len(batch_results) == 2
+    assert batch_results[0][0]["sentence"] == "sentence 3"
+    assert batch_results[1][0]["sentence"] == "sentence 7"
+    assert search_index_batch(index, np.empty((0, dimension)), metadata_path) == []
+    assert search_index(index, embeddings[[3, 7]], metadata_path, k=2) == batch_results
+
+def test_similarity_index_top_k():
+    """
+    Tests that the similarity index returns the most cosine-similar vectors first.
+    """
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((100, 384)).astype(np.float32)
+    index = build_similarity_index(embeddings)
+    assert index.ntotal == 100, "Index should contain every embedding"
+    
+    hits = search_similarity_index(index, embeddings[42] * 3.0, k=5)
+    assert len(hits) == 5, "Expected k candidates"
+    assert hits[0][0] == 42, "Query vector should be its own nearest neighbour"
+    assert abs(hits[0][1] - 1.0) < 1e-4, "Cosine similarity with itself should be 1"
+    assert all(a[1] >= b[1] for a, b in zip(hits, hits[1:])), "Candidates should be sorted by similarity"
+
+def test_cosine_similarities():
+    """
+    Tests vectorized cosine similarity against a direct per-pair computation.
+    """
+    rng = np.random.default_rng(1)
+    query = rng.standard_normal(384).astype(np.float32)
+    embeddings = rng.standard_normal((10, 384)).astype(np.float32)
+    
+    similarities = cosine_similarities(query, embeddings)
+    expected = [float(e @ query / (np.linalg.norm(e) * np.linalg.norm(query))) for e in embeddings]
+    assert similarities.shape == (10,), "Expected one similarity per embedding"
+    assert np.allclose(similarities, expected, atol=1e-5), "Similarities should match per-pair cosine"
+    assert cosine_similarities(query, np.empty((0, 384), dtype=np.float32)).shape == (0,), "Empty matrix should give no similarities"
+
+def test_cosine_similarity_matrix():
+    """
+    Tests that the batched similarity matrix matches row-by-row cosine similarities.
+    """
+    rng = np.random.default_rng(2)
+    queries = rng.standard_normal((3, 384)).astype(np.float32)
+    embeddings = rng.standard_normal((7, 384)).astype(np.float32)
+    
+    matrix = cosine_similarity_matrix(queries, embeddings)
+    assert matrix.shape == (3, 7), "Expected one row per query and one column per embedding"
+    for query, row in zip(queries, matrix):
+        assert np.allclose(row, cosine_similarities(query, embeddings), atol=1e-5)
+
+def test_top_k_similar():
+    """
+    Tests exact top-k search over a subset of embeddings.
+    """
+    rng = np.random.default_rng(3)
+    embeddings = rng.standard_normal((20, 384)).astype(np.float32)
+    
+    hits = top_k_similar(embeddings[7], embeddings, k=4)
+    assert len(hits) == 4
+    assert hits[0][0] == 7, "Query vector should rank first"
+    assert all(a[1] >= b[1] for a, b in zip(hits, hits[1:])), "Hits should be sorted by similarity"
+    assert top_k_similar(embeddings[0], embeddings[:2], k=5) == top_k_similar(embeddings[0], embeddings[:2], k=2)
+    assert top_k_similar(embeddings[0], embeddings[:0], k=5) == []
+
+def test_batched_top_k_matches_single():
+    """
+    Tests that batched index search and batched exact top-k agree with their per-query forms.
+    """
+    rng = np.random.default_rng(4)
+    embeddings = rng.standard_normal((30, 384)).astype(np.float32)
+    queries = embeddings[[3, 11, 25]]
+    index = build_similarity_index(embeddings)
+    
+    batched = search_similarity_index_batch(index, queries, k=5)
+    assert [[row for row, _ in hits] for hits in batched] == [[row for row, _ in search_similarity_index(index, query, k=5)] for query in queries]
+    exact = top_k_similar_batch(queries, embeddings, k=5)
+    assert [[row for row, _ in hits] for hits in exact] == [[row for row, _ in top_k_similar(query, embeddings, k=5)] for query in queries]
+    assert top_k_similar_batch(queries, embeddings[:0], k=5) == [[], [], []]
+
+def test_build_index_ivf_ids_match_rows(tmp_path, monkeypatch):
+    """
+    Tests that a trained IVF index returns metadata row positions and is read back with nprobe set.
+    """
+    monkeypatch.setitem(vector_utils.INDEXING, "nlist", 8)
+    monkeypatch.setitem(vector_utils.INDEXING, "ivf_min_vectors", 100)
+    monkeypatch.setitem(vector_utils.INDEXING, "codec", "SQfp16")
+    assert index_factory_string(50) == "SQfp16"
+    assert index_factory_string(500) == "IVF8,SQfp16"
+    
+    rng = np.random.default_rng(5)
+    embeddings = rng.standard_normal((500, 384)).astype(np.float32)
+    metadata_path = str(tmp_path / "test_metadata.pkl")
+    index_path = str(tmp_path / "test_index.faiss")
+    index = build_index(embeddings, index_path)
+    metadata = [{"sentence": f"sentence {i}"} for i in range(500)]
+    with open(metadata_path, "wb") as f:
+        pickle.dump(metadata, f)
+    
+    loaded = read_index(index_path)
+    assert loaded.ntotal == 500
+    assert faiss.extract_index_ivf(loaded).nprobe == vector_utils.INDEXING["nprobe"]
+    results = search_index_batch(loaded, embeddings[[17, 321]], metadata_path, k=1)
+    assert [hits[0]["sentence"] for hits in results] == ["sentence 17", "sentence 321"]
+
+def test_embedding_spool_roundtrip(tmp_path):
+    """
+    Tests that spooled batches read back in order as one memory-mapped matrix and the spool is removed.
+    """
+    rng = np.random.default_rng(6)
+    batches = [rng.standard_normal((n, 384)).astype(np.float32) for n in (3, 0, 5)]
+    spool_path = tmp_path / "embeddings.spool"
+    with EmbeddingSpool(str(spool_path)) as spool:
+        for batch in batches:
+            spool.append(batch)
+        assert np.array_equal(spool.array(), np.concatenate(batches))
+    assert not spool_path.exists(), "Spool file should be removed"
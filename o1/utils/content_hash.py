@@ -0,0 +1,40 @@
+"""
+This module fingerprints ESG Engine input files by content. A SHA-256 digest identifies a version
+of a file independently of its modification time, so caches keyed on it (the extraction store, the
+reports index sidecar) stay valid when a file is touched but not edited. Each file version is hashed
+once per process and the digest shared by every caller.
+
+file path: esg_engine/utils/content_hash.py
+"""
+
+import os
+import hashlib
+from functools import lru_cache
+
+# Read size for the fallback digest loop on Python versions without hashlib.file_digest
+CHUNK_SIZE = 1 << 20
+
+@lru_cache(maxsize=64)
+def _digest(path, mtime_ns, size):
+    """Hashes a file's contents; memoized on its path, modification time, and size."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+def file_digest(path):
+    """
+    Returns the SHA-256 digest of a file's contents, streaming the file instead of reading it into
+    memory at once and hashing each file version once per process.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    stat = os.stat(path)
+    return _digest(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
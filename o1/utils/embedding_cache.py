@@ -0,0 +1,239 @@
+"""
+This module provides a persistent on-disk embedding cache for the ESG Engine. Embeddings are stored
+in a SQLite database as symmetric int8 vectors with a per-vector float32 scale (a quarter of the raw
+float32 size), keyed by SHA-256 of the model name and text, so repeated criteria and queries are
+embedded once and reused across runs. Changing the model name invalidates all entries without
+touching the database. Indexers record the keys each source file uses, so entries only an
+earlier version of an edited file used are pruned.
+
+file path: esg_engine/utils/embedding_cache.py
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from config.settings import OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+# Cache location; this cache survives workflow runs and report cleanup
+CACHE_PATH = OUTPUT_DIR / "emb_cache.db"
+
+# In-process LRU tier in front of SQLite, keyed like the database rows. Entries are held as int8
+# (about 400 bytes each at 384 dimensions), so a whole standards corpus fits and every unique
+# sentence is encoded at most once per process; override with ESG_EMBEDDING_MEMORY_ENTRIES
+MEMORY_ENTRIES = int(os.environ.get("ESG_EMBEDDING_MEMORY_ENTRIES", "100000"))
+
+_connection = None
+_lock = threading.Lock()
+_memory = OrderedDict()
+
+def _get_connection():
+    """Opens the cache database once per process and creates the table if needed."""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute("CREATE TABLE IF NOT EXISTS embeddings_q8 (key TEXT PRIMARY KEY, scale REAL, vector BLOB)")
+        # Keys used by each indexed source file's latest version, for pruning edited files
+        _connection.execute("CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, mtime_ns INTEGER, keys TEXT)")
+        _connection.commit()
+    return _connection
+
+def quantize(vector):
+    """
+    Quantizes an embedding to int8 with a symmetric per-vector scale.
+
+    Args:
+        vector (np.ndarray): Float embedding.
+
+    Returns:
+        tuple: (np.ndarray of int8, float scale).
+    """
+    scale = float(np.max(np.abs(vector))) / 127 if len(vector) else 0.0
+    if scale == 0.0:
+        return np.zeros(len(vector), dtype=np.int8), 0.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+def dequantize(quantized, scale):
+    """
+    Restores a float32 embedding from its int8 values and scale.
+
+    Args:
+        quantized (np.ndarray): Int8 embedding.
+        scale (float): Scale returned by quantize.
+
+    Returns:
+        np.ndarray: Float32 embedding.
+    """
+    return quantized.astype(np.float32) * np.float32(scale)
+
+def quantize_matrix(matrix):
+    """
+    Quantizes each row of an embedding matrix like quantize, in one vectorized pass.
+
+    Args:
+        matrix (np.ndarray): Float embeddings of shape (n, dimension).
+
+    Returns:
+        tuple: (np.ndarray of int8 with the same shape, float32 np.ndarray of n row scales).
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    scales = np.abs(matrix).max(axis=1, initial=0.0) / 127
+    safe = np.where(scales == 0.0, 1.0, scales)
+    return np.round(matrix / safe[:, None]).astype(np.int8), scales.astype(np.float32)
+
+def dequantize_matrix(quantized, scales):
+    """
+    Restores a float32 embedding matrix from int8 rows and their scales.
+
+    Args:
+        quantized (np.ndarray): Int8 embeddings of shape (n, dimension).
+        scales (np.ndarray): Row scales returned by quantize_matrix.
+
+    Returns:
+        np.ndarray: Float32 embeddings of shape (n, dimension).
+    """
+    return quantized.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+def cache_key(text, model_name):
+    """
+    Builds the cache key for a text embedded by a given model.
+
+    Args:
+        text (str): Text that was embedded.
+        model_name (str): Embedding model identifier.
+
+    Returns:
+        str: Hex SHA-256 digest of the model name and text.
+    """
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+def get_or_compute_many(texts, embed_fn, model_name):
+    """
+    Returns embeddings for a list of texts, computing only those missing from the cache
+    with a single call to embed_fn and storing them for later runs.
+
+    Args:
+        texts (list): Texts to embed.
+        embed_fn (callable): Function mapping a list of texts to an (n, dimension) array.
+        model_name (str): Embedding model identifier, part of the cache key.
+
+    Returns:
+        np.ndarray: Float32 array of shape (len(texts), dimension), in input order.
+    """
+    keys = [cache_key(text, model_name) for text in texts]
+    # (int8 vector, scale) per key, from memory, SQLite, or a fresh encode
+    vectors = {}
+
+    with _lock:
+        for key in keys:
+            if key in _memory:
+                _memory.move_to_end(key)
+                vectors[key] = _memory[key]
+
+    try:
+        with _lock:
+            conn = _get_connection()
+            unique_keys = [key for key in dict.fromkeys(keys) if key not in vectors]
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key, scale, vector FROM embeddings_q8 WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, scale, blob in rows:
+                    vectors[key] = (np.frombuffer(blob, dtype=np.int8), scale)
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache read failed: {str(e)}")
+
+    # Embed misses in one batch, preserving first-seen order
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors and key not in missing:
+            missing[key] = text
+    if missing:
+        computed = np.asarray(embed_fn(list(missing.values())), dtype=np.float32)
+        for key, vector in zip(missing, computed):
+            # Serve the dequantized vector so fresh and cached embeddings are identical
+            vectors[key] = quantize(vector)
+        try:
+            with _lock:
+                conn = _get_connection()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings_q8 (key, scale, vector) VALUES (?, ?, ?)",
+                    [(key, vectors[key][1], vectors[key][0].tobytes()) for key in missing]
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache write failed: {str(e)}")
+
+    with _lock:
+        for key in dict.fromkeys(keys):
+            _memory[key] = vectors[key]
+            _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+    logger.info(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+    return np.stack([dequantize(*vectors[key]) for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+
+def get_or_compute(text, embed_fn, model_name):
+    """
+    Returns the embedding for a single text, computing and caching it on a miss.
+
+    Args:
+        text (str): Text to embed.
+        embed_fn (callable): Function mapping a list of texts to an (n, dimension) array.
+        model_name (str): Embedding model identifier, part of the cache key.
+
+    Returns:
+        np.ndarray: Float32 embedding vector.
+    """
+    return get_or_compute_many([text], embed_fn, model_name)[0]
+
+def record_source(path, texts, model_name):
+    """
+    Records the cache keys a source file's current version uses and deletes the entries that only
+    its previous version used, so rows removed from an edited file do not stay in the cache.
+
+    Args:
+        path (str): Path to the indexed source file.
+        texts (list): Texts embedded from the file's current version.
+        model_name (str): Embedding model identifier, part of the cache key.
+
+    Returns:
+        int: Number of pruned entries.
+    """
+    keys = {cache_key(text, model_name) for text in texts}
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    try:
+        with _lock:
+            conn = _get_connection()
+            row = conn.execute("SELECT keys FROM sources WHERE path = ?", (path,)).fetchone()
+            stale = set(row[0].split()) - keys if row else set()
+            if stale:
+                # Keep entries another source still uses
+                for (other_keys,) in conn.execute("SELECT keys FROM sources WHERE path != ?", (path,)):
+                    stale.difference_update(other_keys.split())
+            conn.execute("INSERT OR REPLACE INTO sources (path, mtime_ns, keys) VALUES (?, ?, ?)",
+                         (path, mtime_ns, " ".join(sorted(keys))))
+            stale = list(stale)
+            for start in range(0, len(stale), 500):
+                chunk = stale[start:start + 500]
+                conn.execute(f"DELETE FROM embeddings_q8 WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            conn.commit()
+            for key in stale:
+                _memory.pop(key, None)
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache source update failed for {path}: {str(e)}")
+        return 0
+    if stale:
+        logger.info(f"Embedding cache: pruned {len(stale)} entries no longer used by {path}")
+    return len(stale)
@@ -0,0 +1,97 @@
+"""
+This module tracks which source files an ESG Engine index was built from. A manifest is a small
+JSON file next to the index mapping each source filename to the modification time and size it had
+when indexed, so a reparse can compare one os.scandir listing against it and skip files that have
+not changed instead of reading and embedding them again.
+
+file path: esg_engine/utils/file_manifest.py
+"""
+
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+def scan_files(directory, suffix):
+    """
+    Lists a directory's files with one suffix and their stat signatures, reading the stat
+    information from a single os.scandir pass.
+
+    Args:
+        directory (str): Directory to scan.
+        suffix (str): File suffix to keep, e.g. ".csv".
+
+    Returns:
+        dict: Filename mapped to [mtime_ns, size].
+    """
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix) and entry.is_file():
+                stat = entry.stat()
+                files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return files
+
+def changed_files(files, manifest):
+    """
+    Compares a scan_files listing with a manifest.
+
+    Args:
+        files (dict): Current listing from scan_files.
+        manifest (dict): Filename mapped to its recorded entry.
+
+    Returns:
+        list: Names of new or modified files, followed by names of deleted files.
+    """
+    changed = [name for name, signature in files.items()
+               if name not in manifest or [manifest[name]["mtime_ns"], manifest[name]["size"]] != signature]
+    return changed + [name for name in manifest if name not in files]
+
+def manifest_entry(signature, rows):
+    """
+    Builds the manifest entry for one indexed file.
+
+    Args:
+        signature (list): [mtime_ns, size] from scan_files, taken before the file was read.
+        rows (int): Number of index entries built from the file.
+
+    Returns:
+        dict: Entry with mtime_ns, size, and rows.
+    """
+    return {"mtime_ns": signature[0], "size": signature[1], "rows": rows}
+
+def load_manifest(manifest_path):
+    """
+    Loads a manifest, treating a missing or unreadable file as empty.
+
+    Args:
+        manifest_path (str): Path to the manifest JSON.
+
+    Returns:
+        dict: Filename mapped to its entry.
+    """
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_path}: {str(e)}")
+        return {}
+
+def save_manifest(manifest_path, manifest):
+    """
+    Writes a manifest atomically, so an interrupted write never leaves a partial file.
+
+    Args:
+        manifest_path (str): Path to the manifest JSON.
+        manifest (dict): Filename mapped to its entry.
+
+    Returns:
+        None
+    """
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
@@ -1,63 +1,122 @@
 """
 This module provides file monitoring functionality for the ESG Engine, using watchdog to detect
-file changes in specified directories.
+file changes in specified directories. Watched folders share one observer thread.
 
 file path: esg_engine/utils/file_monitor.py
 """
 
 import os
 import logging
+import threading
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 from config.settings import get_settings
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "monitor.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Held while a callback runs, so callbacks from every handler run one at a time as they did on
+# the observer thread; reindexing callbacks read and rewrite the same index, metadata, and manifest
+_callback_lock = threading.Lock()
 
 class FileMonitorHandler(FileSystemEventHandler):
     """
-    Handles file system events by calling the provided callback function.
+    Handles file system events by calling the provided callback function once per burst: each
+    event for a path restarts that path's timer, and the callback runs when no event has arrived
+    for debounce_seconds, so a file written in many chunks is processed once. Callbacks never
+    overlap, even across handlers.
     """
-    def __init__(self, callback):
+    def __init__(self, callback, delay=None):
         self.callback = callback
+        self.delay = settings["monitoring"]["debounce_seconds"] if delay is None else delay
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def _schedule(self, path):
+        """Restarts the path's timer; the callback runs once the path has been quiet for the delay."""
+        def fire():
+            with self._lock:
+                if self._pending.get(path) is timer:
+                    del self._pending[path]
+            with _callback_lock:
+                self.callback(path)
+        
+        with self._lock:
+            previous = self._pending.get(path)
+            if previous is not None:
+                previous.cancel()
+            timer = threading.Timer(self.delay, fire)
+            timer.daemon = True
+            self._pending[path] = timer
+            timer.start()
     
     def on_created(self, event):
         if not event.is_directory:
-            logging.info(f"Detected new file: {event.src_path}")
-            self.callback(event.src_path)
+            logger.info(f"Detected new file: {event.src_path}")
+            self._schedule(event.src_path)
     
     def on_modified(self, event):
         if not event.is_directory:
-            logging.info(f"Detected modified file: {event.src_path}")
-            self.callback(event.src_path)
+            logger.info(f"Detected modified file: {event.src_path}")
+            self._schedule(event.src_path)
 
-def monitor_folder(folder_path, callback):
+def start_observer(folder_callbacks):
     """
-    Monitors a folder for file creation or modification events, triggering the callback.
+    Starts a single watchdog observer for several folders, so all folders share one notification
+    thread. The caller stops and joins the returned observer.
     
     Args:
-        folder_path (str): Path to the folder to monitor.
-        callback (callable): Function to call when a file event occurs.
+        folder_callbacks (dict): Mapping of folder path to the callback for its file events.
     
     Returns:
-        None
+        Observer: Started observer.
     """
-    if not os.path.exists(folder_path):
-        logging.error(f"Folder not found: {folder_path}")
-        os.makedirs(folder_path)
-        logging.info(f"Created folder: {folder_path}")
-    
-    observer = Observer()
-    event_handler = FileMonitorHandler(callback)
-    observer.schedule(event_handler, folder_path, recursive=False)
+    # Kernel notifications (inotify, FSEvents, ReadDirectoryChangesW) where available; watchdog
+    # falls back to polling elsewhere, which then rescans at the configured update interval
+    if Observer is PollingObserver:
+        observer = PollingObserver(timeout=settings["monitoring"]["update_interval"])
+    else:
+        observer = Observer()
+    for folder_path, callback in folder_callbacks.items():
+        if not os.path.exists(folder_path):
+            logger.error(f"Folder not found: {folder_path}")
+            os.makedirs(folder_path)
+            logger.info(f"Created folder: {folder_path}")
+        observer.schedule(FileMonitorHandler(callback), folder_path, recursive=False)
     observer.start()
+    return observer
+
+def monitor_folders(folder_callbacks):
+    """
+    Monitors several folders with a single watchdog observer, so all folders share one
+    notification thread, and blocks until the observer stops or KeyboardInterrupt.
+    
+    Args:
+        folder_callbacks (dict): Mapping of folder path to the callback for its file events.
+    
+    Returns:
+        None
+    """
+    observer = start_observer(folder_callbacks)
     
     try:
         while observer.is_alive():
-            import time
-            time.sleep(1)
+            observer.join(1)
     except KeyboardInterrupt:
         observer.stop()
-    observer.join()
\ No newline at end of file
+    observer.join()
+
+def monitor_folder(folder_path, callback):
+    """
+    Monitors a folder for file creation or modification events, triggering the callback once
+    per burst of events for a file.
+    
+    Args:
+        folder_path (str): Path to the folder to monitor.
+        callback (callable): Function to call when a file event occurs.
+    
+    Returns:
+        None
+    """
+    monitor_folders({folder_path: callback})
@@ -0,0 +1,80 @@
+"""
+This module provides an in-process LLM response cache for the ESG Engine. Responses are keyed on
+a stable identifier of the LLM's model and configuration and the BLAKE2b digest of the prompt, so
+repeated validations and summaries for the same criterion and evidence reuse the earlier response
+instead of invoking the LLM again.
+
+file path: esg_engine/utils/llm_cache.py
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 8192
+
+_responses = OrderedDict()
+_lock = threading.Lock()
+
+def prompt_key(prompt):
+    """
+    Builds the cache key for a prompt.
+
+    Args:
+        prompt (str): Prompt text.
+
+    Returns:
+        str: Hex BLAKE2b digest of the prompt.
+    """
+    return hashlib.blake2b(prompt.encode("utf-8")).hexdigest()
+
+def llm_key(llm):
+    """
+    Builds a stable identifier for an LLM from its class and configuration: LangChain's
+    _identifying_params, else a model_name, model, or model_id attribute, else a stub's canned
+    responses. LLMs configured alike share cache entries.
+
+    Args:
+        llm: LLM with an invoke method (e.g., StubLLM or a LangChain LLM).
+
+    Returns:
+        str: Identifier of the LLM's class and configuration.
+    """
+    config = getattr(llm, "_identifying_params", None)
+    if not config:
+        config = next((getattr(llm, name) for name in ("model_name", "model", "model_id", "responses") if getattr(llm, name, None) is not None), None)
+    if isinstance(config, dict):
+        config = sorted(config.items())
+    return f"{type(llm).__module__}.{type(llm).__qualname__}:{config!r}"
+
+def invoke_cached(llm, prompt):
+    """
+    Invokes the LLM for a prompt, returning the cached response if an LLM with the same model and
+    configuration has already answered the same prompt. The least recently used entry is evicted past MAX_ENTRIES.
+
+    Args:
+        llm: LLM with an invoke method (e.g., StubLLM or a LangChain LLM).
+        prompt (str): Prompt text.
+
+    Returns:
+        str: LLM response.
+    """
+    key = (llm_key(llm), prompt_key(prompt))
+    with _lock:
+        if key in _responses:
+            _responses.move_to_end(key)
+            return _responses[key]
+
+    response = llm.invoke(prompt)
+
+    with _lock:
+        _responses[key] = response
+        _responses.move_to_end(key)
+        if len(_responses) > MAX_ENTRIES:
+            _responses.popitem(last=False)
+    return response
+
+def clear_llm_cache():
+    """Removes all cached responses."""
+    with _lock:
+        _responses.clear()
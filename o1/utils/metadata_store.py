@@ -0,0 +1,120 @@
+"""
+This module provides a columnar container for FAISS index metadata in the ESG Engine. A
+MetadataTable keeps one list per field instead of one dict per indexed sentence, so the standards
+metadata pickle unpickles as a few long lists rather than hundreds of thousands of small dicts,
+loading faster and using less memory. Rows are still read as dicts by position, so searchers
+written against a list of metadata dicts work unchanged. Searches that filter hits by a field can
+take the column as a NumPy array and select rows with masks instead of building a dict per hit.
+
+file path: esg_engine/utils/metadata_store.py
+"""
+
+import numpy as np
+
+class MetadataTable:
+    """
+    Read-only sequence of metadata rows stored column-wise.
+    """
+    def __init__(self, columns):
+        self.columns = columns
+        self._length = len(next(iter(columns.values()))) if columns else 0
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds a table from metadata dictionaries; fields missing from a record are None.
+
+        Args:
+            records (list): Metadata dictionaries in index order.
+
+        Returns:
+            MetadataTable: Table with one column per field.
+        """
+        fields = dict.fromkeys(field for record in records for field in record)
+        return cls({field: [record.get(field) for record in records] for field in fields})
+
+    def column(self, field):
+        """
+        Returns one field for every row without building row dictionaries.
+
+        Args:
+            field (str): Field name, e.g. "sentence".
+
+        Returns:
+            list: Field values in index order, shared with the table.
+        """
+        return self.columns[field]
+
+    def array(self, field):
+        """
+        Returns one field as a NumPy array, converted on first use and reused afterwards, so hit
+        filters can index it with FAISS result ids.
+
+        Args:
+            field (str): Field name, e.g. "type".
+
+        Returns:
+            np.ndarray: Field values in index order, shared with the table; treat as read-only.
+        """
+        arrays = self.__dict__.setdefault("_arrays", {})
+        if field not in arrays:
+            arrays[field] = np.asarray(self.columns[field])
+        return arrays[field]
+
+    def replaced(self, remove_ids, records):
+        """
+        Returns a copy of the table with the rows at remove_ids blanked and records appended, for
+        an index that removed those ids and added the records under the following ones. Blanked
+        rows keep their position, so later rows stay aligned with their FAISS ids.
+
+        Args:
+            remove_ids (list): Positions of rows to blank; every field becomes None.
+            records (list): Metadata dictionaries to append.
+
+        Returns:
+            MetadataTable: Updated table.
+        """
+        fields = dict.fromkeys([*self.columns, *(field for record in records for field in record)])
+        columns = {field: list(self.columns.get(field, [None] * self._length)) for field in fields}
+        for values in columns.values():
+            for idx in remove_ids:
+                values[idx] = None
+            values.extend([None] * len(records))
+        for offset, record in enumerate(records, start=self._length):
+            for field, value in record.items():
+                columns[field][offset] = value
+        return MetadataTable(columns)
+
+    def take(self, indices):
+        """
+        Returns the rows at the given positions, e.g. the ids a FAISS search returned, reading
+        each column once per row.
+
+        Args:
+            indices (list): Row positions; must be in range.
+
+        Returns:
+            list: New metadata dictionaries, one per position, in the given order.
+        """
+        fields = list(self.columns)
+        columns = [self.columns[field] for field in fields]
+        return [dict(zip(fields, [values[idx] for values in columns])) for idx in indices]
+
+    def __getstate__(self):
+        # Arrays are rebuilt from the columns after unpickling
+        state = self.__dict__.copy()
+        state.pop("_arrays", None)
+        return state
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError("metadata row out of range")
+        return {field: values[idx] for field, values in self.columns.items()}
+
+    def __iter__(self):
+        return (self[idx] for idx in range(self._length))
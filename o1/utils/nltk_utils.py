@@ -9,16 +9,11 @@ import os
 import pickle
 from datetime import datetime
 import nltk
-from config.settings import get_settings
 import urllib.request
 import ssl
 import shutil
 
-# Configure logging
-settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "nltk_utils.log")
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # Cache configuration
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".esg_engine_cache")
@@ -46,13 +41,13 @@ def load_nltk_wordnet():
                         from nltk.corpus import wordnet
                         nltk.data.path.append(CACHE_DIR)
                         wordnet.synsets("test")  # Test access
-                        logging.info(f"Using cached NLTK WordNet corpus at {wordnet_dir}")
+                        logger.info(f"Using cached NLTK WordNet corpus at {wordnet_dir}")
                         return True
                     except Exception as e:
-                        logging.warning(f"WordNet corpus at {wordnet_dir} is corrupted: {str(e)}")
+                        logger.warning(f"WordNet corpus at {wordnet_dir} is corrupted: {str(e)}")
                         shutil.rmtree(wordnet_dir, ignore_errors=True)
                 else:
-                    logging.warning(f"WordNet cache file exists but directory {wordnet_dir} is missing")
+                    logger.warning(f"WordNet cache file exists but directory {wordnet_dir} is missing")
         
         # Ensure write permissions
         if not os.access(CACHE_DIR, os.W_OK):
@@ -64,7 +59,7 @@ def load_nltk_wordnet():
             raise OSError(f"Insufficient disk space in {CACHE_DIR}: {stat.free / 1024 / 1024:.2f} MB free")
         
         # Download WordNet with retries and SSL bypass for Windows
-        logging.info("Attempting to download NLTK WordNet corpus")
+        logger.info("Attempting to download NLTK WordNet corpus")
         max_retries = 3
         for attempt in range(1, max_retries + 1):
             try:
@@ -76,15 +71,15 @@ def load_nltk_wordnet():
                     wordnet.synsets("test")  # Test access
                     with open(wordnet_cache_file, "wb") as f:
                         pickle.dump({"timestamp": datetime.now().timestamp()}, f)
-                    logging.info(f"Downloaded and cached NLTK WordNet corpus to {wordnet_dir}")
+                    logger.info(f"Downloaded and cached NLTK WordNet corpus to {wordnet_dir}")
                     return True
                 else:
-                    logging.warning(f"WordNet download attempt {attempt} failed: {wordnet_dir} not found")
+                    logger.warning(f"WordNet download attempt {attempt} failed: {wordnet_dir} not found")
             except Exception as e:
-                logging.warning(f"WordNet download attempt {attempt} failed: {str(e)}")
+                logger.warning(f"WordNet download attempt {attempt} failed: {str(e)}")
                 if attempt == max_retries:
                     raise FileNotFoundError(f"WordNet download failed after {max_retries} attempts: {wordnet_dir} not found")
     
     except Exception as e:
-        logging.error(f"Failed to cache/load NLTK WordNet: {str(e)}. Falling back to synonym dictionary.")
+        logger.error(f"Failed to cache/load NLTK WordNet: {str(e)}. Falling back to synonym dictionary.")
         return False
\ No newline at end of file
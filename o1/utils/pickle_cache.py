@@ -0,0 +1,43 @@
+"""
+This module provides a process-wide cache for the ESG Engine's on-disk pickle caches (FAISS
+metadata, texts_cache.pkl, standards_cache.pkl, per-report texts). Each file is unpickled once and
+the loaded object is reused until the file's modification time or size changes, so repeated
+searches and workflow runs do not deserialize the same corpus again.
+
+Loaded objects are shared between callers and must be treated as read-only.
+
+file path: esg_engine/utils/pickle_cache.py
+"""
+
+import os
+import pickle
+from functools import lru_cache
+
+@lru_cache(maxsize=32)
+def _load(path, mtime_ns, size):
+    """Unpickles a file; memoized on its path, modification time, and size."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def load_pickle(path):
+    """
+    Returns the unpickled contents of a file, reusing the object loaded earlier in this process
+    if the file has not changed since.
+
+    Args:
+        path (str): Path to the pickle file.
+
+    Returns:
+        object: Unpickled object, shared with other callers.
+    """
+    stat = os.stat(path)
+    return _load(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+def clear_pickle_cache():
+    """
+    Drops every loaded object, e.g. after caches are rebuilt in place.
+
+    Returns:
+        None
+    """
+    _load.cache_clear()
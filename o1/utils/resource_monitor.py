@@ -7,13 +7,38 @@ file path: esg_engine/utils/resource_monitor.py
 
 import psutil
 import os
+import time
 import logging
+import threading
 from config.settings import get_settings
 
-# Configure logging
 settings = get_settings()
-log_file = os.path.join(settings["data_paths"]["output"], "resource.log")
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Memory and disk readings are reused for this many seconds, since checks run before every
+# sub-agent dispatch and each reading parses /proc/meminfo and stats the output volume
+SNAPSHOT_SECONDS = 1.0
+
+_snapshot = (float("-inf"), None, None)
+_snapshot_lock = threading.Lock()
+
+def resource_snapshot():
+    """
+    Returns recent virtual memory and output-disk usage readings, refreshed at most once per
+    SNAPSHOT_SECONDS.
+    
+    Returns:
+        tuple: (psutil virtual_memory result, psutil disk_usage result).
+    """
+    global _snapshot
+    with _snapshot_lock:
+        taken_at, ram, disk = _snapshot
+        now = time.monotonic()
+        if now - taken_at >= SNAPSHOT_SECONDS:
+            ram = psutil.virtual_memory()
+            disk = psutil.disk_usage(settings["data_paths"]["output"])
+            _snapshot = (now, ram, disk)
+        return ram, disk
 
 def check_resources(is_server=False):
     """
@@ -25,26 +50,23 @@ def check_resources(is_server=False):
     Returns:
         dict: Dictionary with 'compliant' (bool) and 'max_sub_agents' (int).
     """
-    # Load settings
-    settings = get_settings()
     limits = settings["resource_limits"]["server" if is_server else "local"]
+    ram, disk = resource_snapshot()
     
     # Check RAM usage
-    ram = psutil.virtual_memory()
     ram_used_percent = ram.percent
     ram_limit = 80  # Relaxed for testing, override settings limit
     
     # Check disk usage
-    disk = psutil.disk_usage(settings["data_paths"]["output"])
     disk_used_percent = (disk.used / disk.total) * 100
     disk_limit = 80  # Relaxed for testing, override settings limit
     
     # Log resource usage
-    logging.info(f"RAM: {ram_used_percent:.1f}% (limit {ram_limit}%), Disk: {disk_used_percent:.1f}% (limit {disk_limit}%)")
+    logger.info(f"RAM: {ram_used_percent:.1f}% (limit {ram_limit}%), Disk: {disk_used_percent:.1f}% (limit {disk_limit}%)")
     
     # Determine compliance
     compliant = ram_used_percent <= ram_limit and disk_used_percent <= disk_limit
     if not compliant:
-        logging.error(f"Resource usage exceeds limits: RAM {ram_used_percent:.1f}%, Disk {disk_used_percent:.1f}%")
+        logger.error(f"Resource usage exceeds limits: RAM {ram_used_percent:.1f}%, Disk {disk_used_percent:.1f}%")
     
     return {"compliant": compliant, "max_sub_agents": 4}
\ No newline at end of file
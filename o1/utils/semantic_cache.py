@@ -0,0 +1,81 @@
+"""
+This module provides a semantic cache for the ESG Engine based on random-projection locality-sensitive
+hashing (LSH). Embeddings are hashed by the signs of their projections onto random hyperplanes, so
+near-duplicate texts (e.g., paraphrased criteria) land in the same bucket and can reuse a stored value
+once their cosine similarity is confirmed to exceed a threshold.
+
+file path: esg_engine/utils/semantic_cache.py
+"""
+
+import threading
+import numpy as np
+
+class SemanticCache:
+    """
+    Random-projection LSH cache mapping embeddings to values, with exact cosine verification on lookup.
+    """
+    def __init__(self, dimension, num_planes=8, threshold=0.95, seed=42):
+        """
+        Args:
+            dimension (int): Embedding dimension (e.g., 384 for all-MiniLM-L6-v2).
+            num_planes (int): Number of random hyperplanes, i.e. signature bits (max 64).
+            threshold (float): Minimum cosine similarity for a cache hit.
+            seed (int): Seed for the projection matrix so signatures are reproducible.
+        """
+        rng = np.random.default_rng(seed)
+        self.projection = rng.standard_normal((num_planes, dimension)).astype(np.float32)
+        self.weights = (np.uint64(1) << np.arange(num_planes, dtype=np.uint64))
+        self.threshold = threshold
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def _normalize(self, embedding):
+        """Returns the embedding as a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _signature(self, vector):
+        """Packs the signs of the random projections into a uint64 signature."""
+        bits = (self.projection @ vector) > 0
+        return int(np.sum(self.weights[bits]))
+
+    def lookup(self, embedding):
+        """
+        Returns the value stored for the most similar cached embedding in the same bucket.
+
+        Args:
+            embedding (np.ndarray): Query embedding.
+
+        Returns:
+            object: Cached value if a candidate reaches the similarity threshold, otherwise None.
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            candidates = list(self.buckets.get(self._signature(vector), []))
+        best_value, best_similarity = None, self.threshold
+        for cached_vector, value in candidates:
+            similarity = float(np.dot(vector, cached_vector))
+            if similarity >= best_similarity:
+                best_value, best_similarity = value, similarity
+        return best_value
+
+    def store(self, embedding, value):
+        """
+        Stores a value under the bucket of the given embedding.
+
+        Args:
+            embedding (np.ndarray): Embedding the value was computed for.
+            value (object): Value to cache.
+
+        Returns:
+            None
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self.buckets.setdefault(self._signature(vector), []).append((vector, value))
+
+    def clear(self):
+        """Removes all cached entries."""
+        with self._lock:
+            self.buckets.clear()
@@ -0,0 +1,35 @@
+"""
+This module provides a lightweight stand-in LLM for the ESG Engine while a real model is being
+integrated. It cycles through canned responses like LangChain's FakeListLLM, without importing
+the LangChain stack.
+
+file path: esg_engine/utils/stub_llm.py
+"""
+
+class StubLLM:
+    """
+    Placeholder LLM whose invoke returns the configured responses in rotation.
+    """
+    __slots__ = ("responses", "_i")
+
+    def __init__(self, responses):
+        """
+        Args:
+            responses (list): Canned responses, returned in order and repeated.
+        """
+        self.responses = responses
+        self._i = 0
+
+    def invoke(self, prompt):
+        """
+        Returns the next canned response, ignoring the prompt.
+
+        Args:
+            prompt (str): Prompt text.
+
+        Returns:
+            str: Canned response.
+        """
+        response = self.responses[self._i % len(self.responses)]
+        self._i += 1
+        return response
@@ -31,4 +31,12 @@ SYNONYMS = {
     "jobs": ["employment", "hiring", "positions", "workforce"],
     "investment": ["funding", "capital", "expenditure", "financing"],
     "corruption": ["bribery", "fraud", "misconduct", "unethical practices"]
-}
\ No newline at end of file
+}
+
+# Inverted index: each word maps to every term of every group it belongs to, so expanding a token
+# is one dict lookup instead of a scan over all groups
+WORD_TO_SYNONYMS = {}
+for _key, _synonyms in SYNONYMS.items():
+    for _word in (_key, *_synonyms):
+        WORD_TO_SYNONYMS.setdefault(_word, set()).update([_key, *_synonyms])
+WORD_TO_SYNONYMS = {word: frozenset(terms) for word, terms in WORD_TO_SYNONYMS.items()}
@@ -6,53 +6,263 @@ text with metadata for use in RAG databases.
 file path: esg_engine/utils/text_processing.py
 """
 
+import os
+import sys
+import platform
+import logging
+import multiprocessing
+import threading
 import spacy
+import torch
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from config.settings import get_settings
+from utils.embedding_cache import get_or_compute_many
 
 # Load settings
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-# Initialize spaCy and sentence-transformers models
+def int8_onnx_file():
+    """
+    Picks the int8-quantized ONNX graph published with the model that matches this CPU: the VNNI
+    build where AVX-512 VNNI dot-product instructions are available, then AVX-512, ARM64, and AVX2.
+    
+    Returns:
+        str: Path of the graph within the model repository.
+    """
+    machine = platform.machine().lower()
+    if machine in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    flags = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        pass
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx512f" in flags:
+        return "onnx/model_qint8_avx512.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+# ONNX graph published with the model: O2-optimized by default (fused attention and GELU kernels),
+# one of its int8-quantized variants, or "int8" for the quantized variant suited to this CPU
+ONNX_FILE = settings["model_params"]["encoder_onnx_file"]
+if ONNX_FILE == "int8":
+    ONNX_FILE = int8_onnx_file()
+
+def load_encoder(device):
+    """
+    Loads the sentence-transformers encoder. On GPU it runs in half precision, bf16 where the
+    device supports it for its wider range and fp16 otherwise; on CPU it uses ONNX Runtime
+    with ONNX_FILE when the encoder_backend setting is "onnx", falling back to PyTorch if ONNX
+    Runtime is unavailable.
+    
+    Args:
+        device (str): "cuda" or "cpu".
+    
+    Returns:
+        tuple: (SentenceTransformer, str key identifying the encoder for embedding caches).
+    """
+    name = settings["model_params"]["sentence_transformer_model"]
+    if device == "cpu" and settings["model_params"]["encoder_backend"] == "onnx":
+        try:
+            encoder = SentenceTransformer(name, device=device, backend="onnx",
+                                          model_kwargs={"file_name": ONNX_FILE, "provider": "CPUExecutionProvider"})
+            # Quantized graphs give slightly different vectors, so they get their own cache entries
+            return encoder, name if ONNX_FILE == "onnx/model_O2.onnx" else f"{name}:{ONNX_FILE}"
+        except Exception as e:
+            logger.warning(f"ONNX encoder unavailable, using PyTorch: {str(e)}")
+    encoder = SentenceTransformer(name, device=device)
+    if device == "cuda":
+        encoder.to(torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16)
+    return encoder, name
+
+# Initialize the spaCy model, shared by every module that tokenizes or tags text
 nlp = spacy.load(settings["model_params"]["spacy_model"])
-model = SentenceTransformer(settings["model_params"]["sentence_transformer_model"])
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+# The sentence-transformers encoder is loaded on first use, so modules that import this one
+# without embedding anything do not pay for it
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def get_encoder():
+    """
+    Returns the process-wide encoder, loading it with load_encoder on the first call.
+    
+    Returns:
+        tuple: (SentenceTransformer, str key identifying the encoder for embedding caches).
+    """
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                _encoder = load_encoder(DEVICE)
+    return _encoder
+
+def encoder_key():
+    """
+    Returns the key identifying the encoder in embedding caches; loads the encoder if needed,
+    since the key depends on the backend that actually loaded.
+    
+    Returns:
+        str: Encoder key.
+    """
+    return get_encoder()[1]
+
+# Parts of speech kept when comparing content words
+POS_SET = frozenset(("NOUN", "VERB", "ADJ"))
+
+# Components not needed for POS tagging (attribute_ruler maps tags to POS and must stay enabled)
+TAGGER_DISABLED = ["parser", "ner", "lemmatizer"]
+
+# Components not needed to split text into sentences
+SEGMENTER_DISABLED = ["tagger", "attribute_ruler", "ner", "lemmatizer"]
+
+# Rule-based splitter used instead of the parser when sentence_segmenter is "sentencizer"
+sentencizer = None
+if settings["model_params"]["sentence_segmenter"] == "sentencizer":
+    sentencizer = spacy.blank(nlp.lang)
+    sentencizer.add_pipe("sentencizer")
+
+# Worker processes for large nlp.pipe batches (1 keeps spaCy in-process). Workers are forked
+# after the spaCy model above is loaded, so they share it copy-on-write instead of reloading.
+PIPE_PROCESSES = int(os.environ.get("ESG_PIPE_PROCESSES", "1"))
+
+# Batches smaller than this are processed in-process, where worker startup would dominate
+PARALLEL_MIN_TEXTS = 512
+
+def pipe_processes(count):
+    """
+    Returns the n_process value for an nlp.pipe call over count texts. Worker processes are only
+    used for large batches and where processes fork, since spawned workers would reload spaCy.
+    
+    Args:
+        count (int): Number of texts in the batch.
+    
+    Returns:
+        int: Number of processes to pass to nlp.pipe.
+    """
+    if PIPE_PROCESSES > 1 and count >= PARALLEL_MIN_TEXTS and multiprocessing.get_start_method() == "fork":
+        return PIPE_PROCESSES
+    return 1
+
+def enable_fork_workers():
+    """
+    Makes worker processes fork from this process on Linux, so they inherit the loaded spaCy model
+    (and the encoder, once loaded) copy-on-write. Called once by entry points, before any workers start, when
+    ESG_PIPE_PROCESSES enables them; elsewhere the platform default start method is kept.
+    
+    Returns:
+        bool: True if workers will be forked.
+    """
+    if PIPE_PROCESSES > 1 and sys.platform.startswith("linux"):
+        multiprocessing.set_start_method("fork", force=True)
+    return multiprocessing.get_start_method() == "fork"
+
+def encode(texts):
+    """
+    Encodes texts with the shared model as L2-normalized float32 vectors, so cosine similarity
+    is a plain dot product downstream.
+    
+    Args:
+        texts (list): Texts to encode.
+    
+    Returns:
+        np.ndarray: Array of shape (len(texts), dimension).
+    """
+    encoder = get_encoder()[0]
+    return np.asarray(encoder.encode(texts, batch_size=64, show_progress_bar=False, convert_to_numpy=True,
+                                     normalize_embeddings=True), dtype=np.float32)
+
+def split_sentences(texts):
+    """
+    Splits texts into sentences in one batched spaCy pass, with the parser alone or the
+    rule-based sentencizer depending on the sentence_segmenter setting.
+    
+    Args:
+        texts (list): Texts to split.
+    
+    Returns:
+        generator: For each text, in order, the list of its stripped, non-empty sentences.
+    """
+    if sentencizer is not None:
+        docs = sentencizer.pipe(texts, batch_size=256)
+    else:
+        docs = nlp.pipe(texts, batch_size=32, disable=SEGMENTER_DISABLED, n_process=pipe_processes(len(texts)))
+    for doc in docs:
+        yield [sent.text.strip() for sent in doc.sents if sent.text.strip()]
 
-def tokenize_and_embed(pages):
+def tokenize_and_embed(pages, cached=False):
     """
     Tokenizes text into sentences and generates embeddings, preserving metadata.
     
     Args:
         pages (list): List of dictionaries with 'page_number' (int) and 'text' (str).
+        cached (bool): Whether to serve and store sentence embeddings through the persistent
+            embedding cache, for documents that are re-embedded when reindexed.
     
     Returns:
         list: List of dictionaries with 'page_number', 'sentence_index', 'sentence', and 'embedding'.
     """
+    # Split every non-empty page in one batched pass
+    pages = [page for page in pages if page["text"].strip()]
+    
+    # Store results with metadata; embeddings are filled in below
     results = []
+    for page, sentences in zip(pages, split_sentences([page["text"] for page in pages])):
+        results.extend({
+            "page_number": page["page_number"],
+            "sentence_index": idx,
+            "sentence": sentence
+        } for idx, sentence in enumerate(sentences))
+    
+    # Generate embeddings for every page's sentences in one batched encode call
+    if results:
+        sentences = [result["sentence"] for result in results]
+        embeddings = get_or_compute_many(sentences, encode, encoder_key()) if cached else encode(sentences)
+        for result, embedding in zip(results, embeddings):
+            result["embedding"] = embedding
+    
+    return results
+
+def embed_texts(texts):
+    """
+    Generates embeddings for a list of texts in a single batched encode call, without
+    sentence tokenization. Used for short queries such as requirement criteria; results
+    are served from the persistent embedding cache when available.
+    
+    Args:
+        texts (list): List of strings to embed.
     
-    # Process each page
-    for page in pages:
-        page_num = page["page_number"]
-        text = page["text"]
-        
-        # Skip empty text
-        if not text.strip():
-            continue
-            
-        # Tokenize into sentences
-        doc = nlp(text)
-        sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
-        
-        # Generate embeddings
-        embeddings = model.encode(sentences, convert_to_numpy=True) if sentences else []
-        
-        # Store results with metadata
-        for idx, (sentence, embedding) in enumerate(zip(sentences, embeddings)):
-            results.append({
-                "page_number": page_num,
-                "sentence_index": idx,
-                "sentence": sentence,
-                "embedding": embedding
-            })
-    
-    return results
\ No newline at end of file
+    Returns:
+        np.ndarray: Array of shape (len(texts), dimension) with float32 embeddings.
+    """
+    if not texts:
+        return np.empty((0, get_encoder()[0].get_sentence_embedding_dimension()), dtype=np.float32)
+    return get_or_compute_many(
+        texts,
+        encode,
+        encoder_key()
+    )
+
+def content_tokens(texts, batch_size=256):
+    """
+    Returns the noun, verb, and adjective tokens of each text, tagging all texts in one
+    nlp.pipe pass with the parser, NER, and lemmatizer disabled. Large batches are split across
+    forked worker processes when ESG_PIPE_PROCESSES is set.
+    
+    Args:
+        texts (list): Texts to tag.
+        batch_size (int): Number of texts per spaCy batch.
+    
+    Returns:
+        list: One set of token strings per text, in input order.
+    """
+    docs = nlp.pipe(texts, batch_size=batch_size, disable=TAGGER_DISABLED, n_process=pipe_processes(len(texts)))
+    return [{token.text for token in doc if token.pos_ in POS_SET} for doc in docs]
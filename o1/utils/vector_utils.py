@@ -9,10 +9,36 @@ import faiss
 import numpy as np
 import pickle
 import os
+import logging
+import threading
+from functools import lru_cache
+from utils.pickle_cache import load_pickle
+from utils.metadata_store import MetadataTable
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# IVF/PQ parameters for the on-disk indexes
+INDEXING = get_settings()["indexing"]
+
+# Vectors added to an index per call when building it
+ADD_CHUNK = 50000
+
+# Indexes are read memory-mapped and read-only, so searches fault pages in on demand and
+# processes searching the same file share them
+MMAP_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+
+def _write_index(index, index_path):
+    """Writes an index via a temporary file and a rename, so indexes mapped from the old file stay intact."""
+    tmp_path = f"{index_path}.tmp"
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, index_path)
 
 def initialize_index(dimension, index_path):
     """
-    Initializes a FAISS FlatL2 index stored on disk.
+    Initializes an HNSW graph index over inner products, stored on disk. Vectors added with
+    add_to_index are L2-normalized, so scores are cosine similarities and a query visits a few
+    hundred graph nodes instead of scanning every vector.
     
     Args:
         dimension (int): Embedding dimension (e.g., 384 for all-MiniLM-L6-v2).
@@ -21,15 +47,18 @@ def initialize_index(dimension, index_path):
     Returns:
         faiss.Index: Initialized FAISS index.
     """
-    # Create a FlatL2 index
-    index = faiss.IndexFlatL2(dimension)
+    # Create an HNSW index; efSearch is stored with it and reapplied when it is read back
+    index = faiss.IndexHNSWFlat(dimension, INDEXING["hnsw_m"], faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = INDEXING["ef_construction"]
+    index.hnsw.efSearch = INDEXING["ef_search"]
     # Enable disk storage
-    faiss.write_index(index, index_path)
+    _write_index(index, index_path)
     return index
 
 def add_to_index(index, embeddings, metadata, metadata_path, index_path):
     """
-    Adds embeddings and metadata to a FAISS index and saves it to disk.
+    Adds embeddings and metadata to a FAISS index and saves it to disk. Embeddings added to an
+    inner-product index are L2-normalized first.
     
     Args:
         index (faiss.Index): FAISS index to add to.
@@ -41,46 +70,439 @@ def add_to_index(index, embeddings, metadata, metadata_path, index_path):
     Returns:
         None
     """
-    # Ensure embeddings are in correct format
-    embeddings = np.array(embeddings, dtype=np.float32)
+    # Ensure embeddings are in correct format; contiguous float32 arrays are used without a copy
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        embeddings = _normalized(embeddings)
     
     # Add embeddings to index
     index.add(embeddings)
     
     # Save updated index to disk
-    faiss.write_index(index, index_path)
+    _write_index(index, index_path)
     
     # Save metadata to disk
     with open(metadata_path, "wb") as f:
-        pickle.dump(metadata, f)
+        pickle.dump(metadata, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def index_factory_string(count):
+    """
+    Chooses the FAISS index layout for a corpus of the given size: an exhaustive scan below
+    ivf_min_vectors, IVF up to pq_min_vectors, both storing vectors with the configured codec
+    (fp16 by default), and IVF with product-quantized vectors above.
+    
+    Args:
+        count (int): Number of vectors to index.
+    
+    Returns:
+        str: FAISS index factory string.
+    """
+    if count >= INDEXING["pq_min_vectors"]:
+        return f"IVF{INDEXING['nlist']},PQ{INDEXING['pq_m']}"
+    if count >= INDEXING["ivf_min_vectors"]:
+        return f"IVF{INDEXING['nlist']},{INDEXING['codec']}"
+    return INDEXING["codec"]
+
+def _normalized(embeddings):
+    """Returns an L2-normalized float32 copy of a block of embeddings."""
+    embeddings = np.array(embeddings, dtype=np.float32, order="C")
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
+def to_distances(index, scores):
+    """
+    Converts search scores of an index to L2 distances between unit vectors, so results keep
+    reporting lower-is-closer distances for inner-product indexes (|a - b|^2 = 2 - 2 a.b).
+    
+    Args:
+        index (faiss.Index): Index the scores came from.
+        scores (np.ndarray): Scores returned by index.search.
+    
+    Returns:
+        np.ndarray: Distances; scores of L2 indexes are returned unchanged.
+    """
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        return 2.0 - 2.0 * scores
+    return scores
+
+def build_index(embeddings, index_path):
+    """
+    Builds a FAISS index over all embeddings at once and saves it to disk. Vectors are
+    L2-normalized and compared by inner product, which ranks like L2 distance on unit vectors
+    without the subtraction. IVF layouts are trained on an evenly strided sample of the corpus
+    before adding. Vectors are added under their row positions through an IndexIDMap2, so search
+    results index the metadata list.
+    
+    Args:
+        embeddings (np.ndarray): Embeddings of shape (n, dimension), in metadata order; may be
+            memory-mapped.
+        index_path (str): Path to store the index file.
+    
+    Returns:
+        faiss.Index: Built FAISS index.
+    """
+    count, dimension = embeddings.shape
+    index = faiss.IndexIDMap2(faiss.index_factory(dimension, index_factory_string(count), faiss.METRIC_INNER_PRODUCT))
+    if not index.is_trained:
+        # 64 points per cell is ample for k-means and the 256-centroid PQ codebooks
+        step = max(1, count // (64 * INDEXING["nlist"]))
+        index.train(_normalized(embeddings[::step]))
+    # Added in chunks, so memory-mapped embeddings are paged in a chunk at a time
+    for start in range(0, count, ADD_CHUNK):
+        chunk = _normalized(embeddings[start:start + ADD_CHUNK])
+        index.add_with_ids(chunk, np.arange(start, start + len(chunk), dtype=np.int64))
+    _write_index(index, index_path)
+    return index
+
+class EmbeddingSpool:
+    """
+    Append-only scratch file of float32 embedding rows, read back memory-mapped, so an index
+    build does not hold every embedding of the corpus in RAM next to the index being built.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.dimension = 0
+        self._file = open(path, "wb")
+    
+    def append(self, embeddings):
+        """Writes rows of embeddings to the end of the spool."""
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if len(embeddings):
+            self._file.write(embeddings.tobytes())
+            self.rows += len(embeddings)
+            self.dimension = embeddings.shape[1]
+    
+    def array(self):
+        """Returns every spooled row as a read-only memory-mapped array."""
+        self._file.flush()
+        return np.memmap(self.path, dtype=np.float32, mode="r", shape=(self.rows, self.dimension))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def update_index(index_path, remove_ids, embeddings, first_id):
+    """
+    Updates an index built by build_index on disk without rebuilding it: vectors under
+    remove_ids are removed and embeddings are added under consecutive ids from first_id.
+    
+    Args:
+        index_path (str): Path to the index file.
+        remove_ids (list): Ids of vectors to remove.
+        embeddings (np.ndarray): Embeddings to add, of shape (n, dimension).
+        first_id (int): Id of the first added embedding.
+    
+    Returns:
+        faiss.Index: Updated FAISS index, or None if the stored index does not map ids.
+    """
+    index = faiss.read_index(index_path)
+    if not isinstance(index, faiss.IndexIDMap2):
+        return None
+    if len(remove_ids):
+        index.remove_ids(np.asarray(remove_ids, dtype=np.int64))
+    if len(embeddings):
+        if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            embeddings = _normalized(embeddings)
+        else:
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        index.add_with_ids(embeddings, np.arange(first_id, first_id + len(embeddings), dtype=np.int64))
+    _write_index(index, index_path)
+    return index
+
+_gpu_resources = None
+
+class _GpuIndex:
+    """Serializes searches on a GPU index, whose resources FAISS does not share across threads."""
+    def __init__(self, index):
+        self.index = index
+        self._lock = threading.Lock()
+    
+    def search(self, queries, k):
+        with self._lock:
+            return self.index.search(queries, k)
+    
+    def __getattr__(self, name):
+        return getattr(self.index, name)
+
+def to_gpu(index):
+    """
+    Copies an index to GPU 0 for searching when use_gpu_faiss is set and FAISS was built with
+    GPU support and sees a GPU; otherwise, or if the index type cannot be copied, returns it unchanged.
+    
+    Args:
+        index (faiss.Index): CPU index.
+    
+    Returns:
+        object: GPU index with thread-safe search, or the CPU index.
+    """
+    global _gpu_resources
+    if not INDEXING["use_gpu_faiss"] or not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+        return index
+    try:
+        if _gpu_resources is None:
+            _gpu_resources = faiss.StandardGpuResources()
+        return _GpuIndex(faiss.index_cpu_to_gpu(_gpu_resources, 0, index))
+    except RuntimeError as e:
+        logger.warning(f"Searching on CPU, could not copy index to GPU: {str(e)}")
+        return index
+
+@lru_cache(maxsize=8)
+def _read_index(index_path, mtime_ns, size):
+    """Reads a FAISS index from disk, sets nprobe on IVF and efSearch on HNSW indexes, and moves it
+    to GPU if enabled; memoized on path, mtime, and size."""
+    try:
+        index = faiss.read_index(index_path, MMAP_FLAGS)
+    except RuntimeError:
+        # Index types FAISS cannot map are read into memory
+        index = faiss.read_index(index_path)
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = INDEXING["ef_search"]
+    else:
+        try:
+            faiss.extract_index_ivf(index).nprobe = INDEXING["nprobe"]
+        except RuntimeError:
+            pass  # Flat index, nothing to probe
+    # The on-disk index stays in CPU format; only the search-time copy moves to the GPU
+    return to_gpu(index)
+
+def read_index(index_path):
+    """
+    Returns the FAISS index stored at index_path, reading it from disk only the first time and
+    again after the file changes. The index is memory-mapped read-only where FAISS supports it,
+    or copied to the GPU when use_gpu_faiss is set. Searches on the returned index are safe from
+    multiple threads.
+    
+    Args:
+        index_path (str): Path to the index file.
+    
+    Returns:
+        faiss.Index: Loaded index, shared with other callers.
+    """
+    stat = os.stat(index_path)
+    return _read_index(os.path.abspath(index_path), stat.st_mtime_ns, stat.st_size)
+
+def load_metadata(metadata_path):
+    """
+    Returns the metadata stored alongside a FAISS index, unpickled once per file version.
+    
+    Args:
+        metadata_path (str): Path to metadata file.
+    
+    Returns:
+        list or MetadataTable: Metadata rows in index order, shared with other callers.
+    """
+    return load_pickle(metadata_path)
+
+def _hits(metadata, row_indices, row_distances):
+    """Returns a copy of the metadata of each valid hit with its distance; columnar tables
+    materialize only the hit rows."""
+    valid = (row_indices >= 0) & (row_indices < len(metadata))
+    row_indices, row_distances = row_indices[valid].tolist(), row_distances[valid].tolist()
+    if isinstance(metadata, MetadataTable):
+        results = metadata.take(row_indices)
+    else:
+        results = [metadata[idx].copy() for idx in row_indices]
+    for result, distance in zip(results, row_distances):
+        result["distance"] = distance
+    return results
 
 def search_index(index, query_embedding, metadata_path, k=5):
     """
-    Searches the FAISS index for the top-k closest embeddings.
+    Searches the FAISS index for the top-k closest embeddings. A 2D query matrix is searched
+    in one call, as in search_index_batch.
     
     Args:
         index (faiss.Index): FAISS index to search.
-        query_embedding (np.ndarray): Query embedding.
+        query_embedding (np.ndarray): Query embedding, or query embeddings of shape (n_queries, dimension).
         metadata_path (str): Path to metadata file.
         k (int): Number of results to return.
     
     Returns:
-        list: List of dictionaries with metadata and distances.
+        list: List of dictionaries with metadata and distances; one such list per query for a 2D query.
     """
+    if np.ndim(query_embedding) == 2:
+        return search_index_batch(index, query_embedding, metadata_path, k=k)
+    
     # Load metadata
-    with open(metadata_path, "rb") as f:
-        metadata = pickle.load(f)
+    metadata = load_metadata(metadata_path)
     
     # Search index
     query_embedding = np.array([query_embedding], dtype=np.float32)
     distances, indices = index.search(query_embedding, k)
+    distances = to_distances(index, distances)
     
     # Collect results
-    results = []
-    for idx, distance in zip(indices[0], distances[0]):
-        if idx < len(metadata):  # Ensure valid index
-            result = metadata[idx].copy()
-            result["distance"] = float(distance)
-            results.append(result)
+    return _hits(metadata, indices[0], distances[0])
+
+def search_index_batch(index, query_embeddings, metadata_path, k=5):
+    """
+    Searches the FAISS index for the top-k closest embeddings of several queries at once,
+    issuing a single search over the stacked query matrix.
+    
+    Args:
+        index (faiss.Index): FAISS index to search.
+        query_embeddings (np.ndarray): Query embeddings of shape (n_queries, dimension).
+        metadata_path (str): Path to metadata file.
+        k (int): Number of results to return per query.
+    
+    Returns:
+        list: One list per query of dictionaries with metadata and distances.
+    """
+    # Load metadata
+    metadata = load_metadata(metadata_path)
+    
+    # Search index with all queries in one call
+    query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+    if len(query_embeddings) == 0:
+        return []
+    distances, indices = index.search(query_embeddings, k)
+    distances = to_distances(index, distances)
+    
+    # Collect results per query
+    return [_hits(metadata, row_indices, row_distances) for row_indices, row_distances in zip(indices, distances)]
+
+def build_similarity_index(embeddings, ivf_threshold=10000):
+    """
+    Builds an in-memory cosine-similarity index over a matrix of embeddings. Vectors are
+    L2-normalized so inner product equals cosine similarity; large collections use an IVF index.
+    
+    Args:
+        embeddings (np.ndarray): Embeddings of shape (n, dimension).
+        ivf_threshold (int): Number of vectors above which an IndexIVFFlat is used.
+    
+    Returns:
+        faiss.Index: Index over the normalized embeddings, in input order.
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    faiss.normalize_L2(embeddings)
+    dimension = embeddings.shape[1]
+    if len(embeddings) > ivf_threshold:
+        nlist = int(4 * np.sqrt(len(embeddings)))
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+        index.nprobe = 32
+    else:
+        index = faiss.IndexFlatIP(dimension)
+    index.add(embeddings)
+    return index
+
+def search_similarity_index(index, query_embedding, k=50):
+    """
+    Returns the k most cosine-similar vectors in an index built by build_similarity_index.
+    
+    Args:
+        index (faiss.Index): Similarity index.
+        query_embedding (np.ndarray): Query embedding of shape (dimension,).
+        k (int): Number of candidates to return.
+    
+    Returns:
+        list: (position, similarity) tuples, most similar first.
+    """
+    query = np.ascontiguousarray(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))
+    faiss.normalize_L2(query)
+    similarities, indices = index.search(query, min(k, index.ntotal))
+    return [(int(idx), float(sim)) for idx, sim in zip(indices[0], similarities[0]) if idx >= 0]
+
+def search_similarity_index_batch(index, query_embeddings, k=50):
+    """
+    Searches a similarity index for several queries with one batched FAISS call.
+    
+    Args:
+        index (faiss.Index): Similarity index built by build_similarity_index.
+        query_embeddings (np.ndarray): Query embeddings of shape (m, dimension).
+        k (int): Number of candidates to return per query.
+    
+    Returns:
+        list: One list of (position, similarity) tuples per query, most similar first.
+    """
+    queries = np.array(query_embeddings, dtype=np.float32, order="C", ndmin=2)
+    if not len(queries):
+        return []
+    faiss.normalize_L2(queries)
+    similarities, indices = index.search(queries, min(k, index.ntotal))
+    return [[(int(idx), float(sim)) for idx, sim in zip(row_indices, row_similarities) if idx >= 0]
+            for row_indices, row_similarities in zip(indices, similarities)]
+
+def cosine_similarities(query_embedding, embeddings):
+    """
+    Computes cosine similarities between one query vector and a matrix of vectors with a single
+    float32 matrix-vector product, avoiding per-pair torch dispatch for small 384-dim vectors.
+    
+    Args:
+        query_embedding (np.ndarray): Query embedding of shape (dimension,).
+        embeddings (np.ndarray): Embeddings of shape (n, dimension).
+    
+    Returns:
+        np.ndarray: Similarities of shape (n,).
+    """
+    query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+    embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, query.shape[0])
+    norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query)
+    return (embeddings @ query) / np.maximum(norms, 1e-8)
+
+def cosine_similarity_matrix(query_embeddings, embeddings):
+    """
+    Computes cosine similarities between every query and every embedding with one matrix product.
+    
+    Args:
+        query_embeddings (np.ndarray): Query embeddings of shape (m, dimension).
+        embeddings (np.ndarray): Embeddings of shape (n, dimension).
     
-    return results
\ No newline at end of file
+    Returns:
+        np.ndarray: Similarities of shape (m, n).
+    """
+    queries = np.asarray(query_embeddings, dtype=np.float32)
+    embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, queries.shape[1])
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-8)
+    embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-8)
+    return queries @ embeddings.T
+
+def top_k_similar(query_embedding, embeddings, k=50):
+    """
+    Returns the k rows of a matrix most cosine-similar to a query, using one matrix-vector
+    product and a partial sort. Used for exact search over a subset of an index's vectors.
+    
+    Args:
+        query_embedding (np.ndarray): Query embedding of shape (dimension,).
+        embeddings (np.ndarray): Embeddings of shape (n, dimension).
+        k (int): Number of candidates to return.
+    
+    Returns:
+        list: (row, similarity) tuples, most similar first.
+    """
+    similarities = cosine_similarities(query_embedding, embeddings)
+    k = min(k, len(similarities))
+    if k == 0:
+        return []
+    top = np.argpartition(-similarities, k - 1)[:k]
+    top = top[np.argsort(-similarities[top])]
+    return [(int(row), float(similarities[row])) for row in top]
+
+def top_k_similar_batch(query_embeddings, embeddings, k=50):
+    """
+    Like top_k_similar for several queries, scoring all of them with one matrix product.
+    
+    Args:
+        query_embeddings (np.ndarray): Query embeddings of shape (m, dimension).
+        embeddings (np.ndarray): Embeddings of shape (n, dimension).
+        k (int): Number of candidates to return per query.
+    
+    Returns:
+        list: One list of (row, similarity) tuples per query, most similar first.
+    """
+    similarities = cosine_similarity_matrix(query_embeddings, embeddings)
+    k = min(k, similarities.shape[1])
+    if k == 0:
+        return [[] for _ in range(similarities.shape[0])]
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    results = []
+    for row_similarities, row_top in zip(similarities, top):
+        row_top = row_top[np.argsort(-row_similarities[row_top])]
+        results.append([(int(row), float(row_similarities[row])) for row in row_top])
+    return results